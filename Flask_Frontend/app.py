@@ -1,9 +1,9 @@
 import os
-import subprocess
 import threading
 import logging
 from flask import Flask, render_template, jsonify, request, send_file
 from flask_cors import CORS  # Import CORS
+from auto_checker_v3 import GradingError, create_llm, grade_class
 
 # Configure logging
 logging.basicConfig(
@@ -15,7 +15,6 @@ logger = logging.getLogger(__name__)
 
 # Application configuration
 APP_CONFIG = {
-    "AUTO_CHECKER_SCRIPT": "auto_checker_v3.py",
     "RESULTS_FILE": "evaluation_results.html",
 }
 
@@ -30,11 +29,24 @@ evaluation_status = {
     "complete": False,
     "progress": 0,
     "message": "",
-    "error": None
+    "error": None,
+    "errorDetails": None
 }
 
+# Ollama client shared by every evaluation run so it stays warm between runs
+_llm = None
+_llm_lock = threading.Lock()
+
+def get_llm():
+    """Return the shared LLM client, creating it on first use"""
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = create_llm()
+        return _llm
+
 def run_auto_checker():
-    """Run the auto checker script in a separate thread"""
+    """Run the auto checker in-process in a separate thread"""
     global evaluation_status
     
     try:
@@ -44,18 +56,14 @@ def run_auto_checker():
             "complete": False,
             "progress": 0,
             "message": "Starting evaluation...",
-            "error": None
+            "error": None,
+            "errorDetails": None
         })
         
         logger.info("Starting evaluation process...")
         
-        # Run the auto_checker script
-        result = subprocess.run(
-            ["python", APP_CONFIG["AUTO_CHECKER_SCRIPT"]], 
-            capture_output=True, 
-            text=True, 
-            check=True
-        )
+        # Grade in-process with the warm client instead of spawning a new interpreter
+        grade_class(get_llm())
         
         # Check if results file exists
         if os.path.exists(APP_CONFIG["RESULTS_FILE"]):
@@ -68,13 +76,15 @@ def run_auto_checker():
             evaluation_status["error"] = error_msg
             logger.error(error_msg)
             
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Error running evaluation: {e.stderr}"
+    except GradingError as e:
+        error_msg = f"Error running evaluation: {str(e)}"
         evaluation_status["error"] = error_msg
+        evaluation_status["errorDetails"] = e.to_dict()
         logger.error(error_msg)
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         evaluation_status["error"] = error_msg
+        evaluation_status["errorDetails"] = {"type": type(e).__name__, "message": str(e)}
         logger.error(error_msg, exc_info=True)
     finally:
         evaluation_status["running"] = False
@@ -8,6 +8,19 @@ QUESTIONS_FILE = "questions.txt"
 ANSWERS_FILE = "answers.txt"
 # Folder containing student answers (one file per student, e.g., "Ali.txt", "Bob.txt")
 STUDENT_ANSWERS_FOLDER = "student_answers"
+# HTML table written at the end of every run
+RESULTS_FILE = "evaluation_results.html"
+
+class GradingError(Exception):
+    """A grading run could not be started."""
+
+    def to_dict(self):
+        """Return the error as structured data for API responses."""
+        return {"type": type(self).__name__, "message": str(self)}
+
+def create_llm():
+    """Create the LangChain Ollama client for deepseek‑r1."""
+    return Ollama(model="deepseek-r1", base_url="http://127.0.0.1:11434")
 
 def load_text_file(file_path):
     """Load a text file and return a list of non-empty, stripped lines."""
@@ -68,26 +81,27 @@ def evaluate_answer(llm, question, answer_key, student_answer):
 
     return score, reasoning, model_thoughts
 
-def main():
+def grade_class(llm):
+    """
+    Grade every student answer file with the given LLM client and write the HTML results.
+
+    Importable so the Flask app can reuse one warm client across runs; raises
+    GradingError when the inputs cannot be loaded.
+    """
     # Load questions and answer keys
     questions = load_text_file(QUESTIONS_FILE)
     answers = load_text_file(ANSWERS_FILE)
     
     if len(questions) != len(answers):
-        print("Error: The number of questions and answers do not match!")
-        return
+        raise GradingError("The number of questions and answers do not match!")
 
     evaluations = []
 
     # List all student answer files in the folder
     student_files = [f for f in os.listdir(STUDENT_ANSWERS_FOLDER) if f.endswith(".txt")]
     if not student_files:
-        print("Error: No student answer files found in the folder.")
-        return
+        raise GradingError("No student answer files found in the folder.")
 
-    # Initialize the LangChain Ollama LLM for deepseek‑r1 with 8 threads.
-    llm = Ollama(model="deepseek-r1", base_url="http://127.0.0.1:11434")
-    
     for student_file in student_files:
         student_name, _ = os.path.splitext(student_file)
         student_file_path = os.path.join(STUDENT_ANSWERS_FOLDER, student_file)
@@ -117,10 +131,22 @@ def main():
     # Write the DataFrame as an HTML table. The 'escape=False' allows any HTML (if needed) to be rendered as content.
     html_content = df.to_html(escape=False, index=False, border=1)
     
-    with open("evaluation_results.html", "w", encoding="utf-8") as html_file:
+    with open(RESULTS_FILE, "w", encoding="utf-8") as html_file:
         html_file.write(html_content)
     
-    print("Evaluation complete. Results saved to evaluation_results.html")
+    return evaluations
+
+def main():
+    # Initialize the LangChain Ollama LLM for deepseek‑r1.
+    llm = create_llm()
+    
+    try:
+        grade_class(llm)
+    except GradingError as e:
+        print(f"Error: {str(e)}")
+        return
+    
+    print(f"Evaluation complete. Results saved to {RESULTS_FILE}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,238 @@
+"""Class-level score analytics computed over students x questions matrices."""
+
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+# Ten score bands of width 10 on the 0-100 scale; 100 falls into the last one
+HISTOGRAM_BANDS = 10
+# Students whose overall score lies this many interquartile ranges outside the quartiles
+OUTLIER_IQR_FACTOR = 1.5
+# Analytics of finished evaluations kept in memory, keyed by evaluation id
+STORED_ANALYTICS_ENTRIES = 16
+
+
+def _number(value, digits=2):
+    """JSON-friendly float: rounded, with NaN as None."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def _histogram(percentages, answered):
+    """Counts per score band for every column of a percentage matrix, as a (columns, bands) array."""
+    bands = np.minimum(np.floor(np.nan_to_num(percentages) / (100 / HISTOGRAM_BANDS)), HISTOGRAM_BANDS - 1)
+    columns = np.broadcast_to(np.arange(percentages.shape[1]), percentages.shape)
+    flat = (columns * HISTOGRAM_BANDS + bands.astype(int))[answered]
+    counts = np.bincount(flat, minlength=percentages.shape[1] * HISTOGRAM_BANDS)
+    return counts.reshape(percentages.shape[1], HISTOGRAM_BANDS)
+
+
+def _distribution(values):
+    """Mean, spread, percentiles and histogram of a 1-D array of percentages."""
+    if values.size == 0:
+        return {"count": 0, "mean": None, "std": None, "min": None, "max": None,
+                "percentiles": {f"p{p}": None for p in PERCENTILES}, "histogram": [0] * HISTOGRAM_BANDS}
+    percentiles = np.percentile(values, PERCENTILES)
+    histogram = _histogram(values[:, None], np.ones((values.size, 1), dtype=bool))[0]
+    return {
+        "count": int(values.size),
+        "mean": _number(values.mean()),
+        "std": _number(values.std()),
+        "min": _number(values.min()),
+        "max": _number(values.max()),
+        "percentiles": {f"p{p}": _number(v) for p, v in zip(PERCENTILES, percentiles)},
+        "histogram": histogram.tolist()
+    }
+
+
+class ScoreMatrix:
+    """
+    Scores of one evaluation as a students x questions matrix of percentages.
+
+    Cells not graded yet are NaN. The matrix grows as evaluations arrive, so a
+    running job's analytics are updated one answer at a time; statistics are then
+    computed with whole-matrix NumPy operations when asked for and kept until the
+    next update. Ungraded answers, including scores the grader could not parse,
+    count as 0, as in the overall scores of the results store.
+    """
+
+    def __init__(self, students=64, questions=8):
+        self._scores = np.full((students, questions), np.nan)
+        self._students = {}
+        self._questions = {}
+        self._lock = threading.Lock()
+        self._summary = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a matrix from (student_name, question_number, score, max_score) rows."""
+        rows = list(rows)
+        matrix = cls(students=max(1, len({row[0] for row in rows})), questions=max(1, len({row[1] for row in rows})))
+        for student_name, question_number, score, max_score in rows:
+            matrix.add(student_name, question_number, score, max_score)
+        return matrix
+
+    def _cell(self, student_name, question_number):
+        row = self._students.setdefault(student_name, len(self._students))
+        column = self._questions.setdefault(question_number, len(self._questions))
+        rows, columns = self._scores.shape
+        if row >= rows or column >= columns:
+            # Double the full dimension so appending stays amortized O(1)
+            grown = np.full((rows * 2 if row >= rows else rows, columns * 2 if column >= columns else columns), np.nan)
+            grown[:rows, :columns] = self._scores
+            self._scores = grown
+        return row, column
+
+    def add(self, student_name, question_number, score, max_score=100):
+        """Record (or replace) one graded answer."""
+        with self._lock:
+            row, column = self._cell(student_name, question_number)
+            # Unparseable scores ("Error", ...) are ungraded, as in the results records
+            score = score if isinstance(score, (int, float)) else 0
+            self._scores[row, column] = score * 100.0 / (max_score or 100)
+            self._summary = None
+
+    def add_evaluation(self, evaluation):
+        """Record an evaluation row as produced by the grader."""
+        self.add(evaluation["Student Name"], evaluation["Question Number"], evaluation["Score"])
+
+    def summary(self):
+        """Return class statistics, per-question statistics and outlier students as JSON-ready data."""
+        with self._lock:
+            if self._summary is None:
+                self._summary = self._compute()
+            return self._summary
+
+    def _compute(self):
+        names = list(self._students)
+        numbers = list(self._questions)
+        scores = self._scores[:len(names), :len(numbers)]
+        answered = ~np.isnan(scores)
+        counts = answered.sum(axis=0)
+
+        with warnings.catch_warnings():
+            # Columns or rows without any answer yet produce NaN statistics
+            warnings.simplefilter("ignore", RuntimeWarning)
+            overall = np.nanmean(scores, axis=1) if scores.size else np.empty(0)
+            means = np.nanmean(scores, axis=0)
+            stds = np.nanstd(scores, axis=0)
+            minimums = np.nanmin(scores, axis=0) if scores.size else np.empty(0)
+            maximums = np.nanmax(scores, axis=0) if scores.size else np.empty(0)
+            percentiles = np.nanpercentile(scores, PERCENTILES, axis=0) if scores.size else np.empty((len(PERCENTILES), 0))
+        discrimination = self._discrimination(scores, answered)
+        histograms = _histogram(scores, answered)
+
+        questions = []
+        for column, number in sorted(enumerate(numbers), key=lambda item: item[1]):
+            questions.append({
+                "questionNumber": number,
+                "answered": int(counts[column]),
+                "mean": _number(means[column]),
+                "std": _number(stds[column]),
+                "min": _number(minimums[column]),
+                "max": _number(maximums[column]),
+                "percentiles": {f"p{p}": _number(v) for p, v in zip(PERCENTILES, percentiles[:, column])},
+                # Share of the marks students missed: 0 is trivially easy, 1 nobody scored
+                "difficulty": _number(1 - means[column] / 100, 3),
+                "discrimination": _number(discrimination[column], 3),
+                "histogram": histograms[column].tolist()
+            })
+
+        graded = ~np.isnan(overall)
+        return {
+            "students": int(graded.sum()),
+            "questions": len(numbers),
+            "graded": int(answered.sum()),
+            "overall": _distribution(overall[graded]),
+            "questionStats": questions,
+            "outliers": self._outliers(names, overall, graded)
+        }
+
+    @staticmethod
+    def _discrimination(scores, answered):
+        """
+        Corrected item-total correlation of every question.
+
+        Each question's scores are correlated with the students' total on the other
+        questions, over students who have answered every question; high values mean
+        the question separates strong from weak students. NaN when undefined.
+        """
+        complete = scores[answered.all(axis=1)]
+        if complete.shape[0] < 3:
+            return np.full(scores.shape[1], np.nan)
+        rest = complete.sum(axis=1, keepdims=True) - complete
+        item = complete - complete.mean(axis=0)
+        rest = rest - rest.mean(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (item * rest).sum(axis=0) / np.sqrt((item ** 2).sum(axis=0) * (rest ** 2).sum(axis=0))
+
+    @staticmethod
+    def _outliers(names, overall, graded):
+        """Students whose overall score lies outside the interquartile fences."""
+        values = overall[graded]
+        if values.size < 4:
+            return []
+        q1, q3 = np.percentile(values, (25, 75))
+        low = q1 - OUTLIER_IQR_FACTOR * (q3 - q1)
+        high = q3 + OUTLIER_IQR_FACTOR * (q3 - q1)
+        std = values.std()
+        indices = np.flatnonzero(graded & ((overall < low) | (overall > high)))
+        return [
+            {
+                "studentName": names[index],
+                "overallScore": _number(overall[index]),
+                "zScore": _number((overall[index] - values.mean()) / std) if std else None,
+                "direction": "low" if overall[index] < low else "high"
+            }
+            for index in indices[np.argsort(overall[indices])]
+        ]
+
+
+class ClassAnalytics:
+    """
+    Score matrices of running jobs and of stored evaluations.
+
+    Running jobs get a matrix fed by their progress events. Finished evaluations
+    are loaded from the results store once per version and kept in a small LRU.
+    """
+
+    def __init__(self, results_store, entries=STORED_ANALYTICS_ENTRIES):
+        self.results_store = results_store
+        self.entries = entries
+        self._live = {}
+        self._stored = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, job_id, evaluation):
+        """Add one finished evaluation of a running job."""
+        with self._lock:
+            matrix = self._live.setdefault(job_id, ScoreMatrix())
+        matrix.add_evaluation(evaluation)
+
+    def live(self, job_id):
+        """Return the matrix of a running job, or None if it has not graded anything yet."""
+        with self._lock:
+            return self._live.get(job_id)
+
+    def discard(self, job_id):
+        """Forget a job's live matrix once it has finished."""
+        with self._lock:
+            self._live.pop(job_id, None)
+
+    def stored(self, evaluation_id, version):
+        """Return the matrix of a stored evaluation, loading it if `version` is not cached."""
+        key = (evaluation_id, version)
+        with self._lock:
+            if key in self._stored:
+                self._stored.move_to_end(key)
+                return self._stored[key]
+
+        matrix = ScoreMatrix.from_rows(self.results_store.score_rows(evaluation_id))
+        with self._lock:
+            self._stored[key] = matrix
+            while len(self._stored) > self.entries:
+                self._stored.popitem(last=False)
+        return matrix
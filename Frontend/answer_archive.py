@@ -0,0 +1,180 @@
+"""Streaming extraction of zip and tar archives of student answer files."""
+
+import codecs
+import hashlib
+import os
+import tarfile
+import tempfile
+import zipfile
+import zlib
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ANSWER_SUFFIX = ".txt"
+# Bytes read from an archive entry at a time; memory use does not depend on entry size
+CHUNK_SIZE = 64 * 1024
+# Largest answer file accepted, and limits on a whole archive
+MAX_ENTRY_SIZE = 1024 * 1024
+MAX_ENTRIES = 5000
+MAX_TOTAL_SIZE = 512 * 1024 * 1024
+
+
+class ArchiveError(Exception):
+    """An uploaded archive cannot be read at all."""
+
+
+class EntryRejected(Exception):
+    """One archive entry is skipped; the message says why."""
+
+
+def is_archive(filename):
+    """Whether an uploaded file name looks like a supported archive."""
+    return (filename or "").lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _file_sha256(path):
+    """The sha256 of a file, read in CHUNK_SIZE pieces."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_zip(stream):
+    """Yield (name, declared size, file object) for every regular file in a zip archive."""
+    try:
+        archive = zipfile.ZipFile(stream)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ArchiveError(f"Not a readable zip archive: {str(e)}") from e
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            with archive.open(info) as entry:
+                yield info.filename, info.file_size, entry
+
+
+def _iter_tar(stream):
+    """Yield (name, declared size, file object) for every regular file of a tar stream."""
+    try:
+        # "r|*" reads members strictly in order, without seeking, through any compression
+        archive = tarfile.open(fileobj=stream, mode="r|*")
+    except tarfile.TarError as e:
+        raise ArchiveError(f"Not a readable tar archive: {str(e)}") from e
+    with archive:
+        try:
+            for member in archive:
+                # Links, devices and directories never become answer files
+                if not member.isfile():
+                    continue
+                yield member.name, member.size, archive.extractfile(member)
+        except tarfile.TarError as e:
+            raise ArchiveError(f"Corrupt tar archive: {str(e)}") from e
+
+
+def _student_file_name(name):
+    """
+    The answer file name an archive entry is extracted to, or None if it is not an answer file.
+
+    Only the base name is kept, so no entry can point outside the target folder;
+    it may be in any script, since student names are.
+    """
+    base = name.replace("\\", "/").rsplit("/", 1)[-1].strip()
+    if (not base.lower().endswith(ANSWER_SUFFIX) or base.startswith(".") or "__MACOSX/" in name
+            or ".." in base or "\0" in base):
+        return None
+    return base
+
+
+def _copy_entry(entry, target_folder, max_size):
+    """
+    Copy one entry to a temporary file in `target_folder`, hashing it on the way.
+
+    Returns (temporary path, sha256, size). Raises EntryRejected, after removing
+    the temporary file, when the entry exceeds `max_size` or is not UTF-8 text.
+    """
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=target_folder, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = entry.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                # Checked on the bytes actually read, so a lying size header does not help
+                if size > max_size:
+                    raise EntryRejected(f"larger than {max_size} bytes")
+                try:
+                    decoder.decode(chunk)
+                except UnicodeDecodeError:
+                    raise EntryRejected("not UTF-8 text")
+                digest.update(chunk)
+                out.write(chunk)
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise EntryRejected("not UTF-8 text")
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size
+
+
+def extract_answers(stream, filename, target_folder, max_entry_size=MAX_ENTRY_SIZE,
+                    max_entries=MAX_ENTRIES, max_total_size=MAX_TOTAL_SIZE):
+    """
+    Extract the .txt answer files of a zip or tar archive into `target_folder`.
+
+    Entries are streamed one at a time in CHUNK_SIZE pieces, so memory stays
+    bounded whatever the archive holds. Each file is named after its entry's base
+    name (one file per student) and replaced atomically, only when its content
+    differs from the file already in the folder. Entries that are not answer
+    files, too large, not UTF-8 or repeated are skipped with a reason; extraction
+    stops with a skip once `max_entries` files or `max_total_size` bytes have been
+    read. Returns {"added", "updated", "unchanged", "skipped", "bytes"}; raises
+    ArchiveError when the archive cannot be read.
+    """
+    os.makedirs(target_folder, exist_ok=True)
+    entries = _iter_zip(stream) if filename.lower().endswith(".zip") else _iter_tar(stream)
+
+    summary = {"added": [], "updated": [], "unchanged": [], "skipped": [], "bytes": 0}
+    seen = set()
+    for name, declared_size, entry in entries:
+        file_name = _student_file_name(name)
+        if file_name is None:
+            summary["skipped"].append({"name": name, "reason": f"not a {ANSWER_SUFFIX} answer file"})
+            continue
+        if len(seen) >= max_entries or summary["bytes"] >= max_total_size:
+            summary["skipped"].append({"name": name, "reason": "archive limit reached"})
+            break
+        if file_name in seen:
+            summary["skipped"].append({"name": name, "reason": "duplicate student file"})
+            continue
+        if declared_size > max_entry_size:
+            summary["skipped"].append({"name": name, "reason": f"larger than {max_entry_size} bytes"})
+            continue
+        seen.add(file_name)
+
+        remaining = max_total_size - summary["bytes"]
+        try:
+            temp_path, sha256, size = _copy_entry(entry, target_folder, min(max_entry_size, remaining))
+        except EntryRejected as e:
+            summary["skipped"].append({"name": name, "reason": str(e)})
+            continue
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError, zlib.error) as e:
+            raise ArchiveError(f"Corrupt archive entry {name}: {str(e)}") from e
+        summary["bytes"] += size
+
+        path = os.path.join(target_folder, file_name)
+        student = os.path.splitext(file_name)[0]
+        existed = os.path.exists(path)
+        if existed and os.path.getsize(path) == size and _file_sha256(path) == sha256:
+            os.remove(temp_path)
+            summary["unchanged"].append(student)
+            continue
+        os.replace(temp_path, path)
+        summary["updated" if existed else "added"].append(student)
+    return summary
@@ -1,15 +1,21 @@
 import os
 import json
-import subprocess
 import threading
 import logging
 import socket
 import time
+import queue
 from datetime import datetime  # Add this import at the top level
-from flask import Flask, render_template, jsonify, request, send_file, make_response
+from flask import Flask, render_template, jsonify, request, Response
 from flask_cors import CORS
 import copy
-from bs4 import BeautifulSoup
+from analytics import ClassAnalytics, ScoreMatrix
+from answer_archive import ArchiveError, extract_answers, is_archive
+from grading_worker import GradingWorker
+from job_registry import ACTIVE_STATUSES, JobRegistry
+from results_store import SORT_KEYS, ResultsStore, decode_cursor, parse_fields
+from http_caching import conditional_file, conditional_json
+from legacy_report_parser import parse_report, parse_score
 
 
 # Configure logging
@@ -22,14 +28,32 @@ logger = logging.getLogger(__name__)
 
 # Application configuration
 APP_CONFIG = {
-    "AUTO_CHECKER_SCRIPT": "auto_checker_v3.py",
     "RESULTS_FILE": "evaluation_results.html",
     "JSON_RESULTS_FILE": "evaluation_results.json",
-    "UPLOAD_FOLDER": "student_answers"
+    "RECORDS_FILE": "evaluation_results.jsonl",
+    # Uploaded answer files go to UPLOAD_FOLDER/<job id>/, which that job grades
+    "UPLOAD_FOLDER": "student_answers",
+    "GRADING_WORKERS": int(os.environ.get("AUTO_CHECKER_WORKERS", "4")),
+    # Answers to the same question graded per prompt; 1 grades each answer on its own
+    "GRADING_BATCH_SIZE": int(os.environ.get("AUTO_CHECKER_BATCH_SIZE", "1")),
+    "JOBS_DB": "evaluation_jobs.sqlite3",
+    # Indexed results of every finished evaluation, filled in by the grader
+    "RESULTS_DB": "evaluation_results.sqlite3",
+    # Each job writes its report, records and journal under JOBS_FOLDER/<job id>/
+    "JOBS_FOLDER": "evaluation_jobs",
+    # Jobs graded at the same time, and jobs allowed to be queued or running at once
+    "MAX_CONCURRENT_JOBS": int(os.environ.get("AUTO_CHECKER_MAX_JOBS", "2")),
+    "MAX_ACTIVE_JOBS": int(os.environ.get("AUTO_CHECKER_MAX_ACTIVE_JOBS", "8")),
+    # Largest page /api/students_results returns
+    "MAX_PAGE_SIZE": 500,
+    # Largest upload accepted, in bytes; bigger requests get 413
+    "MAX_UPLOAD_SIZE": int(os.environ.get("AUTO_CHECKER_MAX_UPLOAD_MB", "256")) * 1024 * 1024
 }
 
 # Initialize Flask app
 app = Flask(__name__, template_folder='templates', static_folder='static')
+# Werkzeug spools large uploads to disk, so archives never sit in memory whole
+app.config['MAX_CONTENT_LENGTH'] = APP_CONFIG["MAX_UPLOAD_SIZE"]
 
 # Determine if we're in development or production
 is_dev = socket.gethostname() == socket.gethostname()  # This will always be true, making CORS more permissive for development
@@ -56,80 +80,367 @@ def after_request(response):
         response.headers.set('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS')
     return response
 
-# Global variable to track evaluation status
-evaluation_status = {
-    "running": False,
-    "complete": False,
-    "progress": 0,
-    "message": "",
-    "error": None
-}
+# Persistent registry of upload and evaluation jobs, replacing a single global status
+job_registry = JobRegistry(APP_CONFIG["JOBS_DB"])
 
-def run_auto_checker():
-    """Run the auto checker script in a separate thread"""
-    global evaluation_status
-    
-    try:
-        # Update status
-        evaluation_status.update({
-            "running": True,
+results_store = ResultsStore(APP_CONFIG["RESULTS_DB"])
+
+# Score matrices behind /api/analytics, updated live while jobs are grading
+class_analytics = ClassAnalytics(results_store)
+
+# Jobs cannot survive a restart of the process that was grading them; their journals
+# are kept, so starting the same job again resumes where it stopped
+interrupted_jobs = job_registry.fail_interrupted("Interrupted by a server restart; start the job again to resume it")
+if interrupted_jobs:
+    logger.warning(f"Marked {len(interrupted_jobs)} interrupted evaluation job(s) as failed")
+
+# In-process grader; keeps the Ollama client warm between evaluation runs
+grading_worker = GradingWorker(
+    workers=APP_CONFIG["GRADING_WORKERS"],
+    batch_size=APP_CONFIG["GRADING_BATCH_SIZE"],
+    max_jobs=APP_CONFIG["MAX_CONCURRENT_JOBS"]
+)
+
+# Serializes the limit check and enqueueing in /start_evaluation
+job_start_lock = threading.Lock()
+
+# Open Server-Sent Events connections, one queue per client
+progress_subscribers = []
+progress_subscribers_lock = threading.Lock()
+
+
+def publish_event(event_type, data):
+    """Push an event to every client connected to the progress stream"""
+    with progress_subscribers_lock:
+        subscribers = list(progress_subscribers)
+    for subscriber in subscribers:
+        subscriber.put((event_type, data))
+
+
+def format_sse(event_type, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def job_paths(job):
+    """Return the results, records and journal files of a job"""
+    results_dir = job["results_dir"]
+    return {
+        "results_file": os.path.join(results_dir, APP_CONFIG["RESULTS_FILE"]),
+        "records_file": os.path.join(results_dir, APP_CONFIG["RECORDS_FILE"]),
+        "journal_file": os.path.join(results_dir, "evaluation_journal.jsonl")
+    }
+
+
+def job_input_folder(job):
+    """Return the folder of answer files a job grades: its uploads' folder, or the shared one without uploads"""
+    upload = job["upload_file"]
+    if not upload:
+        return APP_CONFIG["UPLOAD_FOLDER"]
+    return upload if os.path.isdir(upload) else os.path.dirname(upload)
+
+
+def upload_folder(job_id):
+    """Create and return the folder a job's uploaded answer files are saved to"""
+    folder = os.path.join(APP_CONFIG["UPLOAD_FOLDER"], job_id)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def job_status(job):
+    """Describe a job in the status shape the React app polls, plus its id and timings"""
+    if job is None:
+        return {
+            "jobId": None,
+            "status": "idle",
+            "running": False,
             "complete": False,
             "progress": 0,
-            "message": "Starting evaluation...",
-            "error": None
-        })
-        
-        logger.info("Starting evaluation process...")
-        
-        # Simulate progress updates
-        def update_progress():
-            for i in range(1, 11):
-                if not evaluation_status["running"]:
-                    break
-                evaluation_status["progress"] = i * 10
-                evaluation_status["message"] = f"Processing answers... ({i*10}% complete)"
-                time.sleep(2)
-                
-        progress_thread = threading.Thread(target=update_progress)
-        progress_thread.daemon = True
-        progress_thread.start()
-        
-        # Run the auto_checker script
-        result = subprocess.run(
-            ["python", APP_CONFIG["AUTO_CHECKER_SCRIPT"]], 
-            capture_output=True, 
-            text=True, 
-            check=True
-        )
-        
-        # Check if results file exists
-        if os.path.exists(APP_CONFIG["RESULTS_FILE"]):
-            # Generate JSON from the HTML results
-            generate_json_results()
-            
-            evaluation_status["complete"] = True
-            evaluation_status["progress"] = 100
-            evaluation_status["message"] = "Evaluation completed successfully!"
-            logger.info("Evaluation completed successfully")
+            "message": "",
+            "error": None,
+            "errorDetails": None,
+            "completed": 0,
+            "total": 0,
+            "currentStudent": None,
+            "currentQuestion": None,
+            "lastLatency": None
+        }
+    
+    error = job["error"]
+    finished = job["finished_at"] or time.time()
+    return {
+        "jobId": job["id"],
+        "status": job["status"],
+        "running": job["status"] in ACTIVE_STATUSES,
+        "complete": job["status"] == "complete",
+        "progress": job["progress"],
+        "message": job["message"],
+        "error": f"Error running evaluation: {error['message']}" if error else None,
+        "errorDetails": error,
+        "completed": job["completed"],
+        "total": job["total"],
+        "currentStudent": job["current_student"],
+        "currentQuestion": job["current_question"],
+        "lastLatency": job["last_latency"],
+        "subject": job["subject"],
+        "year": job["year"],
+        "semester": job["semester"],
+        "createdAt": job["created_at"],
+        "startedAt": job["started_at"],
+        "finishedAt": job["finished_at"],
+        "duration": round(finished - job["started_at"], 3) if job["started_at"] else None
+    }
+
+
+def handle_progress_event(job_id, event):
+    """Apply a per-evaluation progress event from the grader to its job and stream it"""
+    total = event["total"] or 1
+    job_registry.update(
+        job_id,
+        completed=event["completed"],
+        total=event["total"],
+        # Hold back 100% until the report has been written
+        progress=min(99, int(event["completed"] * 100 / total)),
+        current_student=event["student"],
+        current_question=event["questionNumber"],
+        last_latency=event["latency"],
+        message=f"Graded {event['student']} - Question {event['questionNumber']} ({event['completed']}/{event['total']})"
+    )
+    class_analytics.record(job_id, event["evaluation"])
+    publish_event("progress", dict(event, jobId=job_id))
+
+
+def mark_job_running(job_id):
+    """Record that the grading worker has picked up a queued job"""
+    job_registry.update(job_id, status="running", started_at=time.time(), message="Starting evaluation...")
+    logger.info(f"Starting evaluation job {job_id}")
+    publish_event("status", job_status(job_registry.get(job_id)))
+
+
+def finish_job(job_id, future):
+    """Record the outcome of a grading run on its job"""
+    try:
+        outcome = future.result()
+        if outcome["status"] == "error":
+            error = outcome["error"]
+            job_registry.update(job_id, status="error", error=error, message=error["message"])
+            logger.error(f"Evaluation job {job_id} failed during {error['stage']}: {error['message']}")
+        elif os.path.exists(job_paths(job_registry.get(job_id))["records_file"]):
+            job_registry.update(job_id, status="complete", progress=100, message="Evaluation completed successfully!")
+            logger.info(f"Evaluation job {job_id} completed successfully in {outcome['duration']}s")
         else:
             error_msg = "Evaluation completed but results file not found."
-            evaluation_status["error"] = error_msg
+            job_registry.update(
+                job_id, status="error", message=error_msg,
+                error={"type": "MissingResults", "stage": "report", "message": error_msg}
+            )
             logger.error(error_msg)
-            
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Error running evaluation: {e.stderr}"
-        evaluation_status["error"] = error_msg
-        logger.error(error_msg)
     except Exception as e:
-        error_msg = f"Unexpected error: {str(e)}"
-        evaluation_status["error"] = error_msg
-        logger.error(error_msg, exc_info=True)
+        job_registry.update(
+            job_id, status="error", message=f"Unexpected error: {str(e)}",
+            error={"type": type(e).__name__, "stage": "app", "message": str(e)}
+        )
+        logger.error(f"Unexpected error in evaluation job {job_id}: {str(e)}", exc_info=True)
     finally:
-        evaluation_status["running"] = False
+        job_registry.update(job_id, finished_at=time.time())
+        # Finished results are read back from the results store
+        class_analytics.discard(job_id)
+        job = job_registry.get(job_id)
+        publish_event("error" if job["status"] == "error" else "complete", job_status(job))
+
+
+def run_auto_checker(job_id):
+    """Queue a job on the in-process grading worker; its status is tracked in the job registry"""
+    results_dir = os.path.join(APP_CONFIG["JOBS_FOLDER"], job_id)
+    os.makedirs(results_dir, exist_ok=True)
+    job_registry.update(
+        job_id,
+        status="queued",
+        results_dir=results_dir,
+        queued_at=time.time(),
+        started_at=None,
+        finished_at=None,
+        progress=0,
+        completed=0,
+        total=0,
+        message="Waiting for a free grading slot...",
+        error=None,
+        current_student=None,
+        current_question=None,
+        last_latency=None
+    )
+    job = job_registry.get(job_id)
+    publish_event("status", job_status(job))
+    # Resumed evaluations are reported again, so the live analytics start empty
+    class_analytics.discard(job_id)
+    
+    # resume=True picks up evaluations journaled by an earlier attempt of the same job
+    future = grading_worker.submit(
+        on_progress=lambda event: handle_progress_event(job_id, event),
+        on_start=lambda: mark_job_running(job_id),
+        resume=True,
+        results_store=results_store,
+        evaluation_id=job_id,
+        metadata={key: job[key] for key in ("subject", "year", "semester") if job[key]},
+        # Only this job's own answers, never other instructors' uploads
+        student_folder=job_input_folder(job),
+        **job_paths(job)
+    )
+    future.add_done_callback(lambda done: finish_job(job_id, done))
+    return future
+
+
+def results_source(evaluation_id=None):
+    """
+    Return the (job, paths) to read results from.
+
+    A given evaluation id selects that job; otherwise the most recently completed job
+    is used, falling back to the top-level files written by command-line runs. The job
+    is None when no registered job applies.
+    """
+    job = job_registry.get(evaluation_id) if evaluation_id else job_registry.latest_with_results()
+    if job is not None and job["results_dir"]:
+        return job, job_paths(job)
+    return None, {
+        "results_file": APP_CONFIG["RESULTS_FILE"],
+        "records_file": APP_CONFIG["RECORDS_FILE"],
+        "journal_file": None
+    }
+
+
+def stored_evaluation_id(evaluation_id=None):
+    """
+    Return the id of the stored evaluation to serve, or None.
+
+    Without an id the most recent evaluation is used. JSONL results written before
+    the results store existed are imported into it on first use.
+    """
+    if evaluation_id and results_store.get_evaluation(evaluation_id):
+        return evaluation_id
+    if not evaluation_id:
+        latest = results_store.latest_evaluation_id()
+        if latest:
+            return latest
+    
+    job, paths = results_source(evaluation_id)
+    if job is not None:
+        metadata = {key: job[key] for key in ("subject", "year", "semester") if job[key]}
+        results_store.import_records_file(job["id"], paths["records_file"], **metadata)
+        return job["id"] if results_store.get_evaluation(job["id"]) else None
+    if not evaluation_id and os.path.exists(paths["records_file"]):
+        imported_id = f"eval-{int(os.path.getmtime(paths['records_file']))}"
+        results_store.import_records_file(imported_id, paths["records_file"])
+        return imported_id
+    return None
+
+
+def stored_results_version(evaluation):
+    """Version of a stored evaluation, used to derive the ETags of responses built from it"""
+    return f"{evaluation['evaluation_id']}:{evaluation['completed_at']!r}"
+
+
+def parse_students_query(args):
+    """
+    Read paging, sorting, filtering and projection options for the student results list.
+
+    Supported query parameters: limit (1-500), cursor, sort (position, name, score,
+    with a leading "-" for descending order), min_score, max_score, question and
+    fields (comma-separated, e.g. "studentName,overallScore,questions.score").
+    Raises ValueError for invalid values.
+    """
+    def optional_int(name, low=None, high=None):
+        value = args.get(name)
+        if value in (None, ""):
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an integer")
+        if (low is not None and number < low) or (high is not None and number > high):
+            raise ValueError(f"{name} must be between {low} and {high}")
+        return number
+    
+    sort = args.get('sort', 'position')
+    if sort.lstrip('-') not in SORT_KEYS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_KEYS)}")
+    cursor = args.get('cursor') or None
+    if cursor:
+        decode_cursor(cursor)
+    fields = args.get('fields')
+    fields = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    parse_fields(fields)
+    
+    return {
+        "sort": sort.lstrip('-'),
+        "descending": sort.startswith('-'),
+        "limit": optional_int('limit', 1, APP_CONFIG["MAX_PAGE_SIZE"]),
+        "cursor": cursor,
+        "min_score": optional_int('min_score'),
+        "max_score": optional_int('max_score'),
+        "question": optional_int('question'),
+        "fields": fields
+    }
+
+
+def load_result_records(records_file=None):
+    """Load the grader's JSONL results, or None if no run has written them yet"""
+    records_file = records_file or results_source()[1]["records_file"]
+    if not os.path.exists(records_file):
+        return None
+    
+    records = []
+    with open(records_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def build_student_results(records, evaluation_id=None):
+    """Group command-line JSONL records into the per-student structure used by the React app"""
+    evaluation_id = evaluation_id or f"eval-{int(os.path.getmtime(APP_CONFIG['RECORDS_FILE']))}"
+    submission_date = datetime.fromtimestamp(os.path.getmtime(APP_CONFIG["RECORDS_FILE"])).isoformat()
+    
+    students = {}
+    for record in records:
+        name = record["studentName"]
+        if name not in students:
+            students[name] = {
+                "id": f"{evaluation_id}-{len(students)}",
+                "evaluationId": evaluation_id,
+                "studentName": name,
+                "subject": record.get("subject", "Unknown Subject"),
+                "year": record.get("year", "Unknown Year"),
+                "semester": record.get("semester", "Unknown Semester"),
+                "submissionDate": submission_date,
+                "overallScore": 0,
+                "maxScore": 100,
+                "questions": []
+            }
+        student = students[name]
+        student["questions"].append({
+            "id": len(student["questions"]) + 1,
+            "questionNumber": record["questionNumber"],
+            "questionText": record["questionText"],
+            "studentAnswer": record["studentAnswer"],
+            "score": record["score"] if record["score"] is not None else 0,
+            "maxScore": record.get("maxScore", 100),
+            "feedback": record["feedback"],
+            "strengths": record["strengths"],
+            "improvements": record["improvements"],
+            "autoScored": record.get("autoScored", False)
+        })
+    
+    for student in students.values():
+        scores = [q["score"] for q in student["questions"]]
+        student["overallScore"] = int(round(sum(scores) / len(scores))) if scores else 0
+    
+    return list(students.values())
 
 
 def generate_json_results():
-    """Create a JSON version of the results from the HTML evaluation file"""
+    """Create a JSON version of the results from a legacy HTML evaluation file"""
     try:
         # Check if HTML results file exists
         if not os.path.exists(APP_CONFIG["RESULTS_FILE"]):
@@ -139,316 +450,51 @@ def generate_json_results():
         # Read the HTML file
         with open(APP_CONFIG["RESULTS_FILE"], 'r', encoding='utf-8') as f:
             html_content = f.read()
-            
-        # Use BeautifulSoup to parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extract metadata with better error handling
-        student_info = soup.select_one('.student-info')
-        student_name = "Unknown Student"
-        subject = "Unknown Subject"
-        year = "Unknown Year"
-        semester = "Unknown Semester"
         
-        if student_info:
-            name_elem = student_info.select_one('.student-name')
-            subject_elem = student_info.select_one('.subject')
-            year_elem = student_info.select_one('.year')
-            semester_elem = student_info.select_one('.semester')
-            
-            student_name = name_elem.text.strip() if name_elem else student_name
-            subject = subject_elem.text.strip() if subject_elem else subject
-            year = year_elem.text.strip() if year_elem else year
-            semester = semester_elem.text.strip() if semester_elem else semester
-        else:
-            # Try alternative methods to find student info
-            title_elem = soup.select_one('h1') or soup.select_one('title')
-            if title_elem and ":" in title_elem.text:
-                student_name = title_elem.text.split(":")[1].strip()
-        
-        # Extract overall score with improved pattern matching
-        score_element = soup.select_one('.overall-score') or soup.select_one('.total-score') or soup.select_one('.score')
-        overall_score = 85  # Default value if extraction fails
-        max_score = 100
-        
-        if score_element:
-            try:
-                score_text = score_element.text.strip()
-                import re
-                
-                # Try different score patterns
-                # Look for "85/100" format first
-                score_match = re.search(r'(\d+)\s*\/\s*(\d+)', score_text)
-                if score_match:
-                    overall_score = int(score_match.group(1))
-                    max_score = int(score_match.group(2))
-                else:
-                    # Look for "Score: 85" or similar
-                    score_match = re.search(r'(?:score|points|marks):\s*(\d+)', score_text, re.IGNORECASE)
-                    if score_match:
-                        overall_score = int(score_match.group(1))
-                    else:
-                        # Try to find any number
-                        numbers = re.findall(r'\d+', score_text)
-                        if numbers:
-                            # If multiple numbers found, use the first for score, second for max
-                            overall_score = int(numbers[0])
-                            if len(numbers) > 1:
-                                max_score = int(numbers[1])
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Error parsing overall score: {str(e)}")
+        # One pass over the markup extracts every card
+        report = parse_report(html_content)
+        document = report["document"]
+        cards = report["cards"]
         
-        # Find all question sections with improved selector strategy
         questions = []
-        
-        # Try different selectors for question sections, from most specific to most general
-        selectors = [
-            '.question-section', '.evaluation-card', '.question', 
-            '.answer-section', 'section', 'div[id^="question"]',
-            '.q-card', '.card'
-        ]
-        
-        question_sections = []
-        for selector in selectors:
-            question_sections = soup.select(selector)
-            if question_sections:
-                logger.info(f"Found {len(question_sections)} question sections using selector '{selector}'")
-                break
-        
-        # If no sections found with CSS selectors, try looking for patterns in the HTML
-        if not question_sections:
-            # Try to find sections with question numbers
-            import re
-            question_pattern = re.compile(r'Question\s+\d+|Q\d+:|Q\.\s*\d+', re.IGNORECASE)
-            potential_sections = []
+        for i, card in enumerate(cards):
+            q_score = card["score"] if card["score"] is not None else 70  # Default if no score was found
+            q_max_score = card["maxScore"]
             
-            for div in soup.find_all(['div', 'section']):
-                text_content = div.get_text().strip()
-                if question_pattern.search(text_content):
-                    potential_sections.append(div)
+            # Scale score if needed
+            if q_max_score != 100 and q_max_score > 0:
+                q_score = int((q_score / q_max_score) * 100)
+                q_max_score = 100
             
-            if potential_sections:
-                question_sections = potential_sections
-                logger.info(f"Found {len(question_sections)} question sections using text pattern matching")
-        
-        # Process each question section
-        for i, section in enumerate(question_sections):
-            try:
-                # Extract question text with improved selectors
-                question_text_elem = None
-                for selector in ['.question-text', '.q-text', 'h2', 'h3', 'h4', 'strong', 'b']:
-                    elems = section.select(selector)
-                    if elems:
-                        # Take the first element that likely contains the question
-                        for elem in elems:
-                            text = elem.text.strip()
-                            if 'question' in text.lower() or text.lower().startswith('q') or re.match(r'^\d+\.', text):
-                                question_text_elem = elem
-                                break
-                        if question_text_elem:
-                            break
-                
-                question_text = question_text_elem.text.strip() if question_text_elem else f"Question {i+1}"
-                
-                # Extract question number with improved patterns
-                question_number = i + 1
-                if question_text:
-                    import re
-                    patterns = [
-                        r'Question\s*(\d+)',
-                        r'Q\.?\s*(\d+)',
-                        r'#\s*(\d+)',
-                        r'^(\d+)[\.:]'
-                    ]
-                    for pattern in patterns:
-                        match = re.search(pattern, question_text, re.IGNORECASE)
-                        if match:
-                            try:
-                                question_number = int(match.group(1))
-                                break
-                            except (ValueError, IndexError):
-                                pass
-                
-                # Look for student answer with improved selectors and text analysis
-                student_answer = ""
-                answer_selectors = [
-                    '.student-answer', '.answer', '.response', '.answer-text',
-                    'p', 'div > p', '.content', '.answer-content'
-                ]
-                
-                for selector in answer_selectors:
-                    elems = section.select(selector)
-                    if elems:
-                        # Skip elements that are likely to be headers or metadata
-                        for elem in elems:
-                            elem_text = elem.text.strip()
-                            # Skip if element is too short or is likely a header
-                            if (len(elem_text) > 10 and 
-                                not elem_text.lower().startswith(('question', 'score', 'feedback'))):
-                                student_answer = elem_text
-                                break
-                        if student_answer:
-                            break
-                
-                # Extract score with improved pattern matching
-                q_score = 70  # Default if we can't find a score
-                q_max_score = 100  # Default max
-                
-                # Look for score text with multiple approaches
-                score_selectors = [
-                    '.score', '.question-score', '.marks', '.points', 
-                    '.grade', '.result', 'span', 'strong'
-                ]
-                
-                score_found = False
-                for selector in score_selectors:
-                    score_elements = section.select(selector)
-                    for elem in score_elements:
-                        score_text = elem.text.strip()
-                        
-                        # Skip elements that are clearly not scores
-                        if 'score' not in score_text.lower() and not re.search(r'\d+\s*\/\s*\d+', score_text):
-                            # Check if the element contains only numbers and symbols
-                            if not re.match(r'^[\d\s\/\.]+$', score_text):
-                                continue
-                        
-                        # Try specific patterns first
-                        score_match = re.search(r'(\d+)\s*\/\s*(\d+)', score_text)
-                        if score_match:
-                            q_score = int(score_match.group(1))
-                            q_max_score = int(score_match.group(2))
-                            score_found = True
-                            break
-                        
-                        # Try other patterns
-                        score_match = re.search(r'(?:score|marks|points|grade):\s*(\d+)', score_text, re.IGNORECASE)
-                        if score_match:
-                            q_score = int(score_match.group(1))
-                            score_found = True
-                            break
-                        
-                        # Just find any number as last resort
-                        numbers = re.findall(r'\d+', score_text)
-                        if numbers:
-                            q_score = int(numbers[0])
-                            if len(numbers) > 1:
-                                q_max_score = int(numbers[1])
-                            score_found = True
-                            break
-                    
-                    if score_found:
-                        break
-                
-                # Scale score if needed
-                if q_max_score != 100 and q_max_score > 0:
-                    q_score = int((q_score / q_max_score) * 100)
-                    q_max_score = 100
-                
-                # Extract feedback
-                feedback = ""
-                feedback_selectors = ['.feedback', '.comment', '.evaluation', '.remarks', '.assessment']
-                for selector in feedback_selectors:
-                    elems = section.select(selector)
-                    for elem in elems:
-                        text = elem.text.strip()
-                        if len(text) > 10 and 'feedback' in text.lower() or not feedback:
-                            feedback = text
-                            break
-                    if feedback:
-                        break
-                
-                # Get strengths with improved extraction
-                strengths = []
-                strength_keywords = ['strength', 'positive', 'pro', 'good', 'excellent']
-                for keyword in strength_keywords:
-                    # Try to find elements with the keyword in class or containing text
-                    elements = section.select(f'.{keyword}') or section.find_all(
-                        lambda tag: keyword in tag.get_text().lower() and tag.name in ['div', 'ul', 'p']
-                    )
-                    
-                    if elements:
-                        for elem in elements:
-                            # Try to get list items first
-                            items = elem.select('li')
-                            if items:
-                                for item in items:
-                                    item_text = item.text.strip()
-                                    if item_text and len(item_text) > 5:
-                                        strengths.append(item_text)
-                            # If no list items, use the text content
-                            elif elem.text and len(elem.text) > 10:
-                                strengths.append(elem.text.strip())
-                        # If we found strengths, stop looking
-                        if strengths:
-                            break
-                
-                # Get improvements with improved extraction
-                improvements = []
-                improvement_keywords = ['improve', 'improvement', 'negative', 'con', 'weakness', 'area']
-                for keyword in improvement_keywords:
-                    # Try to find elements with the keyword in class or containing text
-                    elements = section.select(f'.{keyword}') or section.find_all(
-                        lambda tag: keyword in tag.get_text().lower() and tag.name in ['div', 'ul', 'p']
-                    )
-                    
-                    if elements:
-                        for elem in elements:
-                            # Try to get list items first
-                            items = elem.select('li')
-                            if items:
-                                for item in items:
-                                    item_text = item.text.strip()
-                                    if item_text and len(item_text) > 5:
-                                        improvements.append(item_text)
-                            # If no list items, use the text content
-                            elif elem.text and len(elem.text) > 10:
-                                improvements.append(elem.text.strip())
-                        # If we found improvements, stop looking
-                        if improvements:
-                            break
-                
+            questions.append({
+                "id": i + 1,
+                "questionNumber": card["questionNumber"],
+                "questionText": card["questionText"],
+                "studentAnswer": card["studentAnswer"],
+                "score": q_score,
+                "maxScore": q_max_score,
+                "feedback": card["feedback"],
                 # Default values if extraction failed
-                if not strengths:
-                    strengths = ["Good understanding of the concept"]
-                if not improvements:
-                    improvements = ["Could provide more detailed examples"]
-                
-                # Create question data structure
-                question_data = {
-                    "id": i + 1,
-                    "questionNumber": question_number,
-                    "questionText": question_text,
-                    "studentAnswer": student_answer,
-                    "score": q_score,
-                    "maxScore": q_max_score,
-                    "feedback": feedback,
-                    "strengths": strengths,
-                    "improvements": improvements
-                }
-                questions.append(question_data)
-                
-            except Exception as e:
-                logger.error(f"Error processing question {i+1}: {str(e)}", exc_info=True)
-                # Add a placeholder question
-                questions.append({
-                    "id": i + 1,
-                    "questionNumber": i + 1,
-                    "questionText": f"Question {i+1}",
-                    "studentAnswer": "Unable to parse answer",
-                    "score": 70,  # Default score
-                    "maxScore": 100,
-                    "feedback": "Error extracting feedback",
-                    "strengths": ["Error extracting strengths"],
-                    "improvements": ["Error extracting improvements"]
-                })
+                "strengths": card["strengths"] or ["Good understanding of the concept"],
+                "improvements": card["improvements"] or ["Could provide more detailed examples"]
+            })
+        
+        # An explicit overall score wins; otherwise the first card's score stands in, as before
+        overall_score, max_score = None, 100
+        if document.get("overall_score"):
+            overall_score, max_score = parse_score(document["overall_score"])
+        elif cards and cards[0]["score"] is not None:
+            overall_score, max_score = cards[0]["score"], cards[0]["maxScore"]
+        if overall_score is None:
+            overall_score = 85  # Default value if extraction fails
         
         # Create JSON structure
         evaluation_data = {
             "id": f"eval-{int(time.time())}",
-            "studentName": student_name,
-            "subject": subject,
-            "year": year,
-            "semester": semester,
+            "studentName": next((card["studentName"] for card in cards if card["studentName"]), "Unknown Student"),
+            "subject": document.get("subject") or "Unknown Subject",
+            "year": document.get("year") or "Unknown Year",
+            "semester": document.get("semester") or "Unknown Semester",
             "submissionDate": datetime.now().isoformat(),
             "overallScore": overall_score,
             "maxScore": max_score,
@@ -467,194 +513,6 @@ def generate_json_results():
         return None
 
 
-def parse_html_results(html_file_path=None):
-    """Parse HTML results directly on demand"""
-    try:
-        # Use provided path or default
-        file_path = html_file_path or APP_CONFIG["RESULTS_FILE"]
-        
-        # Check if HTML results file exists
-        if not os.path.exists(file_path):
-            logger.warning("HTML results file not found at: " + file_path)
-            return None
-            
-        # Read the HTML file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            
-        # Use BeautifulSoup to parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extract metadata
-        student_info = soup.select_one('.student-info')
-        student_name = "Unknown Student"
-        subject = "Unknown Subject"
-        year = "Unknown Year"
-        semester = "Unknown Semester"
-        
-        if student_info:
-            name_elem = student_info.select_one('.student-name')
-            subject_elem = student_info.select_one('.subject')
-            year_elem = student_info.select_one('.year')
-            semester_elem = student_info.select_one('.semester')
-            
-            student_name = name_elem.text.strip() if name_elem else student_name
-            subject = subject_elem.text.strip() if subject_elem else subject
-            year = year_elem.text.strip() if year_elem else year
-            semester = semester_elem.text.strip() if semester_elem else semester
-        else:
-            # Try alternative methods to find student info
-            title_elem = soup.select_one('h1') or soup.select_one('title')
-            if title_elem and ":" in title_elem.text:
-                student_name = title_elem.text.split(":")[1].strip()
-        
-        # Extract overall score with direct HTML parsing
-        score_element = soup.select_one('.overall-score, .total-score, .score, .total')
-        overall_score = 85  # Default value if extraction fails
-        max_score = 100
-        
-        if score_element:
-            score_text = score_element.text.strip()
-            # Try to extract score directly from text
-            import re
-            
-            # Look for specific patterns in the score text
-            score_patterns = [
-                r'(\d+)\s*\/\s*(\d+)',  # Matches "85/100"
-                r'Score:\s*(\d+)',       # Matches "Score: 85"
-                r'Total:\s*(\d+)',       # Matches "Total: 85"
-                r'(\d+)\s*points',       # Matches "85 points"
-            ]
-            
-            for pattern in score_patterns:
-                match = re.search(pattern, score_text, re.IGNORECASE)
-                if match:
-                    if len(match.groups()) > 1:
-                        overall_score = int(match.group(1))
-                        max_score = int(match.group(2))
-                    else:
-                        overall_score = int(match.group(1))
-                    break
-        
-        # Find all question sections directly from HTML
-        questions = []
-        
-        # Try to locate question sections using most common structures
-        question_elements = soup.select('.question, .question-section, section, .card')
-        
-        if not question_elements:
-            # Try looking for headings that might indicate questions
-            question_headers = soup.select('h2, h3, h4')
-            for header in question_headers:
-                text = header.text.lower()
-                if 'question' in text or text.startswith('q') or re.match(r'^\d+\.', text):
-                    # Found a question header, use its parent as the question element
-                    question_elements.append(header.parent)
-        
-        # Process each question from the HTML
-        for i, element in enumerate(question_elements):
-            q_data = {}
-            q_data["id"] = i + 1
-            
-            # Get question text from heading or first paragraph
-            q_text_elem = element.select_one('h2, h3, h4, strong, b, p')
-            q_data["questionText"] = q_text_elem.text.strip() if q_text_elem else f"Question {i+1}"
-            
-            # Extract question number from text if possible
-            q_data["questionNumber"] = i + 1
-            import re
-            if q_text_elem:
-                q_num_match = re.search(r'question\s*(\d+)|q\.?\s*(\d+)|#\s*(\d+)|^(\d+)[\.:]', 
-                                      q_text_elem.text, re.IGNORECASE)
-                if q_num_match:
-                    # Take the first non-None group
-                    groups = q_num_match.groups()
-                    for group in groups:
-                        if group:
-                            q_data["questionNumber"] = int(group)
-                            break
-            
-            # Get student answer - look for paragraphs inside the question
-            answer_elems = element.select('p')
-            q_data["studentAnswer"] = ""
-            for p in answer_elems:
-                text = p.text.strip()
-                if text and len(text) > 15 and not text.startswith("Question"):
-                    q_data["studentAnswer"] = text
-                    break
-            
-            # Extract score
-            score_elem = element.select_one('.score, .marks, .points, .grade, span, strong')
-            q_data["score"] = 70  # Default score if not found
-            q_data["maxScore"] = 100
-            
-            if score_elem:
-                score_text = score_elem.text.strip()
-                # Try common score patterns
-                score_match = re.search(r'(\d+)\s*\/\s*(\d+)', score_text)
-                if score_match:
-                    q_data["score"] = int(score_match.group(1))
-                    q_data["maxScore"] = int(score_match.group(2))
-                else:
-                    # Try just finding any number
-                    numbers = re.findall(r'\d+', score_text)
-                    if numbers:
-                        q_data["score"] = int(numbers[0])
-            
-            # Get feedback, strengths and improvements directly from HTML
-            feedback_elem = element.select_one('.feedback, .comment, .evaluation')
-            q_data["feedback"] = feedback_elem.text.strip() if feedback_elem else ""
-            
-            # Look for strengths
-            strengths = []
-            strength_elem = element.select_one('.strength, .positive, .pro')
-            if strength_elem:
-                # Check for list items first
-                li_elems = strength_elem.select('li')
-                if li_elems:
-                    for li in li_elems:
-                        strengths.append(li.text.strip())
-                else:
-                    strengths.append(strength_elem.text.strip())
-            
-            q_data["strengths"] = strengths if strengths else ["Good understanding of the concept"]
-            
-            # Look for improvements
-            improvements = []
-            improve_elem = element.select_one('.improve, .negative, .con, .weakness')
-            if improve_elem:
-                # Check for list items first
-                li_elems = improve_elem.select('li')
-                if li_elems:
-                    for li in li_elems:
-                        improvements.append(li.text.strip())
-                else:
-                    improvements.append(improve_elem.text.strip())
-            
-            q_data["improvements"] = improvements if improvements else ["Could provide more detailed examples"]
-            
-            questions.append(q_data)
-        
-        # Create result structure
-        result = {
-            "id": f"eval-{int(time.time())}",
-            "studentName": student_name,
-            "subject": subject,
-            "year": year,
-            "semester": semester,
-            "submissionDate": datetime.now().isoformat(),
-            "overallScore": overall_score,
-            "maxScore": max_score,
-            "questions": questions
-        }
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error parsing HTML results: {str(e)}", exc_info=True)
-        return None
-
-
 # ----- Route definitions -----
 
 @app.route('/')
@@ -665,7 +523,7 @@ def index():
 
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
-    """Handle file upload"""
+    """Handle the upload of an answer file, or of a zip/tar archive of answer files"""
     try:
         if 'file' not in request.files:
             return jsonify({'status': 'error', 'message': 'No file part'}), 400
@@ -680,13 +538,18 @@ def upload_file():
         year = request.form.get('year', 'Unknown')
         semester = request.form.get('semester', 'Unknown')
         
-        # Save the file
-        filename = f"{subject}_{year}_{semester}_{int(time.time())}.txt"
-        filepath = os.path.join(APP_CONFIG["UPLOAD_FOLDER"], filename)
-        file.save(filepath)
+        eval_id, created, error = upload_job(subject, year, semester)
+        if error:
+            return error
+        
+        if is_archive(file.filename):
+            return upload_archive(file, eval_id, created)
         
-        # Generate a unique ID for this evaluation
-        eval_id = f"eval-{int(time.time())}"
+        # Save the file in the job's own folder
+        folder = upload_folder(eval_id)
+        filename = f"{subject}_{year}_{semester}_{int(time.time())}.txt"
+        file.save(os.path.join(folder, filename))
+        job_registry.update(eval_id, upload_file=folder)
         
         logger.info(f"File uploaded successfully: {filename}, evaluation ID: {eval_id}")
         
@@ -701,6 +564,77 @@ def upload_file():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+def upload_job(subject, year, semester):
+    """
+    Return (job id, whether it was just created, error response) for an upload
+
+    With the form field evaluationId the upload is added to that job, so a class can
+    be built from several uploads; otherwise a new job is registered for it. Jobs
+    that are queued or running take no more uploads.
+    """
+    job_id = request.form.get('evaluationId')
+    if not job_id:
+        job_id = job_registry.create(status="uploaded", subject=subject, year=year, semester=semester)
+        return job_id, True, None
+    
+    job = job_registry.get(job_id)
+    if job is None:
+        return None, False, (jsonify({'status': 'error', 'message': f"Unknown evaluation: {job_id}"}), 404)
+    if job["status"] in ACTIVE_STATUSES:
+        return None, False, (jsonify({
+            'status': 'error',
+            'message': "Evaluation already in progress",
+            'evaluationId': job_id
+        }), 409)
+    return job_id, False, None
+
+
+def upload_archive(file, eval_id, created):
+    """
+    Extract a zip/tar of student answer files into a job's upload folder
+
+    Files whose content did not change since an earlier upload to the same job are
+    left alone. With the form field grade=true, a job with new or changed answers
+    is queued for grading right away.
+    """
+    folder = upload_folder(eval_id)
+    try:
+        summary = extract_answers(file.stream, file.filename, folder)
+    except ArchiveError as e:
+        if created:
+            job_registry.update(eval_id, status="error", message=str(e),
+                                error={"type": "ArchiveError", "stage": "upload", "message": str(e)})
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    changed = len(summary["added"]) + len(summary["updated"])
+    job_registry.update(
+        eval_id, upload_file=folder,
+        message=f"Extracted {changed} new or changed answer files from {file.filename}"
+    )
+    logger.info(
+        f"Archive {file.filename} uploaded, evaluation ID {eval_id}: {len(summary['added'])} added, "
+        f"{len(summary['updated'])} updated, {len(summary['unchanged'])} unchanged, "
+        f"{len(summary['skipped'])} skipped"
+    )
+    
+    grading_queued = False
+    if changed and request.form.get('grade', '').lower() in ('1', 'true', 'yes'):
+        with job_start_lock:
+            if job_registry.count_active() < APP_CONFIG["MAX_ACTIVE_JOBS"]:
+                run_auto_checker(eval_id)
+                grading_queued = True
+            else:
+                logger.warning(f"Archive job {eval_id} not queued: too many jobs queued or running")
+    
+    return jsonify({
+        'status': 'success',
+        'message': f"Archive extracted: {changed} new or changed answer files",
+        'evaluationId': eval_id,
+        'gradingQueued': grading_queued,
+        'archive': summary
+    })
+
+
 @app.route('/start_evaluation', methods=['POST', 'OPTIONS'])
 def start_evaluation():
     """Start the evaluation process"""
@@ -708,36 +642,152 @@ def start_evaluation():
     if request.method == 'OPTIONS':
         return '', 204
         
-    global evaluation_status
+    # An upload's evaluation ID grades that job; without one a new job is created
+    data = request.get_json(silent=True) or {}
+    job_id = data.get("evaluationId")
     
-    # Don't start if already running
-    if evaluation_status["running"]:
-        logger.warning("Attempted to start evaluation while already running")
-        return jsonify({
-            "status": "error", 
-            "message": "Evaluation already in progress"
-        })
-    
-    # Start evaluation in a separate thread
-    thread = threading.Thread(target=run_auto_checker)
-    thread.daemon = True
-    thread.start()
+    with job_start_lock:
+        if job_id:
+            job = job_registry.get(job_id)
+            if job is None:
+                return jsonify({"status": "error", "message": f"Unknown evaluation: {job_id}"}), 404
+            if job["status"] in ACTIVE_STATUSES:
+                logger.warning(f"Attempted to start evaluation job {job_id} while already running")
+                return jsonify({
+                    "status": "error", 
+                    "message": "Evaluation already in progress",
+                    "evaluationId": job_id
+                }), 409
+        
+        if job_registry.count_active() >= APP_CONFIG["MAX_ACTIVE_JOBS"]:
+            logger.warning("Rejected evaluation request: too many jobs queued or running")
+            return jsonify({
+                "status": "error", 
+                "message": "Too many evaluations in progress, try again later"
+            }), 429
+        
+        if not job_id:
+            job_id = job_registry.create(status="uploaded")
+        run_auto_checker(job_id)
     
-    logger.info("Evaluation process started in background thread")
-    return jsonify({"status": "started"})
+    logger.info(f"Evaluation job {job_id} queued on the grading worker")
+    return jsonify({"status": "started", "evaluationId": job_id})
 
 
 @app.route('/status')
 def check_status():
-    """Check the status of the evaluation process"""
-    return jsonify(evaluation_status)
+    """Check the status of an evaluation job (?job=<id>), by default the most recent one"""
+    job_id = request.args.get('job')
+    job = job_registry.get(job_id) if job_id else job_registry.latest(statuses=("queued", "running", "complete", "error"))
+    if job_id and job is None:
+        return jsonify({"status": "error", "message": f"Unknown evaluation: {job_id}"}), 404
+    return jsonify(job_status(job))
+
+
+@app.route('/api/jobs')
+def list_jobs():
+    """List recent evaluation jobs, optionally filtered by ?status="""
+    status = request.args.get('status')
+    limit = min(int(request.args.get('limit', 50)), 500)
+    return jsonify({"jobs": [job_status(job) for job in job_registry.list(status=status, limit=limit)]})
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Get the status, progress and timings of one evaluation job"""
+    job = job_registry.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": f"Unknown evaluation: {job_id}"}), 404
+    return jsonify(job_status(job))
+
+
+@app.route('/api/grading/hosts')
+def get_grading_hosts():
+    """Get the Ollama hosts grading runs are sent to, with their load and health when pooled"""
+    llm = grading_worker.llm
+    if hasattr(llm, "stats"):
+        payload = {"pooled": True, "hosts": llm.stats()}
+    else:
+        payload = {"pooled": False, "hosts": [{"baseUrl": llm.base_url}]}
+    if hasattr(llm, "streaming_stats"):
+        # Completions cut short by streamed grading (AUTO_CHECKER_STREAM)
+        payload["streaming"] = llm.streaming_stats()
+    return jsonify(payload)
+
+
+@app.route('/api/evaluation/events')
+def evaluation_events():
+    """Stream evaluation progress and finished evaluations as Server-Sent Events (?job= follows one job)"""
+    job_id = request.args.get('job')
+    subscriber = queue.Queue()
+    with progress_subscribers_lock:
+        progress_subscribers.append(subscriber)
+    
+    def stream():
+        try:
+            # Send the current state first so clients that connect mid-run can render immediately
+            job = job_registry.get(job_id) if job_id else job_registry.latest(statuses=ACTIVE_STATUSES)
+            yield format_sse("status", job_status(job))
+            while True:
+                try:
+                    event_type, data = subscriber.get(timeout=15)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                if job_id and data.get("jobId") != job_id:
+                    continue
+                yield format_sse(event_type, data)
+        finally:
+            with progress_subscribers_lock:
+                progress_subscribers.remove(subscriber)
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 
 @app.route('/api/results/<evaluation_id>')
 def get_evaluation_results(evaluation_id):
     """Get the evaluation results in JSON format"""
     try:
-        if os.path.exists(APP_CONFIG["JSON_RESULTS_FILE"]):
+        job = job_registry.get(evaluation_id)
+        if job is not None and job["status"] != "complete":
+            return jsonify({
+                "status": "error",
+                "message": "Results are not available for this evaluation yet",
+                "job": job_status(job)
+            }), 409 if job["status"] in ACTIVE_STATUSES else 404
+        
+        stored_id = stored_evaluation_id(evaluation_id)
+        if stored_id:
+            def build():
+                requested = request.args.get('student')
+                # Optionally pick a student by name, otherwise return the first one
+                students = results_store.student_results(stored_id, student_name=requested) if requested else []
+                if not students:
+                    students = results_store.student_results(stored_id, limit=1)
+                results = students[0]
+                results["id"] = evaluation_id
+                return results
+            
+            evaluation = results_store.get_evaluation(stored_id)
+            if evaluation["student_count"]:
+                return conditional_json(stored_results_version(evaluation), build)
+        if job is not None:
+            return jsonify({"status": "error", "message": "Results not found"}), 404
+        
+        # Ids that are not registered jobs read the results of command-line runs
+        records = load_result_records(APP_CONFIG["RECORDS_FILE"])
+        if records:
+            students = build_student_results(records, evaluation_id)
+            # Optionally pick a student by name, otherwise return the first one
+            requested = request.args.get('student')
+            results = next((st for st in students if st["studentName"] == requested), students[0])
+            results["id"] = evaluation_id
+            return jsonify(results)
+        elif os.path.exists(APP_CONFIG["JSON_RESULTS_FILE"]):
             with open(APP_CONFIG["JSON_RESULTS_FILE"], 'r') as f:
                 results = json.load(f)
                 
@@ -761,20 +811,15 @@ def get_evaluation_results(evaluation_id):
 
 @app.route('/results')
 def view_results():
-    """Display the evaluation results"""
-    if not os.path.exists(APP_CONFIG["RESULTS_FILE"]):
+    """Display the evaluation results of a job (?job=<id>), by default the latest completed one"""
+    results_file = results_source(request.args.get('job'))[1]["results_file"]
+    if not os.path.exists(results_file):
         logger.warning("Results file not found when attempting to view results")
         return {"error": "No evaluation results found."}, 404
     
-    # Just return the HTML content directly
+    # Unchanged reports are answered with 304 from the file's version alone
     try:
-        with open(APP_CONFIG["RESULTS_FILE"], "r", encoding="utf-8") as file:
-            results_html = file.read()
-        
-        # Set content type to text/html explicitly
-        response = make_response(results_html)
-        response.headers["Content-Type"] = "text/html"
-        return response
+        return conditional_file(results_file, "text/html")
     except Exception as e:
         logger.error(f"Error reading results file: {str(e)}", exc_info=True)
         return {"error": f"Error reading results: {str(e)}"}, 500
@@ -782,10 +827,11 @@ def view_results():
 
 @app.route('/download_results')
 def download_results():
-    """Download the results file"""
-    if os.path.exists(APP_CONFIG["RESULTS_FILE"]):
+    """Download the results file of a job (?job=<id>), by default the latest completed one"""
+    results_file = results_source(request.args.get('job'))[1]["results_file"]
+    if os.path.exists(results_file):
         logger.info("Serving results file for download")
-        return send_file(APP_CONFIG["RESULTS_FILE"], as_attachment=True)
+        return conditional_file(results_file, "text/html", download_name=os.path.basename(results_file))
     else:
         logger.warning("Results file not found when attempting to download")
         return jsonify({
@@ -797,15 +843,37 @@ def download_results():
 @app.route('/check_results_exist')
 def check_results_exist():
     """Check if evaluation results file exists"""
-    results_exist = os.path.exists(APP_CONFIG["RESULTS_FILE"])
+    paths = results_source()[1]
+    results_exist = os.path.exists(paths["records_file"]) or os.path.exists(paths["results_file"])
     return jsonify({"exists": results_exist})
 
 
 @app.route('/api/students_results')
 def get_students_results():
-    """Get all students' evaluation results in JSON format"""
+    """Get students' evaluation results in JSON format, optionally paged, sorted, filtered and projected"""
     try:
-        # First, ensure we have the latest JSON data from HTML by regenerating it
+        # Results saved by the grader are served straight from the indexed store
+        subject = request.args.get('subject')
+        if subject and not request.args.get('job'):
+            # A subject selects the most recent evaluation of that subject
+            stored_id = results_store.latest_evaluation_id(subject=subject)
+            if not stored_id:
+                return jsonify({"students": [], "nextCursor": None, "total": 0})
+        else:
+            stored_id = stored_evaluation_id(request.args.get('job'))
+        if stored_id:
+            try:
+                query = parse_students_query(request.args)
+            except ValueError as e:
+                return jsonify({"status": "error", "message": str(e)}), 400
+            
+            def build():
+                students, next_cursor, total = results_store.query_students(stored_id, **query)
+                return {"students": students, "nextCursor": next_cursor, "total": total}
+            
+            return conditional_json(stored_results_version(results_store.get_evaluation(stored_id)), build)
+        
+        # Legacy path: rebuild the data from an HTML-only results file
         base_data = generate_json_results()
         
         # If generation failed, try to load existing JSON file
@@ -1116,6 +1184,41 @@ def get_students_results():
         }), 500
 
 
+@app.route('/api/analytics')
+def get_analytics():
+    """
+    Class analytics of an evaluation (?job=<id> or ?subject=<name>, by default the latest one)
+
+    Running jobs are answered from the scores graded so far; finished evaluations
+    from the results store, with an ETag per stored version.
+    """
+    try:
+        job_id = request.args.get('job')
+        job = job_registry.get(job_id) if job_id else None
+        if job is not None and job["status"] in ACTIVE_STATUSES:
+            matrix = class_analytics.live(job_id)
+            summary = matrix.summary() if matrix is not None else ScoreMatrix().summary()
+            return jsonify(dict(summary, evaluationId=job_id, live=True, job=job_status(job)))
+
+        subject = request.args.get('subject')
+        if subject and not job_id:
+            stored_id = results_store.latest_evaluation_id(subject=subject)
+        else:
+            stored_id = stored_evaluation_id(job_id)
+        if not stored_id:
+            return jsonify({"status": "error", "message": "Results not found"}), 404
+
+        evaluation = results_store.get_evaluation(stored_id)
+        version = stored_results_version(evaluation)
+        return conditional_json(
+            version,
+            lambda: dict(class_analytics.stored(stored_id, version).summary(), evaluationId=stored_id, live=False)
+        )
+    except Exception as e:
+        logger.error(f"Error computing analytics: {str(e)}", exc_info=True)
+        return jsonify({"status": "error", "message": f"Error computing analytics: {str(e)}"}), 500
+
+
 # ----- Application entry point -----
 
 if __name__ == '__main__':
@@ -1,13 +1,134 @@
 import os
+import sys
 import csv
-import pandas as pd
+import re
+import json
+import time
+import argparse
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from langchain.llms import Ollama
+from evaluation_cache import EvaluationCache
+from evaluation_journal import EvaluationJournal
+from ollama_pool import OllamaHostPool
+from verdict_stream import StreamingVerdictClient
+from report_renderer import HtmlReportWriter, JsonlResultsWriter
+from prescoring import NO_ANSWER_PLACEHOLDER, prescore
+from results_store import ResultsStore, iter_result_records
 
 # File paths for questions and answer keys
 QUESTIONS_FILE = "questions.txt"
 ANSWERS_FILE = "answers.txt"
 # Folder containing student answers (one file per student, e.g., "Ali.txt", "Bob.txt")
 STUDENT_ANSWERS_FOLDER = "student_answers"
+# Number of evaluations kept in flight against Ollama at the same time
+DEFAULT_WORKERS = int(os.environ.get("AUTO_CHECKER_WORKERS", "4"))
+# Persistent cache of parsed evaluations, shared across runs
+CACHE_FILE = "evaluation_cache.sqlite3"
+# Journal of evaluations finished by the current run, used by --resume after a crash
+JOURNAL_FILE = "evaluation_journal.jsonl"
+# Marker for machine-readable progress lines printed with --progress
+PROGRESS_PREFIX = "PROGRESS "
+
+# HTML report written at the end of every run
+RESULTS_FILE = "evaluation_results.html"
+# Canonical machine-readable results, one JSON record per evaluation
+RECORDS_FILE = "evaluation_results.jsonl"
+# Indexed store of finished runs, read by the Flask results endpoints
+RESULTS_DB = "evaluation_results.sqlite3"
+
+MODEL_NAME = "deepseek-r1"
+OLLAMA_BASE_URL = "http://127.0.0.1:11434"
+# Ollama servers grading is spread across (comma-separated); a single host is used directly
+OLLAMA_HOSTS = [host.strip() for host in os.environ.get("AUTO_CHECKER_OLLAMA_HOSTS", OLLAMA_BASE_URL).split(",") if host.strip()]
+# Requests each host serves at once when grading on several hosts; match its OLLAMA_NUM_PARALLEL
+DEFAULT_HOST_CONCURRENCY = int(os.environ.get("AUTO_CHECKER_HOST_CONCURRENCY", "4"))
+# Seconds a pooled request may wait on a silent host before failing over (the model may need loading)
+OLLAMA_REQUEST_TIMEOUT = float(os.environ.get("AUTO_CHECKER_OLLAMA_TIMEOUT", "300"))
+# Stream completions and stop each one as soon as its verdict is complete (--stream)
+STREAM_GRADING = os.environ.get("AUTO_CHECKER_STREAM", "0") == "1"
+# Tokens a streamed completion may spend inside <think> before it is made to answer (0 disables)
+DEFAULT_THINK_BUDGET = int(os.environ.get("AUTO_CHECKER_THINK_BUDGET", "2048"))
+# How long Ollama keeps the model loaded after a request, so consecutive runs start warm
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+# Bump PROMPT_VERSION whenever PROMPT_TEMPLATE changes so cached evaluations are not reused
+PROMPT_VERSION = "v3"
+PROMPT_TEMPLATE = (
+    "Question: {question}\n"
+    "Answer Key: {answer_key}\n"
+    "Student Answer: {student_answer}\n\n"
+    "Please evaluate the student's answer in detail. First, think through your evaluation step by step within <think> </think> tags.\n\n"
+    "After your thinking, provide your final evaluation following EXACTLY this format:\n"
+    "Score: [PROVIDE ONLY A NUMERICAL SCORE FROM 0 TO 100, WITH NO OTHER TEXT OR SYMBOLS]\n"
+    "Feedback: [overall evaluation of the answer in plain text, no special formatting]\n"
+    "Strengths:\n- [strength point 1]\n- [strength point 2]\n- [etc.]\n"
+    "Areas for Improvement:\n- [improvement point 1]\n- [improvement point 2]\n- [etc.]\n\n"
+    "IMPORTANT: The score MUST be a number between 0-100 with no other text. Do not use a scale of 0-10 or include any symbols, just the numerical value."
+)
+
+# Default number of student answers graded together in one prompt (1 disables batching)
+DEFAULT_BATCH_SIZE = int(os.environ.get("AUTO_CHECKER_BATCH_SIZE", "1"))
+BATCH_PROMPT_VERSION = "v3-batch1"
+BATCH_PROMPT_TEMPLATE = (
+    "Question: {question}\n"
+    "Answer Key: {answer_key}\n\n"
+    "Below are {count} student answers to this question, one per line, each labelled [Student N]:\n"
+    "{student_answers}\n\n"
+    "Please evaluate every student's answer independently and in detail. First, think through your evaluations step by step within <think> </think> tags.\n\n"
+    "After your thinking, provide a final evaluation for EVERY student, in order, following EXACTLY this format:\n"
+    "=== Student N ===\n"
+    "Score: [PROVIDE ONLY A NUMERICAL SCORE FROM 0 TO 100, WITH NO OTHER TEXT OR SYMBOLS]\n"
+    "Feedback: [overall evaluation of the answer in plain text, no special formatting]\n"
+    "Strengths:\n- [strength point 1]\n- [strength point 2]\n- [etc.]\n"
+    "Areas for Improvement:\n- [improvement point 1]\n- [improvement point 2]\n- [etc.]\n\n"
+    "IMPORTANT: Each score MUST be a number between 0-100 with no other text. Do not use a scale of 0-10 or include any symbols, just the numerical value."
+)
+# Answers whose lexical similarity to the key is below this floor score 0 without the LLM (0 disables)
+DEFAULT_SIMILARITY_FLOOR = float(os.environ.get("AUTO_CHECKER_SIMILARITY_FLOOR", "0"))
+BATCH_MARKER_PATTERN = re.compile(r"^\s*=+\s*Student\s+(\d+)\s*=+\s*$", re.MULTILINE | re.IGNORECASE)
+
+class GradingError(Exception):
+    """A grading run could not be started or completed."""
+
+    def __init__(self, message, stage):
+        super().__init__(message)
+        self.stage = stage
+
+    def to_dict(self):
+        """Return the error as structured data for API responses."""
+        return {"type": type(self).__name__, "stage": self.stage, "message": str(self)}
+
+def create_llm(base_url=OLLAMA_BASE_URL, timeout=None):
+    """Create the LangChain Ollama client for deepseek‑r1."""
+    return Ollama(model=MODEL_NAME, base_url=base_url, keep_alive=OLLAMA_KEEP_ALIVE, timeout=timeout)
+
+def create_grading_llm(hosts=None, host_concurrency=DEFAULT_HOST_CONCURRENCY, stream=STREAM_GRADING,
+                       think_budget=DEFAULT_THINK_BUDGET):
+    """
+    Create the client grading runs call: the plain client for a single Ollama host,
+    or an OllamaHostPool that load-balances and fails over across several.
+
+    With `stream`, the client is wrapped so completions are parsed as they stream
+    in, cancelled once the verdict is complete and their <think> block is capped
+    at `think_budget` tokens.
+    """
+    hosts = hosts or OLLAMA_HOSTS
+    if len(hosts) == 1:
+        llm = create_llm(hosts[0])
+    else:
+        llm = OllamaHostPool(
+            hosts, lambda base_url: create_llm(base_url, timeout=OLLAMA_REQUEST_TIMEOUT),
+            max_concurrency=host_concurrency, model=MODEL_NAME
+        )
+    if stream:
+        llm = StreamingVerdictClient(llm, think_budget=think_budget)
+    return llm
+
+def grading_workers(llm, workers):
+    """Number of answers to grade at once with `llm`: at least `workers`, more for a host pool."""
+    # A host pool can take more requests in flight than one host
+    return max(workers, getattr(llm, "capacity", 0))
 
 def load_text_file(file_path):
     """Load a text file and return a list of non-empty, stripped lines."""
@@ -21,33 +142,37 @@ def evaluate_answer(llm, question, answer_key, student_answer):
     
     Returns a tuple: (score, feedback, strengths, improvements, model_thoughts)
     """
-    prompt = (
-        f"Question: {question}\n"
-        f"Answer Key: {answer_key}\n"
-        f"Student Answer: {student_answer}\n\n"
-        "Please evaluate the student's answer in detail. First, think through your evaluation step by step within <think> </think> tags.\n\n"
-        "After your thinking, provide your final evaluation following EXACTLY this format:\n"
-        "Score: [PROVIDE ONLY A NUMERICAL SCORE FROM 0 TO 100, WITH NO OTHER TEXT OR SYMBOLS]\n"
-        "Feedback: [overall evaluation of the answer in plain text, no special formatting]\n"
-        "Strengths:\n- [strength point 1]\n- [strength point 2]\n- [etc.]\n"
-        "Areas for Improvement:\n- [improvement point 1]\n- [improvement point 2]\n- [etc.]\n\n"
-        "IMPORTANT: The score MUST be a number between 0-100 with no other text. Do not use a scale of 0-10 or include any symbols, just the numerical value."
+    prompt = PROMPT_TEMPLATE.format(
+        question=question, answer_key=answer_key, student_answer=student_answer
     )
     
     result = llm(prompt)
-    
+    return parse_evaluation(result)
+
+def split_model_thoughts(result):
+    """Return (model_thoughts, text after the <think> block) for a raw model response."""
+    if "<think>" in result and "</think>" in result:
+        model_thoughts = result.split("<think>")[1].split("</think>")[0].strip()
+        # Remove the think block from the result
+        return model_thoughts, result.split("</think>")[-1].strip()
+    return "", result.strip()
+
+def parse_evaluation(result, model_thoughts=None):
+    """
+    Parse a Score / Feedback / Strengths / Areas for Improvement response.
+
+    If `model_thoughts` is given, `result` is treated as already stripped of its
+    <think> block. Returns a tuple: (score, feedback, strengths, improvements, model_thoughts)
+    """
     # Initialize default values
-    model_thoughts = ""
     score = "Error"
     feedback = ""
     strengths = ""
     improvements = ""
     
     # Extract model_thoughts if present
-    if "<think>" in result and "</think>" in result:
-        model_thoughts = result.split("<think>")[1].split("</think>")[0].strip()
-        # Remove the think block from the result
-        post_think = result.split("</think>")[-1].strip()
+    if model_thoughts is None:
+        model_thoughts, post_think = split_model_thoughts(result)
     else:
         post_think = result.strip()
     
@@ -96,178 +221,385 @@ def evaluate_answer(llm, question, answer_key, student_answer):
     
     return score, feedback, strengths, improvements, model_thoughts
 
-def main():
-    # Load questions and answer keys
-    questions = load_text_file(QUESTIONS_FILE)
-    answers = load_text_file(ANSWERS_FILE)
+def evaluate_answers_batch(llm, question, answer_key, student_answers):
+    """
+    Grade several answers to the same question with a single prompt.
+
+    The question and answer key are sent once, followed by every numbered student
+    answer. Returns one evaluation tuple per answer, or None for answers whose
+    verdict could not be parsed so the caller can grade them individually.
+    """
+    answers_block = "\n".join(
+        f"[Student {i}] {answer}" for i, answer in enumerate(student_answers, start=1)
+    )
+    prompt = BATCH_PROMPT_TEMPLATE.format(
+        question=question, answer_key=answer_key,
+        count=len(student_answers), student_answers=answers_block
+    )
     
-    if len(questions) != len(answers):
-        print("Error: The number of questions and answers do not match!")
-        return
+    result = llm(prompt)
+    return parse_batch_evaluation(result, len(student_answers))
 
+def parse_batch_evaluation(result, count):
+    """Split a batched response into per-student evaluation tuples (None where parsing failed)."""
+    model_thoughts, post_think = split_model_thoughts(result)
+    
+    blocks = {}
+    parts = BATCH_MARKER_PATTERN.split(post_think)
+    # parts = [preamble, number, block, number, block, ...]
+    for number, block in zip(parts[1::2], parts[2::2]):
+        blocks.setdefault(int(number), block)
+    
     evaluations = []
+    for i in range(1, count + 1):
+        evaluation = None
+        if i in blocks:
+            evaluation = parse_evaluation(blocks[i], model_thoughts)
+            if not isinstance(evaluation[0], int):
+                evaluation = None
+        evaluations.append(evaluation)
+    return evaluations
 
-    # List all student answer files in the folder
-    student_files = [f for f in os.listdir(STUDENT_ANSWERS_FOLDER) if f.endswith(".txt")]
-    if not student_files:
-        print("Error: No student answer files found in the folder.")
-        return
+def collect_tasks(questions, answers, student_folder=STUDENT_ANSWERS_FOLDER):
+    """
+    Build the list of (student, question) grading tasks.
 
-    # Initialize the LangChain Ollama LLM for deepseek‑r1 with 8 threads.
-    llm = Ollama(model="deepseek-r1", base_url="http://127.0.0.1:11434")
+    Students are sorted by file name so every run grades and reports in the same order.
+    """
+    tasks = []
+    student_files = sorted(f for f in os.listdir(student_folder) if f.endswith(".txt"))
     
     for student_file in student_files:
         student_name, _ = os.path.splitext(student_file)
-        student_file_path = os.path.join(STUDENT_ANSWERS_FOLDER, student_file)
+        student_file_path = os.path.join(student_folder, student_file)
         student_answers = load_text_file(student_file_path)
         
         if len(student_answers) < len(questions):
-            print(f"Warning: {student_name} has fewer answers than questions. Missing answers will be marked as 'No answer provided.'")
+            print(f"Warning: {student_name} has fewer answers than questions. Missing answers will be marked as '{NO_ANSWER_PLACEHOLDER}'")
         
         for i, (question, answer_key) in enumerate(zip(questions, answers), start=1):
-            student_answer = student_answers[i-1] if i-1 < len(student_answers) else "No answer provided."
-            print(f"Evaluating {student_name} - Question {i}...")
-            score, feedback, strengths, improvements, model_thoughts = evaluate_answer(llm, question, answer_key, student_answer)
-            
-            evaluations.append({
+            student_answer = student_answers[i-1] if i-1 < len(student_answers) else NO_ANSWER_PLACEHOLDER
+            tasks.append({
                 "Student Name": student_name,
+                "Question Number": i,
                 "Question": question,
                 "Answer Key": answer_key,
-                "Student Answer": student_answer,
-                "Score": score,
-                "Feedback": feedback,
-                "Strengths": strengths,
-                "Areas for Improvement": improvements,
-                "Model_Thoughts": model_thoughts
+                "Student Answer": student_answer
             })
     
-    # Create a DataFrame from evaluations
-    df = pd.DataFrame(evaluations)
-
-    # Generate fancy HTML output
-    html_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Evaluation Results</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        .evaluation-card {
-            background-color: #fff;
-            border-radius: 8px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-            margin-bottom: 24px;
-            padding: 20px;
-            border-left: 5px solid #4285f4;
-        }
-        .student-info {
-            display: flex;
-            justify-content: space-between;
-            border-bottom: 1px solid #eee;
-            padding-bottom: 10px;
-            margin-bottom: 15px;
-        }
-        .student-name {
-            font-size: 1.4rem;
-            font-weight: bold;
-            color: #4285f4;
-        }
-        .score {
-            font-size: 1.4rem;
-            font-weight: bold;
-        }
-        .score-high {
-            color: #0f9d58;
-        }
-        .score-medium {
-            color: #f4b400;
-        }
-        .score-low {
-            color: #db4437;
-        }
-        .question {
-            font-weight: bold;
-            margin-bottom: 10px;
-        }
-        .section {
-            margin-top: 15px;
-        }
-        .section-title {
-            font-weight: bold;
-            margin-bottom: 5px;
-        }
-        .strengths {
-            background-color: #e6f4ea;
-            border-radius: 4px;
-            padding: 10px;
-        }
-        .improvements {
-            background-color: #fce8e6;
-            border-radius: 4px;
-            padding: 10px;
-        }
-    </style>
-</head>
-<body>
-    <h1>Evaluation Results</h1>
-"""
-
-    # Group by student name
-    for student, group in df.groupby("Student Name"):
-        for _, row in group.iterrows():
-            score_class = "score-high" if isinstance(row["Score"], (int, float)) and row["Score"] >= 80 else \
-                         "score-medium" if isinstance(row["Score"], (int, float)) and row["Score"] >= 60 else \
-                         "score-low"
+    return tasks
+
+def cache_key_for(cache, task, prompt_version=PROMPT_VERSION):
+    """Return the cache key for a task graded with the given prompt version."""
+    return cache.make_key(MODEL_NAME, prompt_version, task["Question"], task["Answer Key"], task["Student Answer"])
+
+def lookup_cached(cache, task, prompt_versions=(PROMPT_VERSION,)):
+    """Return a cached evaluation tuple for the task under any of the prompt versions, or None."""
+    for prompt_version in prompt_versions:
+        cached = cache.get(cache_key_for(cache, task, prompt_version))
+        if cached is not None:
+            return cached
+    return None
+
+def finish_evaluation(task, result, cache=None, journal=None, prompt_version=PROMPT_VERSION, auto_scored=False):
+    """
+    Turn an evaluation tuple into a full evaluation row, caching and journaling it.
+
+    Pass cache=None for results that came from the cache in the first place.
+    `auto_scored` marks rows settled by the deterministic pre-scoring stage.
+    """
+    score, feedback, strengths, improvements, model_thoughts = result
+    # Only cache evaluations whose score parsed cleanly so failures get retried next run
+    if cache is not None and isinstance(score, int):
+        cache.put(cache_key_for(cache, task, prompt_version), result)
+    
+    evaluation = dict(task)
+    evaluation.update({
+        "Score": score,
+        "Feedback": feedback,
+        "Strengths": strengths,
+        "Areas for Improvement": improvements,
+        "Model_Thoughts": model_thoughts,
+        "Auto_Scored": auto_scored
+    })
+    
+    if journal is not None:
+        journal.append(evaluation)
+    return evaluation
+
+def grade_task(llm, task, cache=None, journal=None):
+    """Grade a single task with its own prompt and return it as a full evaluation row."""
+    print(f"Evaluating {task['Student Name']} - Question {task['Question Number']}...")
+    result = evaluate_answer(llm, task["Question"], task["Answer Key"], task["Student Answer"])
+    return finish_evaluation(task, result, cache, journal)
+
+def grade_batch(llm, batch, cache=None, journal=None):
+    """
+    Grade tasks that share a question with one batched prompt.
+
+    Answers whose verdict is missing or unparseable are re-graded individually.
+    Returns the evaluation rows in batch order.
+    """
+    first = batch[0]
+    print(f"Evaluating {len(batch)} answers to Question {first['Question Number']} in one batch...")
+    results = evaluate_answers_batch(
+        llm, first["Question"], first["Answer Key"], [task["Student Answer"] for task in batch]
+    )
+    
+    evaluations = []
+    for task, result in zip(batch, results):
+        if result is None:
+            print(f"Batch verdict missing for {task['Student Name']} - Question {task['Question Number']}, grading individually")
+            evaluations.append(grade_task(llm, task, cache, journal))
+        else:
+            evaluations.append(finish_evaluation(task, result, cache, journal, BATCH_PROMPT_VERSION))
+    return evaluations
+
+def make_batches(tasks, indices, batch_size):
+    """Group the given task indices by question, in task order, into batches of at most `batch_size`."""
+    by_question = {}
+    for index in indices:
+        by_question.setdefault(tasks[index]["Question Number"], []).append(index)
+    
+    batches = []
+    for question_indices in by_question.values():
+        for start in range(0, len(question_indices), batch_size):
+            batches.append(question_indices[start:start + batch_size])
+    return batches
+
+def iter_evaluations(llm, tasks, workers=DEFAULT_WORKERS, cache=None, journal=None, resume=False, on_progress=None,
+                     batch_size=DEFAULT_BATCH_SIZE, use_prescore=True, similarity_floor=DEFAULT_SIMILARITY_FLOOR):
+    """
+    Grade tasks with up to `workers` LLM calls in flight at once.
+
+    Evaluations are yielded in task order: each one is released as soon as it and
+    every task before it have finished, regardless of completion order.
+    With `resume`, tasks already recorded in the journal are returned from it
+    instead of being graded again; otherwise the journal is started afresh.
+    With `use_prescore`, blank, key-identical and (below `similarity_floor`)
+    unrelated answers are scored deterministically and marked Auto_Scored.
+    Cached evaluations are returned without calling the LLM. With a `batch_size`
+    above 1, answers to the same question are graded together in one prompt.
+    `on_progress` is called in completion order with a progress event for every
+    evaluation (see make_progress_event); exceptions it raises are printed and
+    do not stop grading.
+    """
+    workers = max(1, int(workers))
+    batch_size = max(1, int(batch_size))
+    prompt_versions = (BATCH_PROMPT_VERSION, PROMPT_VERSION) if batch_size > 1 else (PROMPT_VERSION,)
+    completed = {}
+    if journal is not None:
+        if resume:
+            completed = journal.load()
+            print(f"Resuming run: {len(completed)} evaluations found in {journal.path}")
+        else:
+            journal.reset()
+    
+    total = len(tasks)
+    progress = {"completed": 0}
+    progress_lock = threading.Lock()
+    
+    def report(evaluation, latency, resumed=False):
+        if on_progress is None:
+            return
+        with progress_lock:
+            progress["completed"] += 1
+            event = make_progress_event(evaluation, progress["completed"], total, latency, resumed)
+            # A failing progress consumer must not abort grading
+            try:
+                on_progress(event)
+            except Exception as e:
+                print(f"Progress callback failed for {event['student']} - Question {event['questionNumber']}: {e}")
+    
+    def grade_and_report(task):
+        started = time.perf_counter()
+        evaluation = grade_task(llm, task, cache, journal)
+        report(evaluation, time.perf_counter() - started)
+        return evaluation
+    
+    def grade_batch_and_report(batch):
+        started = time.perf_counter()
+        evaluations = grade_batch(llm, batch, cache, journal)
+        latency = time.perf_counter() - started
+        for evaluation in evaluations:
+            report(evaluation, latency)
+        return evaluations
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # One slot per task: a finished evaluation, or (future, position in its batch)
+        slots = [None] * total
+        # Indices of tasks that still need the LLM
+        to_grade = []
+        for index, task in enumerate(tasks):
+            journaled = journal.find(completed, task) if completed else None
+            if journaled is not None:
+                report(journaled, 0.0, resumed=True)
+                slots[index] = journaled
+                continue
             
-            html_content += f"""
-            <div class="evaluation-card">
-                <div class="student-info">
-                    <div class="student-name">{row["Student Name"]}</div>
-                    <div class="score {score_class}">Score: {row["Score"]}</div>
-                </div>
-                
-                <div class="question">{row["Question"]}</div>
-                
-                <div class="section">
-                    <div class="section-title">Student Answer:</div>
-                    <p>{row["Student Answer"]}</p>
-                </div>
-                
-                <div class="section">
-                    <div class="section-title">Feedback:</div>
-                    <p>{row["Feedback"]}</p>
-                </div>
-                
-                <div class="section strengths">
-                    <div class="section-title">Strengths:</div>
-                    <p>{row["Strengths"]}</p>
-                </div>
-                
-                <div class="section improvements">
-                    <div class="section-title">Areas for Improvement:</div>
-                    <p>{row["Areas for Improvement"]}</p>
-                </div>
-            </div>
-            """
+            prescored = prescore(task["Answer Key"], task["Student Answer"], similarity_floor) if use_prescore else None
+            if prescored is not None:
+                print(f"Auto-scored {task['Student Name']} - Question {task['Question Number']}")
+                evaluation = finish_evaluation(task, prescored, None, journal, auto_scored=True)
+                report(evaluation, 0.0)
+                slots[index] = evaluation
+                continue
+            
+            cached = lookup_cached(cache, task, prompt_versions) if cache is not None else None
+            if cached is not None:
+                print(f"Using cached evaluation for {task['Student Name']} - Question {task['Question Number']}")
+                evaluation = finish_evaluation(task, cached, None, journal)
+                report(evaluation, 0.0)
+                slots[index] = evaluation
+                continue
+            
+            to_grade.append(index)
+        
+        if batch_size > 1:
+            for batch in make_batches(tasks, to_grade, batch_size):
+                future = executor.submit(grade_batch_and_report, [tasks[index] for index in batch])
+                for position, index in enumerate(batch):
+                    slots[index] = (future, position)
+        else:
+            for index in to_grade:
+                slots[index] = (executor.submit(grade_and_report, tasks[index]), None)
+        
+        for slot in slots:
+            if isinstance(slot, dict):
+                yield slot
+            else:
+                future, position = slot
+                result = future.result()
+                yield result if position is None else result[position]
+
+def make_progress_event(evaluation, completed, total, latency, resumed=False):
+    """Describe one finished evaluation for progress reporting."""
+    return {
+        "completed": completed,
+        "total": total,
+        "student": evaluation["Student Name"],
+        "questionNumber": evaluation["Question Number"],
+        "latency": round(latency, 3),
+        "resumed": resumed,
+        "evaluation": {k: v for k, v in evaluation.items() if k != "Model_Thoughts"}
+    }
+
+def print_progress_event(event):
+    """Emit a progress event on stdout as a single `PROGRESS {json}` line."""
+    print(f"{PROGRESS_PREFIX}{json.dumps(event, ensure_ascii=False)}", flush=True)
 
-    html_content += """
-</body>
-</html>
-"""
+def run_evaluations(llm, tasks, workers=DEFAULT_WORKERS, cache=None, journal=None, resume=False, on_progress=None,
+                    batch_size=DEFAULT_BATCH_SIZE, use_prescore=True, similarity_floor=DEFAULT_SIMILARITY_FLOOR):
+    """Grade every task concurrently and return the evaluations in task order."""
+    return list(iter_evaluations(llm, tasks, workers, cache, journal, resume, on_progress,
+                                 batch_size, use_prescore, similarity_floor))
 
-    with open("evaluation_results.html", "w", encoding="utf-8") as html_file:
-        html_file.write(html_content)
+def parse_args(argv=None):
+    """Parse command line options for the auto checker."""
+    parser = argparse.ArgumentParser(description="Grade student answers with deepseek-r1.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Number of evaluations to run in parallel against Ollama.")
+    parser.add_argument("--cache", default=CACHE_FILE,
+                        help="SQLite file used to cache evaluations between runs.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-grade every answer without reading or writing the cache.")
+    parser.add_argument("--journal", default=JOURNAL_FILE,
+                        help="JSONL file recording each evaluation as soon as it completes.")
+    parser.add_argument("--store", default=RESULTS_DB,
+                        help="SQLite results store the finished run is saved to.")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Only write the HTML report and JSONL results.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip (student, question) pairs already completed in the journal.")
+    parser.add_argument("--progress", action="store_true",
+                        help="Print a PROGRESS JSON line on stdout as each evaluation completes.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Grade up to this many answers to the same question in one prompt (1 disables batching).")
+    parser.add_argument("--no-prescore", action="store_true",
+                        help="Send blank and key-identical answers to the LLM instead of scoring them directly.")
+    parser.add_argument("--hosts", type=lambda value: [host.strip() for host in value.split(",") if host.strip()],
+                        default=OLLAMA_HOSTS,
+                        help="Comma-separated Ollama base URLs to spread grading across.")
+    parser.add_argument("--host-concurrency", type=int, default=DEFAULT_HOST_CONCURRENCY,
+                        help="Requests each Ollama host serves at once when several hosts are given.")
+    parser.add_argument("--stream", action="store_true", default=STREAM_GRADING,
+                        help="Stream completions and stop each one as soon as its verdict is complete.")
+    parser.add_argument("--think-budget", type=int, default=DEFAULT_THINK_BUDGET,
+                        help="With --stream, tokens the model may think for before it must answer (0 disables).")
+    parser.add_argument("--similarity-floor", type=float, default=DEFAULT_SIMILARITY_FLOOR,
+                        help="Score answers 0 without the LLM when their word similarity to the key is below this (0 disables).")
+    return parser.parse_args(argv)
+
+def grade_class(llm, workers=DEFAULT_WORKERS, cache=None, journal=None, resume=False, on_progress=None,
+                batch_size=DEFAULT_BATCH_SIZE, use_prescore=True, similarity_floor=DEFAULT_SIMILARITY_FLOOR,
+                questions_file=QUESTIONS_FILE, answers_file=ANSWERS_FILE,
+                student_folder=STUDENT_ANSWERS_FOLDER, results_file=RESULTS_FILE, records_file=RECORDS_FILE,
+                results_store=None, evaluation_id=None, metadata=None):
+    """
+    Run a complete grading pass and write the HTML report and JSONL results.
+
+    This is the library entry point used by the CLI and by the Flask grading worker.
+    Both outputs are streamed in student/question order as evaluations complete, so
+    nothing proportional to the class size is kept in memory. When a `results_store`
+    is given the finished results are also saved to it under `evaluation_id`, with
+    `metadata` (subject, year, semester). Returns the number of evaluations written;
+    raises GradingError when the inputs cannot be loaded or the results not stored.
+    """
+    try:
+        questions = load_text_file(questions_file)
+        answers = load_text_file(answers_file)
+    except OSError as e:
+        raise GradingError(f"Could not read questions or answer keys: {str(e)}", "load") from e
+    
+    if len(questions) != len(answers):
+        raise GradingError("The number of questions and answers do not match!", "load")
+
+    try:
+        tasks = collect_tasks(questions, answers, student_folder)
+    except OSError as e:
+        raise GradingError(f"Could not read student answers: {str(e)}", "load") from e
+    if not tasks:
+        raise GradingError("No student answer files found in the folder.", "load")
+
+    print(f"Grading {len(tasks)} answers with {max(1, int(workers))} parallel workers...")
+    with HtmlReportWriter(results_file) as report, JsonlResultsWriter(records_file) as records:
+        for evaluation in iter_evaluations(llm, tasks, workers, cache, journal, resume, on_progress,
+                                           batch_size, use_prescore, similarity_floor):
+            report.write(evaluation)
+            records.write(evaluation)
+    
+    if results_store is not None:
+        evaluation_id = evaluation_id or f"eval-{int(time.time())}"
+        try:
+            results_store.save_evaluation(evaluation_id, iter_result_records(records_file), **(metadata or {}))
+        except sqlite3.Error as e:
+            raise GradingError(f"Could not save results to the results store: {str(e)}", "store") from e
+    
+    if journal is not None:
+        # The run finished cleanly, so there is nothing left to resume
+        journal.reset()
+    
+    return records.count
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    llm = create_grading_llm(args.hosts, args.host_concurrency, stream=args.stream, think_budget=args.think_budget)
+    cache = None if args.no_cache else EvaluationCache(args.cache)
+    journal = EvaluationJournal(args.journal)
+    on_progress = print_progress_event if args.progress else None
+    results_store = None if args.no_store else ResultsStore(args.store)
+    workers = grading_workers(llm, args.workers)
+    
+    try:
+        grade_class(llm, workers, cache, journal, args.resume, on_progress, args.batch_size,
+                    not args.no_prescore, args.similarity_floor, results_store=results_store)
+    except GradingError as e:
+        print(f"Error: {str(e)}")
+        return 1
 
-    print("Evaluation complete. Results saved to evaluation_results.html")
+    print(f"Evaluation complete. Results saved to {RESULTS_FILE}")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
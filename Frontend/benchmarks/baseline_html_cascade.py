@@ -0,0 +1,340 @@
+"""
+Previous selector-cascade parser for legacy HTML reports, kept as the benchmark baseline.
+
+This is the extraction logic app.generate_json_results used before
+legacy_report_parser replaced it, with only the file I/O removed.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+
+def cascade_parse(html_content):
+    """The selector-cascade extraction previously done by app.generate_json_results"""
+    try:
+        # Use BeautifulSoup to parse HTML
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # Extract metadata with better error handling
+        student_info = soup.select_one('.student-info')
+        student_name = "Unknown Student"
+        subject = "Unknown Subject"
+        year = "Unknown Year"
+        semester = "Unknown Semester"
+        
+        if student_info:
+            name_elem = student_info.select_one('.student-name')
+            subject_elem = student_info.select_one('.subject')
+            year_elem = student_info.select_one('.year')
+            semester_elem = student_info.select_one('.semester')
+            
+            student_name = name_elem.text.strip() if name_elem else student_name
+            subject = subject_elem.text.strip() if subject_elem else subject
+            year = year_elem.text.strip() if year_elem else year
+            semester = semester_elem.text.strip() if semester_elem else semester
+        else:
+            # Try alternative methods to find student info
+            title_elem = soup.select_one('h1') or soup.select_one('title')
+            if title_elem and ":" in title_elem.text:
+                student_name = title_elem.text.split(":")[1].strip()
+        
+        # Extract overall score with improved pattern matching
+        score_element = soup.select_one('.overall-score') or soup.select_one('.total-score') or soup.select_one('.score')
+        overall_score = 85  # Default value if extraction fails
+        max_score = 100
+        
+        if score_element:
+            try:
+                score_text = score_element.text.strip()
+                import re
+                
+                # Try different score patterns
+                # Look for "85/100" format first
+                score_match = re.search(r'(\d+)\s*\/\s*(\d+)', score_text)
+                if score_match:
+                    overall_score = int(score_match.group(1))
+                    max_score = int(score_match.group(2))
+                else:
+                    # Look for "Score: 85" or similar
+                    score_match = re.search(r'(?:score|points|marks):\s*(\d+)', score_text, re.IGNORECASE)
+                    if score_match:
+                        overall_score = int(score_match.group(1))
+                    else:
+                        # Try to find any number
+                        numbers = re.findall(r'\d+', score_text)
+                        if numbers:
+                            # If multiple numbers found, use the first for score, second for max
+                            overall_score = int(numbers[0])
+                            if len(numbers) > 1:
+                                max_score = int(numbers[1])
+            except (ValueError, IndexError) as e:
+                logger.warning(f"Error parsing overall score: {str(e)}")
+        
+        # Find all question sections with improved selector strategy
+        questions = []
+        
+        # Try different selectors for question sections, from most specific to most general
+        selectors = [
+            '.question-section', '.evaluation-card', '.question', 
+            '.answer-section', 'section', 'div[id^="question"]',
+            '.q-card', '.card'
+        ]
+        
+        question_sections = []
+        for selector in selectors:
+            question_sections = soup.select(selector)
+            if question_sections:
+                logger.info(f"Found {len(question_sections)} question sections using selector '{selector}'")
+                break
+        
+        # If no sections found with CSS selectors, try looking for patterns in the HTML
+        if not question_sections:
+            # Try to find sections with question numbers
+            import re
+            question_pattern = re.compile(r'Question\s+\d+|Q\d+:|Q\.\s*\d+', re.IGNORECASE)
+            potential_sections = []
+            
+            for div in soup.find_all(['div', 'section']):
+                text_content = div.get_text().strip()
+                if question_pattern.search(text_content):
+                    potential_sections.append(div)
+            
+            if potential_sections:
+                question_sections = potential_sections
+                logger.info(f"Found {len(question_sections)} question sections using text pattern matching")
+        
+        # Process each question section
+        for i, section in enumerate(question_sections):
+            try:
+                # Extract question text with improved selectors
+                question_text_elem = None
+                for selector in ['.question-text', '.q-text', 'h2', 'h3', 'h4', 'strong', 'b']:
+                    elems = section.select(selector)
+                    if elems:
+                        # Take the first element that likely contains the question
+                        for elem in elems:
+                            text = elem.text.strip()
+                            if 'question' in text.lower() or text.lower().startswith('q') or re.match(r'^\d+\.', text):
+                                question_text_elem = elem
+                                break
+                        if question_text_elem:
+                            break
+                
+                question_text = question_text_elem.text.strip() if question_text_elem else f"Question {i+1}"
+                
+                # Extract question number with improved patterns
+                question_number = i + 1
+                if question_text:
+                    import re
+                    patterns = [
+                        r'Question\s*(\d+)',
+                        r'Q\.?\s*(\d+)',
+                        r'#\s*(\d+)',
+                        r'^(\d+)[\.:]'
+                    ]
+                    for pattern in patterns:
+                        match = re.search(pattern, question_text, re.IGNORECASE)
+                        if match:
+                            try:
+                                question_number = int(match.group(1))
+                                break
+                            except (ValueError, IndexError):
+                                pass
+                
+                # Look for student answer with improved selectors and text analysis
+                student_answer = ""
+                answer_selectors = [
+                    '.student-answer', '.answer', '.response', '.answer-text',
+                    'p', 'div > p', '.content', '.answer-content'
+                ]
+                
+                for selector in answer_selectors:
+                    elems = section.select(selector)
+                    if elems:
+                        # Skip elements that are likely to be headers or metadata
+                        for elem in elems:
+                            elem_text = elem.text.strip()
+                            # Skip if element is too short or is likely a header
+                            if (len(elem_text) > 10 and 
+                                not elem_text.lower().startswith(('question', 'score', 'feedback'))):
+                                student_answer = elem_text
+                                break
+                        if student_answer:
+                            break
+                
+                # Extract score with improved pattern matching
+                q_score = 70  # Default if we can't find a score
+                q_max_score = 100  # Default max
+                
+                # Look for score text with multiple approaches
+                score_selectors = [
+                    '.score', '.question-score', '.marks', '.points', 
+                    '.grade', '.result', 'span', 'strong'
+                ]
+                
+                score_found = False
+                for selector in score_selectors:
+                    score_elements = section.select(selector)
+                    for elem in score_elements:
+                        score_text = elem.text.strip()
+                        
+                        # Skip elements that are clearly not scores
+                        if 'score' not in score_text.lower() and not re.search(r'\d+\s*\/\s*\d+', score_text):
+                            # Check if the element contains only numbers and symbols
+                            if not re.match(r'^[\d\s\/\.]+$', score_text):
+                                continue
+                        
+                        # Try specific patterns first
+                        score_match = re.search(r'(\d+)\s*\/\s*(\d+)', score_text)
+                        if score_match:
+                            q_score = int(score_match.group(1))
+                            q_max_score = int(score_match.group(2))
+                            score_found = True
+                            break
+                        
+                        # Try other patterns
+                        score_match = re.search(r'(?:score|marks|points|grade):\s*(\d+)', score_text, re.IGNORECASE)
+                        if score_match:
+                            q_score = int(score_match.group(1))
+                            score_found = True
+                            break
+                        
+                        # Just find any number as last resort
+                        numbers = re.findall(r'\d+', score_text)
+                        if numbers:
+                            q_score = int(numbers[0])
+                            if len(numbers) > 1:
+                                q_max_score = int(numbers[1])
+                            score_found = True
+                            break
+                    
+                    if score_found:
+                        break
+                
+                # Scale score if needed
+                if q_max_score != 100 and q_max_score > 0:
+                    q_score = int((q_score / q_max_score) * 100)
+                    q_max_score = 100
+                
+                # Extract feedback
+                feedback = ""
+                feedback_selectors = ['.feedback', '.comment', '.evaluation', '.remarks', '.assessment']
+                for selector in feedback_selectors:
+                    elems = section.select(selector)
+                    for elem in elems:
+                        text = elem.text.strip()
+                        if len(text) > 10 and 'feedback' in text.lower() or not feedback:
+                            feedback = text
+                            break
+                    if feedback:
+                        break
+                
+                # Get strengths with improved extraction
+                strengths = []
+                strength_keywords = ['strength', 'positive', 'pro', 'good', 'excellent']
+                for keyword in strength_keywords:
+                    # Try to find elements with the keyword in class or containing text
+                    elements = section.select(f'.{keyword}') or section.find_all(
+                        lambda tag: keyword in tag.get_text().lower() and tag.name in ['div', 'ul', 'p']
+                    )
+                    
+                    if elements:
+                        for elem in elements:
+                            # Try to get list items first
+                            items = elem.select('li')
+                            if items:
+                                for item in items:
+                                    item_text = item.text.strip()
+                                    if item_text and len(item_text) > 5:
+                                        strengths.append(item_text)
+                            # If no list items, use the text content
+                            elif elem.text and len(elem.text) > 10:
+                                strengths.append(elem.text.strip())
+                        # If we found strengths, stop looking
+                        if strengths:
+                            break
+                
+                # Get improvements with improved extraction
+                improvements = []
+                improvement_keywords = ['improve', 'improvement', 'negative', 'con', 'weakness', 'area']
+                for keyword in improvement_keywords:
+                    # Try to find elements with the keyword in class or containing text
+                    elements = section.select(f'.{keyword}') or section.find_all(
+                        lambda tag: keyword in tag.get_text().lower() and tag.name in ['div', 'ul', 'p']
+                    )
+                    
+                    if elements:
+                        for elem in elements:
+                            # Try to get list items first
+                            items = elem.select('li')
+                            if items:
+                                for item in items:
+                                    item_text = item.text.strip()
+                                    if item_text and len(item_text) > 5:
+                                        improvements.append(item_text)
+                            # If no list items, use the text content
+                            elif elem.text and len(elem.text) > 10:
+                                improvements.append(elem.text.strip())
+                        # If we found improvements, stop looking
+                        if improvements:
+                            break
+                
+                # Default values if extraction failed
+                if not strengths:
+                    strengths = ["Good understanding of the concept"]
+                if not improvements:
+                    improvements = ["Could provide more detailed examples"]
+                
+                # Create question data structure
+                question_data = {
+                    "id": i + 1,
+                    "questionNumber": question_number,
+                    "questionText": question_text,
+                    "studentAnswer": student_answer,
+                    "score": q_score,
+                    "maxScore": q_max_score,
+                    "feedback": feedback,
+                    "strengths": strengths,
+                    "improvements": improvements
+                }
+                questions.append(question_data)
+                
+            except Exception as e:
+                logger.error(f"Error processing question {i+1}: {str(e)}", exc_info=True)
+                # Add a placeholder question
+                questions.append({
+                    "id": i + 1,
+                    "questionNumber": i + 1,
+                    "questionText": f"Question {i+1}",
+                    "studentAnswer": "Unable to parse answer",
+                    "score": 70,  # Default score
+                    "maxScore": 100,
+                    "feedback": "Error extracting feedback",
+                    "strengths": ["Error extracting strengths"],
+                    "improvements": ["Error extracting improvements"]
+                })
+        
+        # Create JSON structure
+        evaluation_data = {
+            "id": f"eval-{int(time.time())}",
+            "studentName": student_name,
+            "subject": subject,
+            "year": year,
+            "semester": semester,
+            "submissionDate": datetime.now().isoformat(),
+            "overallScore": overall_score,
+            "maxScore": max_score,
+            "questions": questions
+        }
+        
+        logger.info(f"JSON results generated successfully from HTML with {len(questions)} questions")
+        return evaluation_data
+            
+    except Exception as e:
+        logger.error(f"Error generating JSON results: {str(e)}", exc_info=True)
+        return None
@@ -0,0 +1,287 @@
+"""
+Benchmark the grading pipeline and the results endpoints on synthetic classes.
+
+Grading runs auto_checker_v3.grade_class end to end against a local
+Ollama-compatible stub, so throughput reflects the pipeline's own concurrency,
+batching and output overhead at a chosen model latency. Run from the Frontend
+directory:
+
+    python benchmarks/bench_grading.py --students 40 --questions 5 --latency 0.2 --workers 1,4,8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auto_checker_v3 import create_grading_llm, grade_class  # noqa: E402
+from evaluation_journal import EvaluationJournal  # noqa: E402
+from legacy_report_parser import parse_report  # noqa: E402
+from ollama_stub import OllamaStub  # noqa: E402
+from report_renderer import HtmlReportWriter, JsonlResultsWriter  # noqa: E402
+from results_store import ResultsStore, iter_result_records  # noqa: E402
+from synthetic_class import synthetic_evaluation, write_synthetic_class  # noqa: E402
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def int_list(text):
+    return [int(value) for value in text.split(",") if value.strip()]
+
+
+def run_grading(class_files, hosts, workdir, workers, batch_size, use_prescore, host_concurrency,
+                stream=False, think_budget=0):
+    """
+    Grade the synthetic class once and return its throughput and latency figures.
+
+    Latency is the per-evaluation wall time reported in progress events; answers
+    settled without the LLM (pre-scored) are counted but excluded from it. With
+    `stream`, completions are streamed and stopped early as in --stream grading.
+    """
+    run_dir = tempfile.mkdtemp(dir=workdir)
+    latencies = []
+    llm_graded = []
+
+    def on_progress(event):
+        if not event["evaluation"].get("Auto_Scored"):
+            latencies.append(event["latency"])
+            llm_graded.append(1)
+
+    llm = create_grading_llm(hosts, host_concurrency, stream=stream, think_budget=think_budget)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        evaluations = grade_class(
+            llm, workers, cache=None,
+            journal=EvaluationJournal(os.path.join(run_dir, "journal.jsonl")),
+            on_progress=on_progress, batch_size=batch_size, use_prescore=use_prescore,
+            results_file=os.path.join(run_dir, "results.html"),
+            records_file=os.path.join(run_dir, "results.jsonl"),
+            results_store=ResultsStore(os.path.join(run_dir, "results.sqlite3")),
+            evaluation_id="bench", **class_files
+        )
+    makespan = time.perf_counter() - started
+    if hasattr(llm, "close"):
+        llm.close()
+    return {
+        "workers": workers,
+        "batchSize": batch_size,
+        "stream": stream,
+        "evaluations": evaluations,
+        "llmGraded": len(llm_graded),
+        "makespan": makespan,
+        "evalsPerSec": evaluations / makespan if makespan else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95)
+    }
+
+
+def measure(function):
+    """
+    Wall time and peak traced memory (bytes) of `function`.
+
+    It is called twice, untimed under tracemalloc and timed without it, because
+    tracing slows allocation-heavy code several times over; steps must be repeatable.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started, peak
+
+
+def write_outputs(workdir, evaluations, questions):
+    """
+    Produce every results artifact for `evaluations` synthetic rows, timing each step.
+
+    Returns (timings, evaluation_id); the files are left in `workdir` under the
+    names the Flask app reads by default.
+    """
+    rows = [synthetic_evaluation(index, questions) for index in range(evaluations)]
+    html_file = os.path.join(workdir, "evaluation_results.html")
+    records_file = os.path.join(workdir, "evaluation_results.jsonl")
+    store = ResultsStore(os.path.join(workdir, "evaluation_results.sqlite3"))
+    evaluation_id = "eval-bench"
+
+    def write_rows(writer_class, path):
+        with writer_class(path) as writer:
+            for row in rows:
+                writer.write(row)
+
+    def read_report():
+        with open(html_file, "r", encoding="utf-8") as f:
+            return parse_report(f.read())
+
+    steps = (
+        ("HTML report", lambda: write_rows(HtmlReportWriter, html_file)),
+        ("JSONL records", lambda: write_rows(JsonlResultsWriter, records_file)),
+        ("results store save", lambda: store.save_evaluation(evaluation_id, iter_result_records(records_file))),
+        ("students JSON (store)", lambda: json.dumps({"students": store.student_results(evaluation_id)})),
+        ("legacy JSON (HTML parse)", read_report),
+    )
+    timings = []
+    for name, step in steps:
+        elapsed, peak = measure(step)
+        timings.append({"step": name, "seconds": elapsed, "peakBytes": peak})
+    return timings, evaluation_id
+
+
+def time_endpoints(workdir, evaluation_id, repeat):
+    """
+    Time the results endpoints with the Flask test client against the files in `workdir`.
+
+    Each endpoint is timed with the encoded-body cache cleared before every request
+    (the cost of building the response) and with it warm, plus a 304 revalidation.
+    """
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import app as flask_app
+        import http_caching
+        logging.disable(logging.INFO)
+        client = flask_app.app.test_client()
+        endpoints = (
+            ("students (full)", "/api/students_results"),
+            ("students (page 50)", "/api/students_results?limit=50&sort=-score&fields=studentName,overallScore"),
+            ("one student", f"/api/results/{evaluation_id}"),
+            ("HTML report", "/results"),
+        )
+        headers = {"Accept-Encoding": "gzip"}
+        timings = []
+        for name, url in endpoints:
+            for mode in ("cold", "warm", "304"):
+                samples = []
+                size = 0
+                etag = client.get(url, headers=headers).headers.get("ETag")
+                for _ in range(repeat):
+                    request_headers = dict(headers)
+                    if mode == "cold":
+                        http_caching._body_cache.clear()
+                    elif mode == "304":
+                        request_headers["If-None-Match"] = etag
+                    started = time.perf_counter()
+                    response = client.get(url, headers=request_headers)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    size = len(response.get_data())
+                timings.append({
+                    "endpoint": name, "mode": mode, "status": response.status_code, "bytes": size,
+                    "meanMs": statistics.fmean(samples), "p50Ms": percentile(samples, 50),
+                    "p95Ms": percentile(samples, 95)
+                })
+        return timings
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(previous)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark grading throughput and the results endpoints.")
+    parser.add_argument("--students", type=int, default=40, help="Students in the synthetic class.")
+    parser.add_argument("--questions", type=int, default=5, help="Questions per student.")
+    parser.add_argument("--min-words", type=int, default=5, help="Shortest synthetic answer.")
+    parser.add_argument("--max-words", type=int, default=120, help="Longest synthetic answer.")
+    parser.add_argument("--exact-rate", type=float, default=0.0, help="Share of answers copied from the key.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub seconds per single-answer request.")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Stub latency jitter in seconds.")
+    parser.add_argument("--batch-latency", type=float, default=0.05, help="Stub seconds per extra batched answer.")
+    parser.add_argument("--parallel", type=int, default=8, help="Requests the stub processes at once.")
+    parser.add_argument("--stub-hosts", type=int, default=1,
+                        help="Stub servers to start; more than one grades through an OllamaHostPool.")
+    parser.add_argument("--workers", type=int_list, default=[1, 4, 8], help="Comma-separated worker counts.")
+    parser.add_argument("--batch-sizes", type=int_list, default=[1], help="Comma-separated batch sizes.")
+    parser.add_argument("--no-prescore", action="store_true", help="Send every answer to the model.")
+    parser.add_argument("--think-words", type=int, default=40, help="Words the stub thinks per response.")
+    parser.add_argument("--trailing-words", type=int, default=0, help="Words the stub adds after the verdict.")
+    parser.add_argument("--token-latency", type=float, default=0.0,
+                        help="Stub seconds per streamed word (0 streams in a few chunks).")
+    parser.add_argument("--stream", action="store_true", help="Also grade with streamed, early-stopped completions.")
+    parser.add_argument("--think-budget", type=int, default=0, help="Think budget of streamed grading (0 disables).")
+    parser.add_argument("--output-evaluations", type=int, default=5000,
+                        help="Evaluations in the report/JSON generation and endpoint benchmarks.")
+    parser.add_argument("--repeat", type=int, default=20, help="Requests per endpoint and mode.")
+    parser.add_argument("--skip-grading", action="store_true")
+    parser.add_argument("--skip-endpoints", action="store_true")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    summary = {"config": vars(args)}
+    with tempfile.TemporaryDirectory() as workdir:
+        if not args.skip_grading:
+            class_files = write_synthetic_class(
+                os.path.join(workdir, "class"), args.students, args.questions,
+                args.min_words, args.max_words, args.exact_rate
+            )
+            print(f"Grading {args.students} students x {args.questions} questions, "
+                  f"stub latency {args.latency}s +/- {args.jitter}s, "
+                  f"{args.stub_hosts} stub host(s) x parallel {args.parallel}")
+            print(f"{'mode':>7}{'workers':>8}{'batch':>7}{'evals':>7}{'llm':>6}{'makespan (s)':>14}"
+                  f"{'evals/s':>10}{'p50 (s)':>10}{'p95 (s)':>10}{'requests':>10}{'tokens':>9}")
+            summary["grading"] = []
+            with contextlib.ExitStack() as stack:
+                stubs = [
+                    stack.enter_context(OllamaStub(latency=args.latency, jitter=args.jitter,
+                                                   batch_latency=args.batch_latency, parallel=args.parallel,
+                                                   think_words=args.think_words, token_latency=args.token_latency,
+                                                   trailing_words=args.trailing_words, seed=index))
+                    for index in range(max(1, args.stub_hosts))
+                ]
+                hosts = [stub.base_url for stub in stubs]
+                runs = [(stream, batch_size, workers) for stream in ([False, True] if args.stream else [False])
+                        for batch_size in args.batch_sizes for workers in args.workers]
+                for stream, batch_size, workers in runs:
+                    before = [stub.stats() for stub in stubs]
+                    result = run_grading(class_files, hosts, workdir, workers, batch_size,
+                                         not args.no_prescore, args.parallel, stream, args.think_budget)
+                    after = [stub.stats() for stub in stubs]
+                    for key in ("requests", "cancelled", "tokens"):
+                        result[key] = sum(a[key] - b[key] for a, b in zip(after, before))
+                    summary["grading"].append(result)
+                    print(f"{'stream' if stream else 'block':>7}{workers:>8}{batch_size:>7}{result['evaluations']:>7}"
+                          f"{result['llmGraded']:>6}{result['makespan']:>14.2f}{result['evalsPerSec']:>10.2f}"
+                          f"{result['p50']:>10.3f}{result['p95']:>10.3f}{result['requests']:>10}{result['tokens']:>9}")
+
+        output_dir = os.path.join(workdir, "outputs")
+        os.makedirs(output_dir)
+        timings, evaluation_id = write_outputs(output_dir, args.output_evaluations, args.questions)
+        summary["outputs"] = timings
+        print(f"\nResults generation for {args.output_evaluations} evaluations")
+        print(f"{'step':<28}{'time (s)':>10}{'peak (MiB)':>12}")
+        for timing in timings:
+            print(f"{timing['step']:<28}{timing['seconds']:>10.3f}{timing['peakBytes'] / 2**20:>12.1f}")
+
+        if not args.skip_endpoints:
+            summary["endpoints"] = time_endpoints(output_dir, evaluation_id, args.repeat)
+            print(f"\nEndpoints ({args.repeat} requests each, gzip accepted)")
+            print(f"{'endpoint':<22}{'mode':>6}{'status':>8}{'KiB':>9}{'mean (ms)':>11}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+            for timing in summary["endpoints"]:
+                print(f"{timing['endpoint']:<22}{timing['mode']:>6}{timing['status']:>8}"
+                      f"{timing['bytes'] / 1024:>9.1f}{timing['meanMs']:>11.2f}"
+                      f"{timing['p50Ms']:>10.2f}{timing['p95Ms']:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Benchmark legacy HTML report parsing: single-pass extractor vs. the old selector cascade.
+
+Run from the Frontend directory:
+
+    python benchmarks/bench_legacy_report_parser.py --cards 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_report_parser  # noqa: E402
+from report_renderer import HtmlReportWriter  # noqa: E402
+from synthetic_class import synthetic_evaluation  # noqa: E402
+
+
+def build_report(path, cards):
+    """Write a report with `cards` evaluation cards using the grader's own renderer."""
+    with HtmlReportWriter(path) as report:
+        for index in range(cards):
+            report.write(synthetic_evaluation(index))
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def best_time(function, content, repeat):
+    """Best wall-clock time of `repeat` runs, and the last result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(content)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def parse_with_stdlib(content):
+    """Run the single-pass extractor on the standard library parser even if lxml is installed."""
+    etree = legacy_report_parser.etree
+    legacy_report_parser.etree = None
+    try:
+        return legacy_report_parser.parse_report(content)
+    finally:
+        legacy_report_parser.etree = etree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark legacy HTML report parsing.")
+    parser.add_argument("--cards", type=int, default=1000, help="Evaluation cards in the synthetic report.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation; the best is reported.")
+    parser.add_argument("--skip-baseline", action="store_true",
+                        help="Do not time the old selector cascade (it is slow on large reports).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        content = build_report(os.path.join(tmp, "report.html"), args.cards)
+    print(f"Report: {args.cards} cards, {len(content) / 1024:.0f} KiB")
+
+    timings = []
+    if legacy_report_parser.etree is not None:
+        elapsed, parsed = best_time(legacy_report_parser.parse_report, content, args.repeat)
+        timings.append(("single pass (lxml)", elapsed, len(parsed["cards"])))
+    elapsed, parsed = best_time(parse_with_stdlib, content, args.repeat)
+    timings.append(("single pass (html.parser)", elapsed, len(parsed["cards"])))
+
+    if not args.skip_baseline:
+        from baseline_html_cascade import cascade_parse
+        elapsed, parsed = best_time(cascade_parse, content, args.repeat)
+        timings.append(("selector cascade (bs4)", elapsed, len(parsed["questions"]) if parsed else 0))
+
+    baseline = timings[-1][1] if not args.skip_baseline else None
+    print(f"{'implementation':<28}{'best (s)':>10}{'cards':>8}{'speedup':>10}")
+    for name, elapsed, cards in timings:
+        speedup = f"{baseline / elapsed:.1f}x" if baseline else "-"
+        print(f"{name:<28}{elapsed:>10.3f}{cards:>8}{speedup:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
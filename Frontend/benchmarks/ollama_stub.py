@@ -0,0 +1,289 @@
+"""
+Local Ollama-compatible server with configurable latency, for grading benchmarks.
+
+It answers /api/generate in the format auto_checker_v3 expects (single and
+batched prompts, streamed NDJSON or one JSON object) with deterministic scores,
+plus /api/tags and /api/version for health checks. With a token latency it
+streams word by word and honours options.num_predict, like a real model. Run it standalone with:
+
+    python benchmarks/ollama_stub.py --port 11500 --latency 0.5 --parallel 4
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_ANSWER_PATTERN = re.compile(r"^\[Student (\d+)\] (.*)$", re.MULTILINE)
+STUDENT_ANSWER_PATTERN = re.compile(r"^Student Answer: (.*)$", re.MULTILINE)
+# Follow-up prompts of a think budget ask for the verdict without further reasoning
+FORCED_ANSWER_INSTRUCTION = "Do not think any further."
+STUB_VERSION = "0.0.0-stub"
+
+
+def stub_score(answer):
+    """Deterministic 0-100 score for an answer, so repeated runs grade identically."""
+    return int(hashlib.sha256(answer.encode("utf-8")).hexdigest()[:8], 16) % 101
+
+
+def verdict(answer):
+    """One verdict in the format parse_evaluation expects."""
+    return (
+        f"Score: {stub_score(answer)}\n"
+        "Feedback: The answer addresses the question but misses part of the expected reasoning.\n"
+        "Strengths:\n- Relevant terminology\n- Clear structure\n"
+        "Areas for Improvement:\n- Give a concrete example\n- Explain the underlying cause\n"
+    )
+
+
+def build_response(prompt, think_words, trailing_words=0):
+    """
+    Model output for a single or batched grading prompt, and the number of answers graded.
+
+    `trailing_words` of commentary follow the verdicts, as when a model keeps
+    generating after the last section.
+    """
+    if FORCED_ANSWER_INSTRUCTION in prompt:
+        think_words = 0
+    thinking = "<think>\n" + " ".join(["considering"] * think_words) + "\n</think>\n\n"
+    trailing = "\nNote: " + " ".join(["additionally"] * trailing_words) + "\n" if trailing_words else ""
+    batch = BATCH_ANSWER_PATTERN.findall(prompt)
+    if batch:
+        blocks = [f"=== Student {number} ===\n{verdict(answer)}" for number, answer in batch]
+        return thinking + "\n".join(blocks) + trailing, len(batch)
+    match = STUDENT_ANSWER_PATTERN.search(prompt)
+    return thinking + verdict(match.group(1) if match else prompt) + trailing, 1
+
+
+def tokens(text):
+    """Split text into word tokens that join back into it."""
+    return re.findall(r"\s*\S+|\s+$", text)
+
+
+class OllamaStub:
+    """
+    Threaded stub server; use as a context manager or call start() and stop().
+
+    Each generate request takes `latency` seconds (+/- `jitter`), plus
+    `batch_latency` for every extra answer in a batched prompt. At most `parallel`
+    requests are processed at once, like OLLAMA_NUM_PARALLEL; the rest wait in line
+    and the wait counts towards their latency. Streamed responses spread the time
+    over `chunks` pieces. A `token_latency` instead adds that many seconds per
+    word after the request latency and streams one word per chunk, so a client
+    that stops reading early saves the rest of the generation time.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.5, jitter=0.0, batch_latency=0.1,
+                 parallel=1, chunks=8, think_words=40, model="deepseek-r1", seed=0,
+                 token_latency=0.0, trailing_words=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.batch_latency = batch_latency
+        self.chunks = max(1, chunks)
+        self.think_words = think_words
+        self.token_latency = token_latency
+        self.trailing_words = trailing_words
+        self.tokens = 0
+        self.model = model
+        self.requests = 0
+        self.cancelled = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._slots = threading.BoundedSemaphore(max(1, parallel))
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ollama-stub", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self):
+        """Requests served, streams the client cancelled, peak concurrency and tokens sent."""
+        with self._lock:
+            return {"requests": self.requests, "cancelled": self.cancelled, "maxInFlight": self.max_in_flight,
+                    "tokens": self.tokens}
+
+    def _model_time(self, answers):
+        with self._lock:
+            offset = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + offset + self.batch_latency * (answers - 1))
+
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def _leave(self, cancelled=False):
+        with self._lock:
+            self._in_flight -= 1
+            if cancelled:
+                self.cancelled += 1
+
+    def _count_tokens(self, count):
+        with self._lock:
+            self.tokens += count
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, data, status=200):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json({"models": [{"name": f"{stub.model}:latest", "model": f"{stub.model}:latest"}]})
+                elif self.path == "/api/version":
+                    self._send_json({"version": STUB_VERSION})
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self._send_json({"error": "not found"}, 404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                text, answers = build_response(payload.get("prompt", ""), stub.think_words, stub.trailing_words)
+                model = payload.get("model", stub.model)
+                pieces = tokens(text)
+                num_predict = (payload.get("options") or {}).get("num_predict")
+                done_reason = "stop"
+                if num_predict and 0 < num_predict < len(pieces):
+                    pieces = pieces[:num_predict]
+                    done_reason = "length"
+
+                stub._enter()
+                cancelled = False
+                try:
+                    with stub._slots:
+                        model_time = stub._model_time(answers)
+                        if payload.get("stream", True) and stub.token_latency:
+                            cancelled = not self._stream_tokens(model, pieces, model_time, done_reason)
+                        elif payload.get("stream", True):
+                            cancelled = not self._stream(model, "".join(pieces), model_time)
+                        else:
+                            time.sleep(model_time + stub.token_latency * len(pieces))
+                            stub._count_tokens(len(pieces))
+                            self._send_json(self._chunk(model, "".join(pieces), done=True))
+                finally:
+                    stub._leave(cancelled)
+
+            def _chunk(self, model, text, done=False):
+                return {
+                    "model": model,
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "response": text,
+                    "done": done
+                }
+
+            def _stream(self, model, text, model_time):
+                # No Content-Length: the body ends when the connection closes, as with HTTP/1.0
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                step = -(-len(text) // stub.chunks)
+                try:
+                    for start in range(0, len(text), step):
+                        time.sleep(model_time / stub.chunks)
+                        line = json.dumps(self._chunk(model, text[start:start + step])) + "\n"
+                        self.wfile.write(line.encode("utf-8"))
+                        self.wfile.flush()
+                    final = self._chunk(model, "", done=True)
+                    final.update({"done_reason": "stop", "total_duration": int(model_time * 1e9)})
+                    self.wfile.write((json.dumps(final) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return False
+                stub._count_tokens(len(tokens(text)))
+                return True
+
+            def _stream_tokens(self, model, pieces, model_time, done_reason):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                sent = 0
+                try:
+                    time.sleep(model_time)
+                    for piece in pieces:
+                        time.sleep(stub.token_latency)
+                        self.wfile.write((json.dumps(self._chunk(model, piece)) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                        sent += 1
+                    final = self._chunk(model, "", done=True)
+                    final.update({"done_reason": done_reason, "eval_count": sent,
+                                  "total_duration": int((model_time + stub.token_latency * sent) * 1e9)})
+                    self.wfile.write((json.dumps(final) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return False
+                finally:
+                    stub._count_tokens(sent)
+                return True
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an Ollama-compatible stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per single-answer request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- jitter in seconds.")
+    parser.add_argument("--batch-latency", type=float, default=0.1, help="Extra seconds per additional batched answer.")
+    parser.add_argument("--parallel", type=int, default=1, help="Requests processed at once (OLLAMA_NUM_PARALLEL).")
+    parser.add_argument("--think-words", type=int, default=40, help="Words of <think> text per response.")
+    parser.add_argument("--token-latency", type=float, default=0.0,
+                        help="Seconds per streamed word; 0 streams the response in a few chunks.")
+    parser.add_argument("--trailing-words", type=int, default=0, help="Words of commentary after the verdict.")
+    args = parser.parse_args(argv)
+
+    stub = OllamaStub(args.host, args.port, args.latency, args.jitter, args.batch_latency,
+                      args.parallel, think_words=args.think_words, token_latency=args.token_latency,
+                      trailing_words=args.trailing_words)
+    print(f"Ollama stub listening on {stub.base_url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
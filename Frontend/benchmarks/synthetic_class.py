@@ -0,0 +1,78 @@
+"""Synthetic classes and evaluation rows for the benchmarks."""
+
+import os
+import random
+
+VOCABULARY = (
+    "energy system process cell model theory force data network value change result effect cause "
+    "structure function growth pressure light heat water carbon oxygen plant market price demand "
+    "supply policy risk bias privacy signal layer protocol memory speed balance reaction element "
+    "because therefore however which while during between important example increases reduces "
+    "explains describes depends produces requires allows leads shows the a of and to in is that"
+).split()
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def write_synthetic_class(directory, students, questions, min_words=5, max_words=120,
+                          exact_rate=0.0, seed=0):
+    """
+    Write questions.txt, answers.txt and student_answers/ for students x questions.
+
+    Answer lengths vary between `min_words` and `max_words`, skewed towards short
+    answers as in real exams; `exact_rate` is the share of answers copied from the
+    key, which the grader scores without the LLM. Returns the grade_class keyword
+    arguments pointing at the generated files.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    student_folder = os.path.join(directory, "student_answers")
+    os.makedirs(student_folder, exist_ok=True)
+
+    question_lines = [f"Question {q}: {_sentence(rng, 12)}" for q in range(1, questions + 1)]
+    key_lines = [_sentence(rng, rng.randint(20, 60)) for _ in range(questions)]
+
+    questions_file = os.path.join(directory, "questions.txt")
+    answers_file = os.path.join(directory, "answers.txt")
+    with open(questions_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(question_lines) + "\n")
+    with open(answers_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(key_lines) + "\n")
+
+    for student in range(students):
+        lines = []
+        for q in range(questions):
+            if rng.random() < exact_rate:
+                lines.append(key_lines[q])
+            else:
+                words = int(rng.triangular(min_words, max_words, min_words))
+                lines.append(_sentence(rng, max(1, words)))
+        with open(os.path.join(student_folder, f"Student_{student:04d}.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    return {
+        "questions_file": questions_file,
+        "answers_file": answers_file,
+        "student_folder": student_folder
+    }
+
+
+def synthetic_evaluation(index, questions_per_student=5):
+    """One finished evaluation row shaped like the grader's output."""
+    student = index // questions_per_student
+    question = index % questions_per_student + 1
+    return {
+        "Student Name": f"Student {student:04d}",
+        "Question Number": question,
+        "Question": f"Question {question}: explain concept number {question} in detail.",
+        "Answer Key": "The expected answer names the concept, explains it and gives an example.",
+        "Student Answer": " ".join(["The answer covers the main idea with an example."] * (1 + index % 6)),
+        "Score": (index * 37) % 101,
+        "Feedback": "The answer is mostly correct but misses one key point.",
+        "Strengths": "- Clear structure\n- Uses correct terminology",
+        "Areas for Improvement": "- Add a concrete example\n- Mention the edge cases",
+        "Model_Thoughts": "",
+        "Auto_Scored": False
+    }
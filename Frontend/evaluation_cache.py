@@ -0,0 +1,73 @@
+"""Persistent SQLite cache of parsed answer evaluations."""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+
+class EvaluationCache:
+    """
+    Content-addressed store of evaluate_answer results.
+
+    Entries are keyed on a hash of everything that influences the grade (model name,
+    prompt version, question, answer key and student answer), so editing any of them
+    simply misses the cache instead of returning a stale evaluation.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self):
+        # A short-lived connection per call keeps the cache safe to use from grading threads
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        """Create the cache table if it does not exist yet."""
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS evaluations (
+            cache_key TEXT PRIMARY KEY,
+            score INTEGER,
+            feedback TEXT,
+            strengths TEXT,
+            improvements TEXT,
+            model_thoughts TEXT,
+            created_at REAL
+        )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(model_name, prompt_version, question, answer_key, student_answer):
+        """Return the cache key for one graded answer."""
+        payload = json.dumps(
+            [model_name, prompt_version, question, answer_key, student_answer],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key):
+        """Return the cached (score, feedback, strengths, improvements, model_thoughts) tuple or None."""
+        conn = self._connect()
+        row = conn.execute('''
+        SELECT score, feedback, strengths, improvements, model_thoughts
+        FROM evaluations
+        WHERE cache_key = ?
+        ''', (cache_key,)).fetchone()
+        conn.close()
+        return tuple(row) if row else None
+
+    def put(self, cache_key, evaluation):
+        """Store a parsed evaluation tuple under the given key."""
+        score, feedback, strengths, improvements, model_thoughts = evaluation
+        conn = self._connect()
+        conn.execute('''
+        INSERT OR REPLACE INTO evaluations
+        (cache_key, score, feedback, strengths, improvements, model_thoughts, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (cache_key, score, feedback, strengths, improvements, model_thoughts, time.time()))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,67 @@
+"""Append-only JSONL journal of completed evaluations for resumable grading runs."""
+
+import json
+import os
+import threading
+
+
+class EvaluationJournal:
+    """
+    Records every evaluation as soon as it finishes.
+
+    Each line is one complete evaluation row, flushed and fsynced before the next
+    one is written, so a crashed run loses at most the evaluation in progress.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def task_key(task):
+        """Identify a (student, question) pair independently of its grade."""
+        return (task["Student Name"], task["Question Number"])
+
+    def load(self):
+        """Return the journaled evaluations keyed by (student, question number)."""
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    evaluation = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be truncated if the process died mid-write
+                    continue
+                completed[self.task_key(evaluation)] = evaluation
+        return completed
+
+    def find(self, completed, task):
+        """Return the journaled evaluation for a task if its inputs are unchanged."""
+        evaluation = completed.get(self.task_key(task))
+        if evaluation is None:
+            return None
+        for field in ("Question", "Answer Key", "Student Answer"):
+            if evaluation.get(field) != task[field]:
+                return None
+        return evaluation
+
+    def append(self, evaluation):
+        """Durably append one finished evaluation."""
+        line = json.dumps(evaluation, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def reset(self):
+        """Start a fresh journal, discarding any previous run."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,130 @@
+"""Long-lived in-process grading worker for the Flask app."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from auto_checker_v3 import (
+    CACHE_FILE,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_WORKERS,
+    JOURNAL_FILE,
+    GradingError,
+    create_grading_llm,
+    grade_class,
+    grading_workers,
+)
+from evaluation_cache import EvaluationCache
+from evaluation_journal import EvaluationJournal
+
+logger = logging.getLogger(__name__)
+
+
+class GradingWorker:
+    """
+    Runs grading jobs on a small pool of background threads.
+
+    The Ollama client and evaluation cache are created once and shared by every
+    job, so a run pays neither interpreter start-up nor client construction, and
+    Ollama keeps the model loaded between runs. Up to `max_jobs` jobs run at the
+    same time; further submissions wait in the queue.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, cache_file=CACHE_FILE, journal_file=JOURNAL_FILE,
+                 llm_factory=create_grading_llm, batch_size=DEFAULT_BATCH_SIZE, max_jobs=1):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_jobs = max(1, max_jobs)
+        self.journal_file = journal_file
+        self._llm_factory = llm_factory
+        self._llm = None
+        self._cache = EvaluationCache(cache_file) if cache_file else None
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @property
+    def llm(self):
+        """The shared LLM client, created on first use."""
+        with self._lock:
+            if self._llm is None:
+                self._llm = self._llm_factory()
+            return self._llm
+
+    def submit(self, on_progress=None, resume=True, on_start=None, **options):
+        """
+        Queue a grading run.
+
+        Returns a Future resolving to an outcome dict: {"status": "complete", ...}
+        on success or {"status": "error", "error": {...}} on failure. A
+        `journal_file` option gives the job its own journal; other options are
+        passed through to grade_class. `on_start` is called once the job leaves
+        the queue.
+        """
+        future = Future()
+        self._jobs.put((future, on_progress, resume, on_start, options))
+        self._ensure_started()
+        return future
+
+    def _ensure_started(self):
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.max_jobs:
+                thread = threading.Thread(
+                    target=self._run, name=f"grading-worker-{len(self._threads) + 1}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            future, on_progress, resume, on_start, options = self._jobs.get()
+            if future.set_running_or_notify_cancel():
+                if on_start:
+                    try:
+                        on_start()
+                    except Exception as e:
+                        logger.error(f"Job start callback failed: {str(e)}", exc_info=True)
+                future.set_result(self._grade(on_progress, resume, options))
+            self._jobs.task_done()
+
+    def _grade(self, on_progress, resume, options):
+        started = time.time()
+        options.setdefault("batch_size", self.batch_size)
+        journal = EvaluationJournal(options.pop("journal_file", self.journal_file))
+        try:
+            llm = self.llm
+        except Exception as e:
+            # A failing client factory fails the job, not the worker thread
+            logger.error(f"Could not create the grading client: {str(e)}", exc_info=True)
+            return {
+                "status": "error",
+                "error": {"type": type(e).__name__, "stage": "client", "message": str(e)}
+            }
+        try:
+            graded = grade_class(
+                llm,
+                workers=grading_workers(llm, self.workers),
+                cache=self._cache,
+                journal=journal,
+                resume=resume,
+                on_progress=on_progress,
+                **options
+            )
+        except GradingError as e:
+            logger.error(f"Grading run failed: {str(e)}")
+            return {"status": "error", "error": e.to_dict()}
+        except Exception as e:
+            logger.error(f"Unexpected error during grading: {str(e)}", exc_info=True)
+            return {
+                "status": "error",
+                "error": {"type": type(e).__name__, "stage": "grading", "message": str(e)}
+            }
+
+        return {
+            "status": "complete",
+            "evaluations": graded,
+            "duration": round(time.time() - started, 3)
+        }
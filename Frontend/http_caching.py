@@ -0,0 +1,152 @@
+"""Strong ETags, 304 responses and compression for the results endpoints."""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from flask import make_response, request, send_file
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+# Encoded bodies kept in memory, keyed by ETag, so repeated downloads skip re-encoding
+BODY_CACHE_ENTRIES = 16
+# Files larger than this are streamed from disk uncompressed instead of being read and cached
+MAX_BUFFERED_FILE_SIZE = 1024 * 1024
+
+_body_cache = OrderedDict()
+_body_cache_lock = threading.Lock()
+
+
+def file_version(path):
+    """Version of a file on disk: its path, modification time and size."""
+    stat = os.stat(path)
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def negotiate_encoding():
+    """Pick the best content coding the client accepts: br, gzip or identity."""
+    if brotli is not None and request.accept_encodings["br"]:
+        return "br"
+    if request.accept_encodings["gzip"]:
+        return "gzip"
+    return "identity"
+
+
+def make_etag(version, encoding):
+    """
+    Strong ETag for one representation of a resource version.
+
+    The request path and query string are part of it because parameters change the
+    body, and so is the content coding actually applied because each encoding is
+    different bytes.
+    """
+    digest = hashlib.sha256(f"{request.full_path}\n{version}".encode("utf-8")).hexdigest()[:32]
+    return digest if encoding == "identity" else f"{digest}-{encoding}"
+
+
+def _encode(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def _encoded_body(etag, build, encoding):
+    with _body_cache_lock:
+        if etag in _body_cache:
+            _body_cache.move_to_end(etag)
+            return _body_cache[etag]
+
+    body = build()
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if len(body) < MIN_COMPRESS_SIZE:
+        encoding = "identity"
+    entry = (_encode(body, encoding), encoding)
+
+    with _body_cache_lock:
+        _body_cache[etag] = entry
+        while len(_body_cache) > BODY_CACHE_ENTRIES:
+            _body_cache.popitem(last=False)
+    return entry
+
+
+def conditional_response(version, build, mimetype, headers=None):
+    """
+    Answer a GET for a resource identified by `version`.
+
+    A matching If-None-Match gets an empty 304 without calling `build`. Otherwise
+    `build()` produces the body (str or bytes), which is compressed when the client
+    accepts it and the body is large enough to benefit; the ETag names the encoding
+    actually sent.
+    """
+    encoding = negotiate_encoding()
+    # A body too small to compress was sent, and tagged, as identity
+    candidates = {make_etag(version, encoding), make_etag(version, "identity")}
+    matched = next((candidate for candidate in candidates if request.if_none_match.contains(candidate)), None)
+
+    if matched is not None:
+        response = make_response("", 304)
+        etag = matched
+    else:
+        body, applied_encoding = _encoded_body(make_etag(version, encoding), build, encoding)
+        etag = make_etag(version, applied_encoding)
+        response = make_response(body)
+        response.mimetype = mimetype
+        if applied_encoding != "identity":
+            response.headers["Content-Encoding"] = applied_encoding
+        for name, value in (headers or {}).items():
+            response.headers[name] = value
+
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate it before every use
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def conditional_json(version, build):
+    """conditional_response for a JSON body; `build` returns the data to serialize."""
+    return conditional_response(
+        version,
+        lambda: json.dumps(build(), ensure_ascii=False),
+        "application/json"
+    )
+
+
+def conditional_file(path, mimetype, download_name=None):
+    """
+    conditional_response for a file, optionally sent as an attachment.
+
+    Files above MAX_BUFFERED_FILE_SIZE are streamed from disk by send_file, which
+    answers If-None-Match and Range requests itself, so no large report is ever
+    held in memory.
+    """
+    version = file_version(path)
+    if os.path.getsize(path) > MAX_BUFFERED_FILE_SIZE:
+        response = send_file(
+            path, mimetype=mimetype, as_attachment=bool(download_name), download_name=download_name,
+            conditional=True, etag=make_etag(version, "identity"), max_age=None
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        response.vary.add("Accept-Encoding")
+        return response
+
+    headers = {}
+    if download_name:
+        headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+
+    def read_file():
+        with open(path, "rb") as f:
+            return f.read()
+
+    return conditional_response(version, read_file, mimetype, headers)
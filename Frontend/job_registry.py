@@ -0,0 +1,181 @@
+"""SQLite-backed registry of upload and evaluation jobs."""
+
+import json
+import sqlite3
+import time
+import uuid
+
+# Job lifecycle: uploaded -> queued -> running -> complete | error
+JOB_STATUSES = ("uploaded", "queued", "running", "complete", "error")
+ACTIVE_STATUSES = ("queued", "running")
+
+# Columns callers may set through create() and update()
+JOB_FIELDS = (
+    "status", "subject", "year", "semester", "upload_file", "results_dir",
+    "progress", "completed", "total", "message", "error",
+    "current_student", "current_question", "last_latency",
+    "created_at", "queued_at", "started_at", "finished_at"
+)
+
+
+class JobRegistry:
+    """
+    Persists one row per evaluation job so several jobs can be tracked at once.
+
+    Each job carries its own status, progress counters, timings and the directory
+    its results are written to, and survives server restarts.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        """Create the jobs table if it does not exist yet."""
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            subject TEXT,
+            year TEXT,
+            semester TEXT,
+            upload_file TEXT,
+            results_dir TEXT,
+            progress INTEGER DEFAULT 0,
+            completed INTEGER DEFAULT 0,
+            total INTEGER DEFAULT 0,
+            message TEXT DEFAULT '',
+            error TEXT,
+            current_student TEXT,
+            current_question INTEGER,
+            last_latency REAL,
+            created_at REAL,
+            queued_at REAL,
+            started_at REAL,
+            finished_at REAL
+        )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at)')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _row_to_job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["error"] = json.loads(job["error"]) if job["error"] else None
+        return job
+
+    @staticmethod
+    def _encode(fields):
+        unknown = set(fields) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        if "status" in fields and fields["status"] not in JOB_STATUSES:
+            raise ValueError(f"Unknown job status: {fields['status']}")
+        if fields.get("error") is not None:
+            fields["error"] = json.dumps(fields["error"], ensure_ascii=False)
+        return fields
+
+    def create(self, status="uploaded", **fields):
+        """Insert a new job and return its id."""
+        job_id = f"eval-{uuid.uuid4().hex[:12]}"
+        fields = self._encode(dict(fields, status=status))
+        fields.setdefault("created_at", time.time())
+
+        columns = ["id"] + list(fields)
+        placeholders = ", ".join("?" for _ in columns)
+        conn = self._connect()
+        conn.execute(
+            f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders})",
+            [job_id] + list(fields.values())
+        )
+        conn.commit()
+        conn.close()
+        return job_id
+
+    def update(self, job_id, **fields):
+        """Update selected fields of a job."""
+        if not fields:
+            return
+        fields = self._encode(fields)
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        conn = self._connect()
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", list(fields.values()) + [job_id])
+        conn.commit()
+        conn.close()
+
+    def get(self, job_id):
+        """Return a job as a dict, or None if it does not exist."""
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.close()
+        return self._row_to_job(row)
+
+    def list(self, status=None, limit=50):
+        """Return the most recent jobs, optionally only those with a given status."""
+        conn = self._connect()
+        if status:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+            ).fetchall()
+        else:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        conn.close()
+        return [self._row_to_job(row) for row in rows]
+
+    def latest(self, statuses=None):
+        """Return the most recently created job, optionally restricted to some statuses."""
+        conn = self._connect()
+        if statuses:
+            placeholders = ", ".join("?" for _ in statuses)
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at DESC LIMIT 1",
+                list(statuses)
+            ).fetchone()
+        else:
+            row = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT 1").fetchone()
+        conn.close()
+        return self._row_to_job(row)
+
+    def latest_with_results(self):
+        """Return the most recently finished job that completed successfully."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE status = 'complete' ORDER BY finished_at DESC LIMIT 1"
+        ).fetchone()
+        conn.close()
+        return self._row_to_job(row)
+
+    def count_active(self):
+        """Return how many jobs are queued or running."""
+        conn = self._connect()
+        count = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+        ).fetchone()[0]
+        conn.close()
+        return count
+
+    def fail_interrupted(self, message):
+        """Mark jobs left queued or running by a previous process as failed; returns their ids."""
+        conn = self._connect()
+        rows = conn.execute("SELECT id FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES).fetchall()
+        job_ids = [row["id"] for row in rows]
+        if job_ids:
+            error = json.dumps({"type": "Interrupted", "stage": "app", "message": message})
+            conn.execute(
+                "UPDATE jobs SET status = 'error', error = ?, message = ?, finished_at = ? "
+                "WHERE status IN (?, ?)",
+                (error, message, time.time()) + ACTIVE_STATUSES
+            )
+            conn.commit()
+        conn.close()
+        return job_ids
@@ -0,0 +1,290 @@
+"""Single-pass extraction of evaluation cards from legacy HTML reports."""
+
+import re
+from html.parser import HTMLParser
+
+from report_renderer import split_points
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; the standard library parser drives the same target
+    etree = None
+
+# Containers holding one evaluated answer
+CARD_CLASSES = frozenset(("evaluation-card", "question-section", "question-card", "q-card", "card"))
+
+# Class token -> card field whose text the element holds
+FIELD_CLASSES = {
+    "student-name": "student_name",
+    "score": "score",
+    "question-score": "score",
+    "marks": "score",
+    "points": "score",
+    "grade": "score",
+    "question": "question",
+    "question-text": "question",
+    "q-text": "question",
+    "student-answer": "answer",
+    "answer": "answer",
+    "answer-text": "answer",
+    "response": "answer",
+    "feedback": "feedback",
+    "comment": "feedback",
+    "remarks": "feedback",
+    "strengths": "strengths",
+    "strength": "strengths",
+    "positive": "strengths",
+    "improvements": "improvements",
+    "improvement": "improvements",
+    "improve": "improvements",
+    "weakness": "improvements",
+}
+
+# Class token -> report-level field found outside the cards
+DOCUMENT_CLASSES = {
+    "subject": "subject",
+    "year": "year",
+    "semester": "semester",
+    "overall-score": "overall_score",
+    "total-score": "overall_score",
+}
+
+HEADING_TAGS = frozenset(("h2", "h3", "h4"))
+VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"
+))
+# Text is never collected from these
+SKIPPED_TAGS = frozenset(("script", "style", "head", "title"))
+
+# A generic ".section" block is classified by its ".section-title" text
+SECTION_TITLE_PATTERNS = (
+    (re.compile(r"answer", re.IGNORECASE), "answer"),
+    (re.compile(r"feedback|comment", re.IGNORECASE), "feedback"),
+    (re.compile(r"strength", re.IGNORECASE), "strengths"),
+    (re.compile(r"improve|weakness|area", re.IGNORECASE), "improvements"),
+)
+SCORE_FRACTION_PATTERN = re.compile(r"(\d+)\s*/\s*(\d+)")
+SCORE_NUMBER_PATTERN = re.compile(r"\d+")
+QUESTION_NUMBER_PATTERN = re.compile(r"question\s*(\d+)|\bq\.?\s*(\d+)|#\s*(\d+)|^\s*(\d+)[.:]", re.IGNORECASE)
+
+
+def parse_score(text):
+    """Return (score, max_score) from text such as "Score: 85" or "17/20", or (None, 100)."""
+    match = SCORE_FRACTION_PATTERN.search(text or "")
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = SCORE_NUMBER_PATTERN.search(text or "")
+    if match:
+        return int(match.group(0)), 100
+    return None, 100
+
+
+def parse_question_number(text):
+    """Return the question number mentioned in a question heading, or None."""
+    match = QUESTION_NUMBER_PATTERN.search(text or "")
+    if not match:
+        return None
+    return int(next(group for group in match.groups() if group))
+
+
+class _Capture:
+    """Text collected for one field element while it is open."""
+
+    __slots__ = ("field", "owner", "text", "title", "items", "item", "in_title")
+
+    def __init__(self, field, owner):
+        self.field = field
+        self.owner = owner
+        self.text = []
+        self.title = []
+        self.items = []
+        self.item = None
+        self.in_title = False
+
+
+class _ReportTarget:
+    """
+    Parser target that builds cards from start/end/data events in one pass.
+
+    It never builds a document tree: each element is classified once from its tag
+    and class tokens, and text is routed to the innermost open field.
+    """
+
+    def __init__(self):
+        self.cards = []
+        self.document = {}
+        self._stack = []
+        self._captures = []
+        self._card = None
+        self._skip_depth = 0
+
+    def start(self, tag, attrib):
+        tag = tag.lower()
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.data("\n")
+            return
+
+        roles = []
+        classes = (attrib.get("class") or "").split()
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+            roles.append("skip")
+        elif self._card is None:
+            if (tag == "section" or CARD_CLASSES.intersection(classes)
+                    or (tag == "div" and (attrib.get("id") or "").startswith("question"))):
+                self._card = {}
+                roles.append("card")
+            else:
+                field = next((DOCUMENT_CLASSES[c] for c in classes if c in DOCUMENT_CLASSES), None)
+                if field:
+                    self._captures.append(_Capture(field, self.document))
+                    roles.append("capture")
+
+        if self._card is not None and "card" not in roles and "skip" not in roles:
+            field = next((FIELD_CLASSES[c] for c in classes if c in FIELD_CLASSES), None)
+            if field is None and "section" in classes:
+                field = "section"
+            if field is None and tag in HEADING_TAGS and "question" not in self._card:
+                field = "question"
+            capture = self._captures[-1] if self._captures else None
+
+            if field:
+                self._captures.append(_Capture(field, self._card))
+                roles.append("capture")
+            elif capture and "section-title" in classes:
+                capture.in_title = True
+                roles.append("title")
+            elif capture and tag == "li":
+                capture.item = []
+                roles.append("item")
+
+        self._stack.append((tag, roles))
+
+    def end(self, tag):
+        tag = tag.lower()
+        if tag in VOID_TAGS or not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        # Close elements the markup left open, as browsers do
+        while self._stack:
+            open_tag, roles = self._stack.pop()
+            for role in reversed(roles):
+                self._close(role)
+            if open_tag == tag:
+                break
+
+    def data(self, text):
+        if self._skip_depth or not self._captures:
+            return
+        capture = self._captures[-1]
+        if capture.in_title:
+            capture.title.append(text)
+        elif capture.item is not None:
+            capture.item.append(text)
+        else:
+            capture.text.append(text)
+
+    def _close(self, role):
+        if role == "skip":
+            self._skip_depth -= 1
+        elif role == "title":
+            self._captures[-1].in_title = False
+        elif role == "item":
+            capture = self._captures[-1]
+            item = "".join(capture.item).strip()
+            if item:
+                capture.items.append(item)
+            capture.item = None
+        elif role == "capture":
+            self._store(self._captures.pop())
+        elif role == "card":
+            self.cards.append(self._card)
+            self._card = None
+
+    @staticmethod
+    def _store(capture):
+        field = capture.field
+        if field == "section":
+            title = "".join(capture.title)
+            field = next((name for pattern, name in SECTION_TITLE_PATTERNS if pattern.search(title)), None)
+            if field is None:
+                return
+        # The first element found for a field wins, as with the old selector order
+        if field in capture.owner:
+            return
+
+        text = "".join(capture.text).strip()
+        if field in ("strengths", "improvements"):
+            capture.owner[field] = capture.items or split_points(text)
+        else:
+            capture.owner[field] = text
+
+    def close(self):
+        # Unclosed elements at the end of a truncated report still count
+        while self._stack:
+            _, roles = self._stack.pop()
+            for role in reversed(roles):
+                self._close(role)
+        return {"document": self.document, "cards": self.cards}
+
+
+class _StdlibDriver(HTMLParser):
+    """Feeds standard library html.parser events into a parser target."""
+
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {name: value or "" for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+def _finish_card(card, index):
+    score, max_score = parse_score(card.get("score"))
+    question_text = card.get("question") or f"Question {index + 1}"
+    return {
+        "studentName": card.get("student_name") or None,
+        "questionNumber": parse_question_number(question_text) or index + 1,
+        "questionText": question_text,
+        "studentAnswer": card.get("answer", ""),
+        "score": score,
+        "maxScore": max_score,
+        "feedback": card.get("feedback", ""),
+        "strengths": card.get("strengths", []),
+        "improvements": card.get("improvements", [])
+    }
+
+
+def parse_report(content):
+    """
+    Extract every evaluation card from the HTML of a report in a single pass.
+
+    Returns {"document": {...}, "cards": [...]}. The document part holds the
+    subject, year, semester and overall score text found outside the cards; each
+    card has studentName, questionNumber, questionText, studentAnswer, score
+    (None when missing), maxScore, feedback, strengths and improvements. Uses lxml
+    when it is installed and the standard library parser otherwise.
+    """
+    target = _ReportTarget()
+    if etree is not None:
+        parser = etree.HTMLParser(target=target, recover=True)
+        parser.feed(content)
+        parsed = parser.close()
+    else:
+        driver = _StdlibDriver(target)
+        driver.feed(content)
+        driver.close()
+        parsed = target.close()
+
+    parsed["cards"] = [_finish_card(card, index) for index, card in enumerate(parsed["cards"])]
+    return parsed
@@ -0,0 +1,222 @@
+"""Spreads LLM requests over several Ollama hosts with health checks and failover."""
+
+import logging
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background health checks of every host, and the timeout of each check
+HEALTH_CHECK_INTERVAL = 15
+HEALTH_CHECK_TIMEOUT = 3
+# Errors from a client call that mean the host, not the prompt, is at fault
+HOST_ERRORS = (requests.RequestException, ValueError)
+# Weight of the latest request in each host's moving average latency
+LATENCY_SMOOTHING = 0.2
+
+
+class NoHealthyHostError(RuntimeError):
+    """Every Ollama host in the pool is down or has already failed the request."""
+
+
+class _Host:
+    """One Ollama server, its client and its load and health counters."""
+
+    def __init__(self, base_url, client, limit):
+        self.base_url = base_url
+        self.client = client
+        self.limit = limit
+        self.in_flight = 0
+        self.healthy = True
+        self.requests = 0
+        self.failures = 0
+        self.latency = 0.0
+        self.last_error = None
+        self.checked_at = None
+
+
+class OllamaHostPool:
+    """
+    A drop-in replacement for a single Ollama client that uses several hosts.
+
+    Calling the pool (or its invoke/stream methods) sends the prompt to the
+    healthy host with the lowest load relative to its `max_concurrency`, ties
+    broken by recent latency. When every healthy host is full the call waits for
+    a free slot. A host that fails a request is marked down and the request is
+    retried on another one; a background thread checks every host's /api/tags
+    every `health_interval` seconds and brings recovered hosts back. Streams fail
+    over only before their first chunk, since output cannot be replayed.
+    """
+
+    def __init__(self, hosts, llm_factory, max_concurrency=4, model=None,
+                 health_interval=HEALTH_CHECK_INTERVAL, health_timeout=HEALTH_CHECK_TIMEOUT):
+        if not hosts:
+            raise ValueError("OllamaHostPool needs at least one host")
+        limit = max(1, int(max_concurrency))
+        self._hosts = [_Host(base_url.rstrip("/"), llm_factory(base_url.rstrip("/")), limit) for base_url in hosts]
+        self.model = model
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._condition = threading.Condition()
+        self._monitor = None
+        self._closed = threading.Event()
+
+    @property
+    def capacity(self):
+        """Requests the pool serves at once when every host is healthy."""
+        return sum(host.limit for host in self._hosts)
+
+    def __call__(self, prompt, **kwargs):
+        return self.invoke(prompt, **kwargs)
+
+    def invoke(self, prompt, **kwargs):
+        """Complete `prompt` on the least-loaded healthy host, failing over on host errors."""
+        tried = set()
+        while True:
+            host = self._acquire(tried)
+            started = time.perf_counter()
+            try:
+                result = host.client.invoke(prompt, **kwargs)
+            except HOST_ERRORS as e:
+                self._release(host, error=e)
+                tried.add(host)
+                continue
+            except BaseException:
+                self._release(host)
+                raise
+            self._release(host, elapsed=time.perf_counter() - started)
+            return result
+
+    def stream(self, prompt, **kwargs):
+        """Yield the completion of `prompt` chunk by chunk from the least-loaded healthy host."""
+        tried = set()
+        while True:
+            host = self._acquire(tried)
+            started = time.perf_counter()
+            chunks = 0
+            try:
+                for chunk in host.client.stream(prompt, **kwargs):
+                    chunks += 1
+                    yield chunk
+            except HOST_ERRORS as e:
+                self._release(host, error=e)
+                if chunks:
+                    raise
+                tried.add(host)
+                continue
+            except BaseException:
+                # Includes GeneratorExit when the caller stops reading early
+                self._release(host)
+                raise
+            self._release(host, elapsed=time.perf_counter() - started)
+            return
+
+    def _acquire(self, tried):
+        """Reserve a slot on the best available host not in `tried`, waiting while all are busy."""
+        self._ensure_monitor()
+        probed = False
+        with self._condition:
+            while True:
+                candidates = [host for host in self._hosts if host.healthy and host not in tried]
+                free = [host for host in candidates if host.in_flight < host.limit]
+                if free:
+                    host = min(free, key=lambda h: (h.in_flight / h.limit, h.latency))
+                    host.in_flight += 1
+                    return host
+                if candidates:
+                    self._condition.wait()
+                    continue
+                if probed or all(host in tried for host in self._hosts):
+                    errors = "; ".join(f"{h.base_url}: {h.last_error}" for h in self._hosts if h.last_error)
+                    raise NoHealthyHostError(f"No Ollama host is available ({errors or 'all hosts are down'})")
+                # Every remaining host is marked down: probe them now rather than wait for the monitor
+                self._condition.release()
+                try:
+                    self.check_health()
+                finally:
+                    self._condition.acquire()
+                probed = True
+
+    def _release(self, host, elapsed=None, error=None):
+        with self._condition:
+            host.in_flight -= 1
+            host.requests += 1
+            if error is not None:
+                host.failures += 1
+                host.last_error = str(error)
+                if host.healthy:
+                    logger.warning(f"Ollama host {host.base_url} failed, routing around it: {str(error)}")
+                host.healthy = False
+            elif elapsed is not None:
+                host.latency = (elapsed if host.latency == 0.0
+                                else (1 - LATENCY_SMOOTHING) * host.latency + LATENCY_SMOOTHING * elapsed)
+            self._condition.notify_all()
+
+    def _probe(self, host):
+        """Whether a host answers /api/tags and, if a model is set, has it."""
+        try:
+            response = requests.get(f"{host.base_url}/api/tags", timeout=self.health_timeout)
+            response.raise_for_status()
+            if self.model:
+                names = [model.get("name", "") for model in response.json().get("models", [])]
+                if not any(name == self.model or name.startswith(f"{self.model}:") for name in names):
+                    return False, f"model {self.model} is not available"
+            return True, None
+        except (requests.RequestException, ValueError) as e:
+            return False, str(e)
+
+    def check_health(self):
+        """Probe every host now and update its health; returns the number of healthy hosts."""
+        results = [(host, self._probe(host)) for host in self._hosts]
+        with self._condition:
+            for host, (healthy, error) in results:
+                if healthy and not host.healthy:
+                    logger.info(f"Ollama host {host.base_url} is back")
+                elif not healthy and host.healthy:
+                    logger.warning(f"Ollama host {host.base_url} failed its health check: {error}")
+                host.healthy = healthy
+                host.checked_at = time.time()
+                if error:
+                    host.last_error = error
+            self._condition.notify_all()
+            return sum(1 for host in self._hosts if host.healthy)
+
+    def close(self):
+        """Stop the background health checks."""
+        self._closed.set()
+
+    def _ensure_monitor(self):
+        with self._condition:
+            if self._closed.is_set():
+                return
+            if self._monitor is None or not self._monitor.is_alive():
+                self._monitor = threading.Thread(target=self._monitor_health, name="ollama-health", daemon=True)
+                self._monitor.start()
+
+    def _monitor_health(self):
+        while not self._closed.is_set():
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.error(f"Ollama health check failed: {str(e)}", exc_info=True)
+            self._closed.wait(self.health_interval)
+
+    def stats(self):
+        """Load and health of every host, for status endpoints."""
+        with self._condition:
+            return [
+                {
+                    "baseUrl": host.base_url,
+                    "healthy": host.healthy,
+                    "inFlight": host.in_flight,
+                    "limit": host.limit,
+                    "requests": host.requests,
+                    "failures": host.failures,
+                    "latency": round(host.latency, 3),
+                    "lastError": host.last_error,
+                    "checkedAt": host.checked_at
+                }
+                for host in self._hosts
+            ]
@@ -0,0 +1,75 @@
+"""Deterministic scoring of trivial answers so they never reach the LLM."""
+
+import math
+import re
+from collections import Counter
+
+# Placeholder collect_tasks uses for missing answers
+NO_ANSWER_PLACEHOLDER = "No answer provided."
+
+# Unicode words, so answers in any script are compared by their words
+_WORD_PATTERN = re.compile(r"\w+")
+# Punctuation that may end an answer without changing its meaning
+_TRAILING_PUNCTUATION = ".,;:!?"
+
+
+def normalize_text(text):
+    """Lowercase the text, collapse its whitespace and drop trailing punctuation; signs and symbols are kept."""
+    return " ".join((text or "").lower().split()).rstrip(_TRAILING_PUNCTUATION).rstrip()
+
+
+def lexical_similarity(text_a, text_b):
+    """Cosine similarity between the word counts of two texts, from 0.0 to 1.0."""
+    counts_a = Counter(_WORD_PATTERN.findall((text_a or "").lower()))
+    counts_b = Counter(_WORD_PATTERN.findall((text_b or "").lower()))
+    if not counts_a or not counts_b:
+        return 0.0
+
+    dot = sum(count * counts_b[word] for word, count in counts_a.items())
+    norm_a = math.sqrt(sum(count * count for count in counts_a.values()))
+    norm_b = math.sqrt(sum(count * count for count in counts_b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def prescore(answer_key, student_answer, similarity_floor=0.0):
+    """
+    Settle answers that do not need the model.
+
+    Blank answers score 0, answers that match the key once case, spacing and
+    trailing punctuation are ignored score 100, and, when `similarity_floor` is
+    above zero, answers whose lexical similarity to the key is below it score 0.
+    Everything else, including answers made only of symbols, goes to the LLM.
+    Returns an evaluation tuple (score, feedback, strengths, improvements,
+    model_thoughts) or None when the answer must be graded by the LLM.
+    """
+    answer = (student_answer or "").strip()
+    if not answer or answer == NO_ANSWER_PLACEHOLDER:
+        return (
+            0,
+            "No answer was provided for this question.",
+            "",
+            "- Provide an answer to the question.",
+            ""
+        )
+
+    if normalize_text(answer) == normalize_text(answer_key):
+        return (
+            100,
+            "The answer matches the answer key.",
+            "- Matches the expected answer exactly.",
+            "",
+            ""
+        )
+
+    if similarity_floor > 0:
+        similarity = lexical_similarity(answer, answer_key)
+        if similarity < similarity_floor:
+            return (
+                0,
+                f"The answer is unrelated to the expected answer (similarity {similarity:.2f}).",
+                "",
+                "- Address the question that was asked.",
+                ""
+            )
+
+    return None
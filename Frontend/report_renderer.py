@@ -0,0 +1,235 @@
+"""Streaming writers for the grading results: the HTML report and the JSONL records."""
+
+import html
+import json
+import os
+from string import Template
+
+REPORT_HEADER = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Evaluation Results</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .evaluation-card {
+            background-color: #fff;
+            border-radius: 8px;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+            margin-bottom: 24px;
+            padding: 20px;
+            border-left: 5px solid #4285f4;
+        }
+        .student-info {
+            display: flex;
+            justify-content: space-between;
+            border-bottom: 1px solid #eee;
+            padding-bottom: 10px;
+            margin-bottom: 15px;
+        }
+        .student-name {
+            font-size: 1.4rem;
+            font-weight: bold;
+            color: #4285f4;
+        }
+        .score {
+            font-size: 1.4rem;
+            font-weight: bold;
+        }
+        .score-high {
+            color: #0f9d58;
+        }
+        .score-medium {
+            color: #f4b400;
+        }
+        .score-low {
+            color: #db4437;
+        }
+        .question {
+            font-weight: bold;
+            margin-bottom: 10px;
+        }
+        .section {
+            margin-top: 15px;
+        }
+        .section-title {
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+        .strengths {
+            background-color: #e6f4ea;
+            border-radius: 4px;
+            padding: 10px;
+        }
+        .improvements {
+            background-color: #fce8e6;
+            border-radius: 4px;
+            padding: 10px;
+        }
+    </style>
+</head>
+<body>
+    <h1>Evaluation Results</h1>
+"""
+
+# Compiled once and filled per evaluation
+CARD_TEMPLATE = Template("""
+    <div class="evaluation-card">
+        <div class="student-info">
+            <div class="student-name">$student_name</div>
+            <div class="score $score_class">Score: $score</div>
+        </div>
+
+        <div class="question">$question</div>
+
+        <div class="section">
+            <div class="section-title">Student Answer:</div>
+            <p>$student_answer</p>
+        </div>
+
+        <div class="section">
+            <div class="section-title">Feedback:</div>
+            <p>$feedback</p>
+        </div>
+
+        <div class="section strengths">
+            <div class="section-title">Strengths:</div>
+            <p>$strengths</p>
+        </div>
+
+        <div class="section improvements">
+            <div class="section-title">Areas for Improvement:</div>
+            <p>$improvements</p>
+        </div>
+    </div>
+""")
+
+REPORT_FOOTER = """
+</body>
+</html>
+"""
+
+
+def score_class(score):
+    """Return the CSS class used to colour a score."""
+    if isinstance(score, (int, float)) and score >= 80:
+        return "score-high"
+    if isinstance(score, (int, float)) and score >= 60:
+        return "score-medium"
+    return "score-low"
+
+
+def split_points(text):
+    """Split a bulleted Strengths / Areas for Improvement block into a list of points."""
+    points = []
+    for line in (text or "").splitlines():
+        point = line.strip().lstrip("-*•").strip()
+        if point:
+            points.append(point)
+    return points
+
+
+def to_result_record(evaluation):
+    """Convert an evaluation row into the canonical JSON results record."""
+    return {
+        "studentName": evaluation["Student Name"],
+        "questionNumber": evaluation["Question Number"],
+        "questionText": evaluation["Question"],
+        "answerKey": evaluation["Answer Key"],
+        "studentAnswer": evaluation["Student Answer"],
+        "score": evaluation["Score"] if isinstance(evaluation["Score"], (int, float)) else None,
+        "maxScore": 100,
+        "feedback": evaluation["Feedback"],
+        "strengths": split_points(evaluation["Strengths"]),
+        "improvements": split_points(evaluation["Areas for Improvement"]),
+        "autoScored": evaluation.get("Auto_Scored", False)
+    }
+
+
+class _StreamingWriter:
+    """
+    Base class for writers that append one evaluation at a time.
+
+    Output goes to `<path>.partial` and is renamed over `path` only when the writer
+    is closed cleanly, so readers never see a half-written file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.partial_path = f"{path}.partial"
+        self.count = 0
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self.write_header()
+
+    def write_header(self):
+        pass
+
+    def write_footer(self):
+        pass
+
+    def write(self, evaluation):
+        raise NotImplementedError
+
+    def close(self):
+        """Finish the file and move it into place."""
+        self.write_footer()
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+
+    def abort(self):
+        """Stop writing and leave the partial file behind for inspection."""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class HtmlReportWriter(_StreamingWriter):
+    """Writes the styled HTML report card by card as evaluations arrive."""
+
+    def write_header(self):
+        self._file.write(REPORT_HEADER)
+
+    def write_footer(self):
+        self._file.write(REPORT_FOOTER)
+
+    def write(self, evaluation):
+        """Render and flush one evaluation card."""
+        self._file.write(CARD_TEMPLATE.substitute(
+            student_name=html.escape(str(evaluation["Student Name"])),
+            score_class=score_class(evaluation["Score"]),
+            score=html.escape(str(evaluation["Score"])),
+            question=html.escape(str(evaluation["Question"])),
+            student_answer=html.escape(str(evaluation["Student Answer"])),
+            feedback=html.escape(str(evaluation["Feedback"])),
+            strengths=html.escape(str(evaluation["Strengths"])),
+            improvements=html.escape(str(evaluation["Areas for Improvement"]))
+        ))
+        self._file.flush()
+        self.count += 1
+
+
+class JsonlResultsWriter(_StreamingWriter):
+    """Writes one canonical JSON record per evaluation."""
+
+    def write(self, evaluation):
+        """Append and flush the record for one evaluation."""
+        self._file.write(json.dumps(to_result_record(evaluation), ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
@@ -0,0 +1,409 @@
+"""Indexed SQLite store of graded results, queried by the Flask results endpoints."""
+
+import base64
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+
+def iter_result_records(path):
+    """Yield the records of a JSONL results file one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _split_points(value):
+    return value.split("\n") if value else []
+
+
+def _score_or_zero(value):
+    return value if value is not None else 0
+
+
+SORT_KEYS = ("position", "name", "score")
+
+# Output keys of a student and of each of their questions
+STUDENT_FIELDS = (
+    "id", "evaluationId", "studentName", "subject", "year", "semester",
+    "submissionDate", "overallScore", "maxScore", "questions"
+)
+# Question key -> (results column, converter applied to the stored value)
+QUESTION_COLUMNS = {
+    "questionNumber": ("question_number", None),
+    "questionText": ("question_text", None),
+    "studentAnswer": ("student_answer", None),
+    "score": ("score", _score_or_zero),
+    "maxScore": ("max_score", None),
+    "feedback": ("feedback", None),
+    "strengths": ("strengths", _split_points),
+    "improvements": ("improvements", _split_points),
+    "autoScored": ("auto_scored", bool),
+}
+QUESTION_FIELDS = ("id",) + tuple(QUESTION_COLUMNS)
+
+
+def parse_fields(fields):
+    """
+    Split a field projection into (student keys, question keys).
+
+    `fields` is a list such as ["studentName", "overallScore", "questions.score"];
+    "questions" selects whole questions and "questions.<key>" single question keys.
+    None selects everything. Student keys are None when they are not restricted;
+    question keys are None when no question data is selected.
+    """
+    if not fields:
+        return None, QUESTION_FIELDS
+
+    student_keys = []
+    question_keys = []
+    for field in fields:
+        if field.startswith("questions."):
+            key = field[len("questions."):]
+            if key not in QUESTION_FIELDS:
+                raise ValueError(f"Unknown question field: {key}")
+            question_keys.append(key)
+            field = "questions"
+        elif field not in STUDENT_FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        if field not in student_keys:
+            student_keys.append(field)
+
+    if "questions" not in student_keys:
+        return student_keys, None
+    if "questions" in fields or not question_keys:
+        return student_keys, QUESTION_FIELDS
+    return student_keys, question_keys
+
+
+def encode_cursor(sort_value, position):
+    """Opaque cursor pointing just after the student at (sort value, position)."""
+    return base64.urlsafe_b64encode(json.dumps([sort_value, position]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        sort_value, position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(position, int):
+        raise ValueError("Invalid cursor")
+    return sort_value, position
+
+
+class ResultsStore:
+    """
+    Keeps every graded answer of every evaluation in indexed tables.
+
+    The grader saves a run once when it finishes; the API then answers dashboard
+    requests with indexed queries instead of re-reading answer files and reports.
+    Strengths and improvements are stored one point per line.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        """Create the tables and indexes if they do not exist yet."""
+        conn = self._connect()
+        conn.executescript('''
+        CREATE TABLE IF NOT EXISTS evaluations (
+            evaluation_id TEXT PRIMARY KEY,
+            subject TEXT,
+            year TEXT,
+            semester TEXT,
+            student_count INTEGER,
+            result_count INTEGER,
+            completed_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_evaluations_completed ON evaluations (completed_at);
+
+        CREATE TABLE IF NOT EXISTS students (
+            evaluation_id TEXT NOT NULL,
+            student_name TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            overall_score INTEGER,
+            question_count INTEGER,
+            PRIMARY KEY (evaluation_id, student_name)
+        );
+        CREATE INDEX IF NOT EXISTS idx_students_name ON students (student_name);
+        CREATE INDEX IF NOT EXISTS idx_students_position ON students (evaluation_id, position);
+        CREATE INDEX IF NOT EXISTS idx_students_score ON students (evaluation_id, overall_score, position);
+        CREATE INDEX IF NOT EXISTS idx_students_sort_name ON students (evaluation_id, student_name, position);
+
+        CREATE TABLE IF NOT EXISTS results (
+            evaluation_id TEXT NOT NULL,
+            student_name TEXT NOT NULL,
+            student_position INTEGER NOT NULL,
+            question_number INTEGER NOT NULL,
+            question_text TEXT,
+            answer_key TEXT,
+            student_answer TEXT,
+            score INTEGER,
+            max_score INTEGER,
+            feedback TEXT,
+            strengths TEXT,
+            improvements TEXT,
+            auto_scored INTEGER,
+            PRIMARY KEY (evaluation_id, student_name, question_number)
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_student ON results (student_name);
+        CREATE INDEX IF NOT EXISTS idx_results_question ON results (evaluation_id, question_number);
+        CREATE INDEX IF NOT EXISTS idx_results_order
+            ON results (evaluation_id, student_position, question_number);
+        ''')
+        conn.commit()
+        conn.close()
+
+    def save_evaluation(self, evaluation_id, records, subject=None, year=None, semester=None):
+        """
+        Replace the stored results of an evaluation with `records`.
+
+        `records` is any iterable of canonical result records (see
+        report_renderer.to_result_record); it is consumed once, inside a single
+        transaction, so readers see either the old or the new results.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                for table in ("results", "students", "evaluations"):
+                    conn.execute(f"DELETE FROM {table} WHERE evaluation_id = ?", (evaluation_id,))
+
+                students = {}
+                result_count = 0
+                for record in records:
+                    name = record["studentName"]
+                    if name not in students:
+                        students[name] = {"position": len(students), "total": 0, "count": 0}
+                    student = students[name]
+                    # Ungraded answers count as 0 in the overall score, as in the report
+                    student["total"] += record["score"] if record["score"] is not None else 0
+                    student["count"] += 1
+                    result_count += 1
+                    conn.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            evaluation_id, name, student["position"], record["questionNumber"],
+                            record["questionText"], record.get("answerKey"), record["studentAnswer"],
+                            record["score"], record.get("maxScore", 100), record["feedback"],
+                            "\n".join(record["strengths"]), "\n".join(record["improvements"]),
+                            int(bool(record.get("autoScored", False)))
+                        )
+                    )
+
+                conn.executemany(
+                    "INSERT INTO students VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (evaluation_id, name, student["position"],
+                         int(round(student["total"] / student["count"])), student["count"])
+                        for name, student in students.items()
+                    ]
+                )
+                conn.execute(
+                    "INSERT INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (evaluation_id, subject, year, semester, len(students), result_count, time.time())
+                )
+        finally:
+            conn.close()
+        return result_count
+
+    def get_evaluation(self, evaluation_id):
+        """Return the summary row of an evaluation, or None if it is not stored."""
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM evaluations WHERE evaluation_id = ?", (evaluation_id,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def latest_evaluation_id(self, subject=None):
+        """Return the id of the most recently saved evaluation, optionally of one subject, or None."""
+        conn = self._connect()
+        if subject:
+            row = conn.execute(
+                "SELECT evaluation_id FROM evaluations WHERE subject = ? COLLATE NOCASE "
+                "ORDER BY completed_at DESC LIMIT 1",
+                (subject,)
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT evaluation_id FROM evaluations ORDER BY completed_at DESC LIMIT 1"
+            ).fetchone()
+        conn.close()
+        return row["evaluation_id"] if row else None
+
+    def student_results(self, evaluation_id, student_name=None, limit=None):
+        """
+        Return the students of an evaluation in the structure used by the React app.
+
+        Students keep the order they were graded in; `student_name` restricts the
+        result to one student and `limit` to the first students graded. Returns an
+        empty list for unknown evaluations.
+        """
+        return self.query_students(evaluation_id, limit=limit, student_name=student_name)[0]
+
+    def query_students(self, evaluation_id, sort="position", descending=False, limit=None, cursor=None,
+                       min_score=None, max_score=None, question=None, fields=None, student_name=None):
+        """
+        Return one page of an evaluation's students as (students, next_cursor, total).
+
+        Students are ordered by `sort` ("position", "name" or "score") and paged with
+        opaque keyset cursors, so every page costs the same however deep it is.
+        `min_score`/`max_score` keep a score band and `question` keeps only that
+        question's answers; with a question, the score used for the band and for
+        sorting is the score on that question instead of the overall score.
+        `fields` projects the output (see parse_fields). `total` counts every
+        student matching the filters. Raises ValueError for an unknown sort or
+        field, or a malformed cursor.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        student_fields, question_fields = parse_fields(fields)
+
+        conn = self._connect()
+        evaluation = conn.execute(
+            "SELECT * FROM evaluations WHERE evaluation_id = ?", (evaluation_id,)
+        ).fetchone()
+        if evaluation is None:
+            conn.close()
+            return [], None, 0
+
+        # Plain tuples are markedly cheaper than sqlite3.Row for thousands of answers
+        conn.row_factory = None
+        params = []
+        score_column = "s.overall_score"
+        join = ""
+        if question is not None:
+            join = ("JOIN results r ON r.evaluation_id = s.evaluation_id "
+                    "AND r.student_name = s.student_name AND r.question_number = ?")
+            params.append(question)
+            score_column = "COALESCE(r.score, 0)"
+        conditions = ["s.evaluation_id = ?"]
+        params.append(evaluation_id)
+        if student_name is not None:
+            conditions.append("s.student_name = ?")
+            params.append(student_name)
+        if min_score is not None:
+            conditions.append(f"{score_column} >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append(f"{score_column} <= ?")
+            params.append(max_score)
+        filtered = f"FROM students s {join} WHERE {' AND '.join(conditions)}"
+        total = conn.execute(f"SELECT COUNT(*) {filtered}", params).fetchone()[0]
+
+        sort_column = {"position": "s.position", "name": "s.student_name", "score": score_column}[sort]
+        direction = "DESC" if descending else "ASC"
+        page = filtered
+        page_params = list(params)
+        if cursor is not None:
+            value, position = decode_cursor(cursor)
+            operator = "<" if descending else ">"
+            # s.position is unique within an evaluation and breaks ties between equal sort values
+            page += f" AND ({sort_column}, s.position) {operator} (?, ?)"
+            page_params += [value, position]
+        page += f" ORDER BY {sort_column} {direction}, s.position {direction}"
+        if limit is not None:
+            # One extra row tells whether another page follows
+            page += " LIMIT ?"
+            page_params.append(limit + 1)
+        student_rows = conn.execute(
+            f"SELECT s.student_name, s.position, s.overall_score, {sort_column} {page}", page_params
+        ).fetchall()
+
+        next_cursor = None
+        if limit is not None and len(student_rows) > limit:
+            student_rows = student_rows[:limit]
+            last = student_rows[-1]
+            next_cursor = encode_cursor(last[3], last[1])
+
+        submission_date = datetime.fromtimestamp(evaluation["completed_at"]).isoformat()
+        students = {}
+        for name, position, overall_score, _ in student_rows:
+            student = {
+                "id": f"{evaluation_id}-{position}",
+                "evaluationId": evaluation_id,
+                "studentName": name,
+                "subject": evaluation["subject"] or "Unknown Subject",
+                "year": evaluation["year"] or "Unknown Year",
+                "semester": evaluation["semester"] or "Unknown Semester",
+                "submissionDate": submission_date,
+                "overallScore": overall_score,
+                "maxScore": 100,
+                "questions": []
+            }
+            if student_fields is not None:
+                student = {key: student[key] for key in student_fields}
+            students[position] = student
+
+        if question_fields is not None and students:
+            self._attach_questions(conn, evaluation_id, students, question_fields, question,
+                                   paged=limit is not None or student_name is not None)
+        conn.close()
+
+        return list(students.values()), next_cursor, total
+
+    @staticmethod
+    def _attach_questions(conn, evaluation_id, students, question_fields, question, paged):
+        """Fill in the questions of `students`, a dict of student dicts keyed by position."""
+        conditions = ["evaluation_id = ?"]
+        params = [evaluation_id]
+        if paged:
+            positions = list(students)
+            conditions.append(f"student_position IN ({', '.join('?' for _ in positions)})")
+            params += positions
+        if question is not None:
+            conditions.append("question_number = ?")
+            params.append(question)
+
+        keys = [key for key in question_fields if key != "id"]
+        columns = ", ".join(["student_position"] + [QUESTION_COLUMNS[key][0] for key in keys])
+        converters = [QUESTION_COLUMNS[key][1] for key in keys]
+        with_id = "id" in question_fields
+
+        rows = conn.execute(
+            f"SELECT {columns} FROM results WHERE {' AND '.join(conditions)} "
+            "ORDER BY student_position, question_number",
+            params
+        ).fetchall()
+        for row in rows:
+            student = students.get(row[0])
+            if student is None:
+                continue
+            questions = student["questions"]
+            entry = {"id": len(questions) + 1} if with_id else {}
+            for key, convert, value in zip(keys, converters, row[1:]):
+                entry[key] = convert(value) if convert else value
+            questions.append(entry)
+
+    def score_rows(self, evaluation_id):
+        """
+        Return the scores of an evaluation as (student_name, question_number, score, max_score) tuples.
+
+        Rows come in report order (students as graded, then question number);
+        ungraded answers have a None score.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        rows = conn.execute(
+            "SELECT student_name, question_number, score, max_score FROM results "
+            "WHERE evaluation_id = ? ORDER BY student_position, question_number",
+            (evaluation_id,)
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def import_records_file(self, evaluation_id, records_file, **metadata):
+        """Save the records of a JSONL results file if the evaluation is not stored yet."""
+        if self.get_evaluation(evaluation_id) is not None or not os.path.exists(records_file):
+            return False
+        self.save_evaluation(evaluation_id, iter_result_records(records_file), **metadata)
+        return True
@@ -1,4 +1,5 @@
 import React, { createContext, useState, useContext } from 'react';
+import { api } from '../services/api';
 
 // Create the evaluation context
 const EvaluationContext = createContext();
@@ -14,21 +15,16 @@ export const EvaluationProvider = ({ children }) => {
   const [error, setError] = useState(null);
   const [selectedQuestionId, setSelectedQuestionId] = useState(null);
   
-  // Mock function to simulate submitting an answer sheet for evaluation
+  // Upload an answer sheet; it is added to this session's evaluation job
   const submitAnswerSheet = async (formData) => {
     setIsLoading(true);
     setError(null);
     
     try {
-      // In a real application, this would make an API call to your backend
-      // For demo purposes, we'll simulate a network delay and return mock data
-      await new Promise(resolve => setTimeout(resolve, 2000));
-      
-      // Mock evaluation ID (in a real app, this would come from your API)
-      const evaluationId = 'eval-' + Date.now();
+      const response = await api.uploadAnswers(formData);
       
       // Return the evaluation ID
-      return evaluationId;
+      return response.evaluationId;
     } catch (err) {
       setError('Failed to submit answer sheet. Please try again.');
       return null;
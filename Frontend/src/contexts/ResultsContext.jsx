@@ -1,4 +1,4 @@
-import React, { createContext, useState, useContext, useEffect } from 'react';
+import React, { createContext, useState, useContext, useEffect, useRef } from 'react';
 import { api } from '../services/api';
 
 const ResultsContext = createContext();
@@ -15,12 +15,25 @@ export const ResultsProvider = ({ children }) => {
     error: null
   });
   const [resultsExist, setResultsExist] = useState(false);
+  // Evaluations received so far from the live progress stream
+  const [partialResults, setPartialResults] = useState([]);
+  const eventSourceRef = useRef(null);
+  // Job started by this client; progress and status are followed for it only
+  const jobIdRef = useRef(null);
 
   // Check if results exist on initial load
   useEffect(() => {
     checkResultsExist();
+    return () => closeEventStream();
   }, []);
 
+  const closeEventStream = () => {
+    if (eventSourceRef.current) {
+      eventSourceRef.current.close();
+      eventSourceRef.current = null;
+    }
+  };
+
   const checkResultsExist = async () => {
     try {
       const data = await api.checkResultsExist();
@@ -33,9 +46,18 @@ export const ResultsProvider = ({ children }) => {
   const startEvaluation = async () => {
     setLoading(true);
     try {
-      await api.startEvaluation();
-      // Start polling for status updates
-      pollStatus();
+      setPartialResults([]);
+      // Grade the answers uploaded in this session; without uploads the shared folder is graded
+      const uploadJobId = api.pendingUploadJob();
+      const response = await api.startEvaluation(uploadJobId);
+      if (uploadJobId) api.clearPendingUploadJob();
+      jobIdRef.current = response.evaluationId || null;
+      // Prefer pushed progress; fall back to polling where EventSource is unavailable
+      if (window.EventSource) {
+        streamStatus();
+      } else {
+        pollStatus();
+      }
     } catch (error) {
       setEvaluationStatus(prev => ({
         ...prev,
@@ -45,9 +67,52 @@ export const ResultsProvider = ({ children }) => {
     }
   };
 
+  const streamStatus = () => {
+    closeEventStream();
+
+    const finish = (status) => {
+      closeEventStream();
+      setEvaluationStatus(status);
+      setLoading(false);
+      checkResultsExist();
+    };
+
+    eventSourceRef.current = api.subscribeToEvaluation({
+      status: (status) => {
+        // A job that ended before we connected sends only this snapshot, no complete event
+        if (!status.running && (status.complete || status.error)) {
+          finish(status);
+        } else {
+          setEvaluationStatus(status);
+        }
+      },
+      progress: (event) => {
+        setEvaluationStatus(prev => ({
+          ...prev,
+          running: true,
+          completed: event.completed,
+          total: event.total,
+          progress: Math.min(99, Math.floor((event.completed * 100) / (event.total || 1))),
+          currentStudent: event.student,
+          currentQuestion: event.questionNumber,
+          lastLatency: event.latency,
+          message: `Graded ${event.student} - Question ${event.questionNumber} (${event.completed}/${event.total})`
+        }));
+        setPartialResults(prev => [...prev, event.evaluation]);
+      },
+      complete: finish,
+      error: finish,
+      onConnectionError: () => {
+        // Stream dropped: continue with plain polling
+        closeEventStream();
+        pollStatus();
+      }
+    }, jobIdRef.current);
+  };
+
   const pollStatus = async () => {
     try {
-      const status = await api.checkStatus();
+      const status = await api.checkStatus(jobIdRef.current);
       setEvaluationStatus(status);
       
       // If evaluation is still running, poll again in 2 seconds
@@ -76,6 +141,7 @@ export const ResultsProvider = ({ children }) => {
       loading,
       evaluationStatus,
       resultsExist,
+      partialResults,
       startEvaluation,
       downloadResults,
       checkResultsExist
@@ -116,8 +116,9 @@ const UploadPage = () => {
     setProgress(100);
     
     if (evaluationId) {
+      // Grading starts from the evaluation page, once every answer sheet is uploaded
       setTimeout(() => {
-        navigate(`/results/${evaluationId}`);
+        navigate('/evaluation');
       }, 500);
     }
   };
@@ -4,6 +4,42 @@ const API_URL = process.env.NODE_ENV === 'production'
     ? 'http://localhost:5000'
     : `http://${window.location.hostname}:5000`;  // Use the same hostname as frontend
 
+// Session storage key of the job this browser session's uploads are added to
+const UPLOAD_JOB_KEY = 'uploadEvaluationId';
+
+// Upload an answer file or a zip/tar of them. Uploads of one session are added to the
+// same job until it is started, so a class can be uploaded a file at a time
+const uploadAnswers = async (formData) => {
+  const send = () => fetch(`${API_URL}/api/upload`, {
+    method: 'POST',
+    body: formData,
+    mode: 'cors',
+    credentials: 'omit'
+  });
+
+  try {
+    const jobId = sessionStorage.getItem(UPLOAD_JOB_KEY);
+    if (jobId) formData.set('evaluationId', jobId);
+    let response = await send();
+    if (jobId && (response.status === 404 || response.status === 409)) {
+      // The job was started or removed in the meantime: begin a new one
+      sessionStorage.removeItem(UPLOAD_JOB_KEY);
+      formData.delete('evaluationId');
+      response = await send();
+    }
+
+    const data = await response.json();
+    if (!response.ok) {
+      throw new Error(data.message || 'Failed to upload answers');
+    }
+    sessionStorage.setItem(UPLOAD_JOB_KEY, data.evaluationId);
+    return data;
+  } catch (error) {
+    console.error('API error in uploadAnswers:', error);
+    throw error;
+  }
+};
+
 const viewResults = async () => {
   try {
     // Use correct endpoint matching your Flask route (/results)
@@ -29,10 +65,14 @@ const viewResults = async () => {
   }
 };
 
-// Add a new method to get all student results
-const getStudentResults = async () => {
+// Get student results; params may page (limit, cursor), sort ('score', '-score', 'name'),
+// filter (min_score, max_score, question, subject) and project (fields) the list
+const getStudentResults = async (params = {}) => {
   try {
-    const response = await fetch(`${API_URL}/api/students_results`);
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+    ).toString();
+    const response = await fetch(`${API_URL}/api/students_results${query ? `?${query}` : ''}`);
     
     if (!response.ok) {
       const error = await response.json();
@@ -46,9 +86,61 @@ const getStudentResults = async () => {
   }
 };
 
+// Get class analytics (per-question difficulty, score distributions, outliers) for an
+// evaluation: params may select it by job or subject, otherwise the latest one is used
+const getAnalytics = async (params = {}) => {
+  try {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+    ).toString();
+    const response = await fetch(`${API_URL}/api/analytics${query ? `?${query}` : ''}`);
+    
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.message || 'Failed to fetch analytics');
+    }
+    
+    return await response.json();
+  } catch (error) {
+    console.error('API error in getAnalytics:', error);
+    throw error;
+  }
+};
+
+// Subscribe to live evaluation progress pushed by the server (Server-Sent Events),
+// optionally only for one evaluation job
+const subscribeToEvaluation = (handlers, jobId) => {
+  const query = jobId ? `?job=${encodeURIComponent(jobId)}` : '';
+  const source = new EventSource(`${API_URL}/api/evaluation/events${query}`);
+
+  ['status', 'progress', 'complete', 'error'].forEach((eventType) => {
+    source.addEventListener(eventType, (event) => {
+      // Connection errors also fire 'error' but carry no data
+      if (!event.data) return;
+      const handler = handlers[eventType];
+      if (handler) handler(JSON.parse(event.data));
+    });
+  });
+
+  source.onerror = () => {
+    if (handlers.onConnectionError) handlers.onConnectionError();
+  };
+
+  return source;
+};
+
 export const api = {
-  // Start the evaluation process
-  startEvaluation: async () => {
+  // Upload answer files; returns the upload summary and the id of the job they belong to
+  uploadAnswers,
+
+  // The job this session's uploads were added to, if it has not been started yet
+  pendingUploadJob: () => sessionStorage.getItem(UPLOAD_JOB_KEY),
+
+  // Forget the pending upload job once it has been started; later uploads start a new one
+  clearPendingUploadJob: () => sessionStorage.removeItem(UPLOAD_JOB_KEY),
+
+  // Start the evaluation process; returns the id of the queued job
+  startEvaluation: async (evaluationId) => {
     try {
       console.log(`Sending request to ${API_URL}/start_evaluation`);
       const response = await fetch(`${API_URL}/start_evaluation`, {
@@ -56,6 +148,7 @@ export const api = {
         headers: {
           'Content-Type': 'application/json',
         },
+        body: JSON.stringify(evaluationId ? { evaluationId } : {}),
         mode: 'cors',
         credentials: 'omit'
       });
@@ -71,10 +164,14 @@ export const api = {
     }
   },
 
-  // Check evaluation status
-  checkStatus: async () => {
+  // Stream evaluation progress instead of polling /status
+  subscribeToEvaluation,
+
+  // Check the status of an evaluation job, or of the most recent one
+  checkStatus: async (jobId) => {
     try {
-      const response = await fetch(`${API_URL}/status`, {
+      const url = jobId ? `${API_URL}/api/jobs/${encodeURIComponent(jobId)}` : `${API_URL}/status`;
+      const response = await fetch(url, {
         mode: 'cors',
         credentials: 'omit'
       });
@@ -118,5 +215,8 @@ export const api = {
   viewResults,
 
   // Get student results
-  getStudentResults
+  getStudentResults,
+
+  // Get class analytics
+  getAnalytics
 };
\ No newline at end of file
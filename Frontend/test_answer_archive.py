@@ -0,0 +1,93 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from answer_archive import ArchiveError, extract_answers, is_archive
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files:
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def make_tar(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+def test_is_archive():
+    assert is_archive("class.ZIP") and is_archive("class.tar.gz")
+    assert not is_archive("answers.txt")
+
+
+def test_extracts_answer_files_by_base_name(tmp_path):
+    folder = str(tmp_path / "answers")
+    archive = make_zip([
+        ("class/Bob.txt", b"1. Paris"), ("class/Иван.txt", "1. Париж".encode()), ("李.txt", b"1. Paris"),
+        ("notes.pdf", b"%PDF"), ("__MACOSX/._Bob.txt", b""), (".hidden.txt", b"x")
+    ])
+    summary = extract_answers(archive, "class.zip", folder)
+
+    assert sorted(summary["added"]) == sorted(["Bob", "Иван", "李"])
+    assert sorted(os.listdir(folder)) == sorted(["Bob.txt", "Иван.txt", "李.txt"])
+    with open(os.path.join(folder, "Иван.txt"), encoding="utf-8") as f:
+        assert f.read() == "1. Париж"
+    assert len(summary["skipped"]) == 3
+
+
+def test_tar_entries_cannot_leave_the_folder(tmp_path):
+    folder = str(tmp_path / "answers")
+    summary = extract_answers(make_tar([("../../evil.txt", b"x"), ("a/..", b"x")]), "class.tgz", folder)
+    assert summary["added"] == ["evil"]
+    assert os.listdir(folder) == ["evil.txt"]
+    assert not os.path.exists(tmp_path / "evil.txt")
+
+
+def test_duplicates_and_invalid_entries_are_skipped(tmp_path):
+    archive = make_zip([("a/Bob.txt", b"one"), ("b/Bob.txt", b"two"), ("Eve.txt", b"\xff\xfe")])
+    summary = extract_answers(archive, "class.zip", str(tmp_path))
+    assert summary["added"] == ["Bob"]
+    assert [skip["reason"] for skip in summary["skipped"]] == ["duplicate student file", "not UTF-8 text"]
+
+
+def test_size_and_count_limits(tmp_path):
+    archive = make_zip([("Big.txt", b"x" * 11), ("A.txt", b"a"), ("B.txt", b"b"), ("C.txt", b"c")])
+    summary = extract_answers(archive, "class.zip", str(tmp_path), max_entry_size=10, max_entries=2)
+    assert summary["added"] == ["A", "B"]
+    assert [skip["reason"] for skip in summary["skipped"]] == ["larger than 10 bytes", "archive limit reached"]
+
+    archive = make_zip([("A.txt", b"aaaa"), ("B.txt", b"bbbb"), ("C.txt", b"cccc")])
+    summary = extract_answers(archive, "class.zip", str(tmp_path / "total"), max_total_size=6)
+    assert summary["added"] == ["A"]
+    assert summary["bytes"] == 4
+    assert len(summary["skipped"]) == 2
+
+
+def test_unchanged_files_are_left_alone(tmp_path):
+    folder = str(tmp_path)
+    extract_answers(make_zip([("Bob.txt", b"one"), ("Ann.txt", b"one")]), "class.zip", folder)
+    os.utime(os.path.join(folder, "Bob.txt"), (0, 0))
+
+    summary = extract_answers(make_zip([("Bob.txt", b"one"), ("Ann.txt", b"two")]), "class.zip", folder)
+    assert summary["unchanged"] == ["Bob"]
+    assert summary["updated"] == ["Ann"]
+    assert os.path.getmtime(os.path.join(folder, "Bob.txt")) == 0
+    assert not [name for name in os.listdir(folder) if name.endswith(".part")]
+
+
+def test_unreadable_archive(tmp_path):
+    with pytest.raises(ArchiveError):
+        extract_answers(io.BytesIO(b"not a zip"), "class.zip", str(tmp_path))
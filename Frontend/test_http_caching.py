@@ -0,0 +1,99 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+import http_caching
+from http_caching import conditional_file, conditional_json
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_caching, "brotli", None)
+    http_caching._body_cache.clear()
+    builds = []
+    app = Flask(__name__)
+
+    @app.route("/data")
+    def data():
+        size = int(http_caching.request.args.get("size", 10))
+
+        def build():
+            builds.append(size)
+            return {"items": ["x" * size]}
+
+        return conditional_json("v1", build)
+
+    @app.route("/report")
+    def report():
+        return conditional_file(str(tmp_path / "report.html"), "text/html", download_name="report.html")
+
+    client = app.test_client()
+    client.builds = builds
+    client.report_path = tmp_path / "report.html"
+    return client
+
+
+def test_small_bodies_are_tagged_identity(client):
+    response = client.get("/data", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    etag = response.headers["ETag"]
+    assert not etag.strip('"').endswith("-gzip")
+
+    revalidated = client.get("/data", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert client.builds == [10]
+
+
+def test_large_bodies_are_compressed_and_tagged_with_their_encoding(client):
+    response = client.get("/data?size=5000", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].strip('"').endswith("-gzip")
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data))["items"][0] == "x" * 5000
+
+    plain = client.get("/data?size=5000")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["ETag"] != response.headers["ETag"]
+
+    revalidated = client.get("/data?size=5000", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]
+    })
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+
+def test_parameters_change_the_etag(client):
+    first = client.get("/data?size=1").headers["ETag"]
+    second = client.get("/data?size=2").headers["ETag"]
+    assert first != second
+    assert client.get("/data?size=2", headers={"If-None-Match": first}).status_code == 200
+
+
+def test_small_files_are_buffered(client):
+    client.report_path.write_text("<html>" + "r" * 2000 + "</html>")
+    response = client.get("/report", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="report.html"'
+    assert len(http_caching._body_cache) == 1
+
+
+def test_large_files_are_streamed_without_caching(client, monkeypatch):
+    monkeypatch.setattr(http_caching, "MAX_BUFFERED_FILE_SIZE", 100)
+    client.report_path.write_text("<html>" + "r" * 2000 + "</html>")
+    response = client.get("/report", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert "attachment" in response.headers["Content-Disposition"]
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.data.startswith(b"<html>")
+    assert http_caching._body_cache == {}
+
+    etag = response.headers["ETag"]
+    assert client.get("/report", headers={"If-None-Match": etag}).status_code == 304
+
+    client.report_path.write_text("<html>changed</html>" + "r" * 2000)
+    assert client.get("/report", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,60 @@
+import pytest
+
+from job_registry import JobRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return JobRegistry(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_create_update_and_get(registry):
+    job_id = registry.create(subject="Math", upload_file="student_answers/x", created_at=1.0)
+    job = registry.get(job_id)
+    assert job["status"] == "uploaded"
+    assert job["subject"] == "Math" and job["progress"] == 0 and job["error"] is None
+
+    error = {"type": "ValueError", "stage": "grading", "message": "Ошибка"}
+    registry.update(job_id, status="error", error=error, progress=40)
+    job = registry.get(job_id)
+    assert job["status"] == "error" and job["error"] == error and job["progress"] == 40
+
+    assert registry.get("eval-missing") is None
+
+
+def test_rejects_unknown_fields_and_statuses(registry):
+    with pytest.raises(ValueError):
+        registry.create(colour="red")
+    job_id = registry.create()
+    with pytest.raises(ValueError):
+        registry.update(job_id, status="paused")
+    assert registry.get(job_id)["status"] == "uploaded"
+
+
+def test_listing_and_active_jobs(registry):
+    old = registry.create(status="complete", created_at=1.0, finished_at=5.0)
+    newer = registry.create(status="complete", created_at=2.0, finished_at=3.0)
+    queued = registry.create(status="queued", created_at=3.0)
+    running = registry.create(status="running", created_at=4.0)
+
+    assert [job["id"] for job in registry.list()] == [running, queued, newer, old]
+    assert [job["id"] for job in registry.list(status="complete", limit=1)] == [newer]
+    assert registry.latest()["id"] == running
+    assert registry.latest(statuses=["complete"])["id"] == newer
+    # Ordered by when the run finished, not when the job was created
+    assert registry.latest_with_results()["id"] == old
+    assert registry.count_active() == 2
+
+
+def test_fail_interrupted(registry):
+    queued = registry.create(status="queued")
+    running = registry.create(status="running")
+    done = registry.create(status="complete")
+
+    assert sorted(registry.fail_interrupted("Server restarted")) == sorted([queued, running])
+    assert registry.count_active() == 0
+    job = registry.get(running)
+    assert job["status"] == "error" and job["finished_at"] is not None
+    assert job["error"] == {"type": "Interrupted", "stage": "app", "message": "Server restarted"}
+    assert registry.get(done)["status"] == "complete"
+    assert registry.fail_interrupted("again") == []
@@ -0,0 +1,156 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from ollama_pool import NoHealthyHostError, OllamaHostPool
+
+
+class StubClient:
+    """Stands in for an Ollama client; `down` makes every call fail like a dead host."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.down = False
+        self.calls = 0
+        self.gate = None
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_after = None
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise requests.ConnectionError(f"{self.base_url} refused the connection")
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.gate is not None:
+                self.gate.wait(5)
+            return f"{self.base_url}: {prompt}"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def stream(self, prompt, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise requests.ConnectionError(f"{self.base_url} refused the connection")
+        for index, word in enumerate(["one", "two", "three"]):
+            if self.fail_after is not None and index == self.fail_after:
+                raise requests.ConnectionError(f"{self.base_url} dropped the stream")
+            yield word
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    probes = {}
+    monkeypatch.setattr(OllamaHostPool, "_probe", lambda self, host: probes.get(host.base_url, (True, None)))
+
+    def make(hosts=("http://a", "http://b"), **kwargs):
+        pool = OllamaHostPool(list(hosts), StubClient, **kwargs)
+        # No background monitor: tests drive health checks themselves
+        pool.close()
+        pool.clients = {host.base_url: host.client for host in pool._hosts}
+        pool.probes = probes
+        return pool
+
+    return make
+
+
+def test_invoke_fails_over_to_another_host(make_pool):
+    pool = make_pool()
+    pool.clients["http://a"].down = True
+
+    assert pool.invoke("hi") == "http://b: hi"
+    stats = {host["baseUrl"]: host for host in pool.stats()}
+    assert stats["http://a"]["healthy"] is False
+    assert stats["http://a"]["failures"] == 1
+    assert "refused" in stats["http://a"]["lastError"]
+    assert stats["http://b"]["inFlight"] == 0
+
+    # The failed host is routed around from now on
+    assert pool("again") == "http://b: again"
+    assert pool.clients["http://a"].calls == 1
+
+
+def test_stream_fails_over_only_before_the_first_chunk(make_pool):
+    pool = make_pool()
+    pool.clients["http://a"].down = True
+    assert list(pool.stream("hi")) == ["one", "two", "three"]
+
+    pool = make_pool(hosts=["http://a"])
+    pool.clients["http://a"].fail_after = 1
+    received = []
+    with pytest.raises(requests.ConnectionError):
+        for chunk in pool.stream("hi"):
+            received.append(chunk)
+    assert received == ["one"]
+    assert pool.clients["http://a"].calls == 1
+    assert pool.stats()[0]["inFlight"] == 0
+
+
+def test_no_healthy_host(make_pool):
+    pool = make_pool()
+    for client in pool.clients.values():
+        client.down = True
+    pool.probes.update({"http://a": (False, "timed out"), "http://b": (False, "timed out")})
+
+    with pytest.raises(NoHealthyHostError):
+        pool.invoke("hi")
+    with pytest.raises(NoHealthyHostError):
+        list(pool.stream("hi"))
+    assert all(host["inFlight"] == 0 for host in pool.stats())
+
+
+def test_recovery_through_check_health(make_pool):
+    pool = make_pool()
+    pool.clients["http://a"].down = True
+    pool.invoke("hi")
+    assert [host["healthy"] for host in pool.stats()] == [False, True]
+
+    pool.clients["http://a"].down = False
+    assert pool.check_health() == 2
+    assert [host["healthy"] for host in pool.stats()] == [True, True]
+
+    pool.probes["http://b"] = (False, "model llama3 is not available")
+    assert pool.check_health() == 1
+    assert pool.invoke("hi") == "http://a: hi"
+
+
+def test_all_hosts_down_are_probed_before_giving_up(make_pool):
+    pool = make_pool(hosts=["http://a"])
+    pool.clients["http://a"].down = True
+    with pytest.raises(NoHealthyHostError):
+        pool.invoke("hi")
+
+    # The host came back between requests; the next call probes it instead of failing
+    pool.clients["http://a"].down = False
+    assert pool.invoke("hi") == "http://a: hi"
+
+
+def test_requests_respect_per_host_concurrency(make_pool):
+    pool = make_pool(max_concurrency=2)
+    assert pool.capacity == 4
+    gate = threading.Event()
+    for client in pool.clients.values():
+        client.gate = gate
+
+    results = []
+    threads = [threading.Thread(target=lambda n=n: results.append(pool.invoke(str(n)))) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    while sum(host["inFlight"] for host in pool.stats()) < 4:
+        time.sleep(0.01)
+    # Two calls wait for a free slot rather than overloading a host
+    assert [host["inFlight"] for host in pool.stats()] == [2, 2]
+
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(results) == 6
+    assert all(client.peak <= 2 for client in pool.clients.values())
+    assert sum(host["requests"] for host in pool.stats()) == 6
@@ -0,0 +1,38 @@
+from prescoring import NO_ANSWER_PLACEHOLDER, lexical_similarity, normalize_text, prescore
+
+
+def test_blank_answers_score_zero():
+    assert prescore("Paris", "   ")[0] == 0
+    assert prescore("Paris", NO_ANSWER_PLACEHOLDER)[0] == 0
+
+
+def test_key_identical_answers_score_full_marks():
+    assert prescore("The capital is Paris.", "the capital is  PARIS")[0] == 100
+    assert prescore("x = -5", "X = -5!")[0] == 100
+
+
+def test_signs_and_operators_are_not_ignored():
+    assert normalize_text("  x = -5. ") == "x = -5"
+    assert prescore("x = -5", "x = 5") is None
+    assert prescore("a > b", "a < b") is None
+    assert prescore("2^3 = 8", "2*3 = 8") is None
+
+
+def test_non_ascii_answers():
+    assert normalize_text("Париж!") == "париж"
+    assert prescore("Paris", "Париж") is None
+    assert prescore("4", "Четыре") is None
+    assert prescore("Столица — Париж.", "столица — ПАРИЖ")[0] == 100
+    assert prescore("東京", "東京")[0] == 100
+    assert lexical_similarity("Столица Франции", "столица") > 0
+
+
+def test_symbol_only_answers_go_to_the_llm():
+    assert prescore("∞", " ∞ ")[0] == 100
+    assert prescore("Infinity", "∞") is None
+    assert prescore("Infinity", "?!") is None
+
+
+def test_similarity_floor():
+    assert prescore("Paris is the capital of France", "bananas are yellow", similarity_floor=0.2)[0] == 0
+    assert prescore("Paris is the capital of France", "the capital is Paris", similarity_floor=0.2) is None
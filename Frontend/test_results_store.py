@@ -0,0 +1,96 @@
+import pytest
+
+from results_store import ResultsStore, decode_cursor, encode_cursor
+
+# Overall scores: Cara 90, Abe 50, Dan 50, Bea 20, Eve 70
+SCORES = {"Cara": (80, 100), "Abe": (50, 50), "Dan": (100, 0), "Bea": (20, None), "Eve": (70, 70)}
+
+
+def record(name, number, score):
+    return {
+        "studentName": name, "questionNumber": number, "questionText": f"Question {number}",
+        "studentAnswer": f"{name} answer {number}", "score": score, "feedback": "ok",
+        "strengths": ["clear", "short"], "improvements": [], "autoScored": number == 2
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    records = [record(name, number, score) for name, scores in SCORES.items()
+               for number, score in enumerate(scores, start=1)]
+    store.save_evaluation("eval-1", iter(records), subject="Math")
+    return store
+
+
+def all_pages(store, limit, **kwargs):
+    names, cursor, pages = [], None, 0
+    while True:
+        students, cursor, total = store.query_students("eval-1", limit=limit, cursor=cursor,
+                                                       fields=["studentName"], **kwargs)
+        names += [student["studentName"] for student in students]
+        pages += 1
+        if cursor is None:
+            return names, pages, total
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("Bea", 3)) == ("Bea", 3)
+    for bad in ["not base64!", encode_cursor("Bea", "3"), "W10="]:
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(bad)
+
+
+@pytest.mark.parametrize("sort, descending, expected", [
+    ("position", False, ["Cara", "Abe", "Dan", "Bea", "Eve"]),
+    ("name", False, ["Abe", "Bea", "Cara", "Dan", "Eve"]),
+    # Equal scores keep grading order, reversed when descending
+    ("score", False, ["Bea", "Abe", "Dan", "Eve", "Cara"]),
+    ("score", True, ["Cara", "Eve", "Dan", "Abe", "Bea"]),
+])
+def test_pages_cover_every_student_once(store, sort, descending, expected):
+    names, pages, total = all_pages(store, 2, sort=sort, descending=descending)
+    assert names == expected
+    assert pages == 3
+    assert total == 5
+
+
+def test_filters_and_question_scores(store):
+    names, _, total = all_pages(store, 1, min_score=50, max_score=70)
+    assert names == ["Abe", "Dan", "Eve"] and total == 3
+
+    # With a question, bands and sorting use that question's score; ungraded counts as 0
+    names, _, total = all_pages(store, 2, question=2, sort="score", max_score=50)
+    assert names == ["Dan", "Bea", "Abe"] and total == 3
+
+    students, _, _ = store.query_students("eval-1", question=2, student_name="Bea")
+    assert [(q["questionNumber"], q["score"]) for q in students[0]["questions"]] == [(2, 0)]
+
+
+def test_field_projection(store):
+    students, cursor, _ = store.query_students(
+        "eval-1", limit=1, fields=["studentName", "questions.score", "questions.autoScored"]
+    )
+    assert students == [{"studentName": "Cara", "questions": [
+        {"score": 80, "autoScored": False}, {"score": 100, "autoScored": True}
+    ]}]
+    assert cursor is not None
+
+    student = store.student_results("eval-1", student_name="Abe")[0]
+    assert student["overallScore"] == 50
+    assert student["questions"][0]["strengths"] == ["clear", "short"]
+    assert student["questions"][0]["improvements"] == []
+
+    with pytest.raises(ValueError):
+        store.query_students("eval-1", fields=["questions.grade"])
+    with pytest.raises(ValueError):
+        store.query_students("eval-1", sort="age")
+
+
+def test_unknown_evaluation_and_resave(store):
+    assert store.query_students("missing") == ([], None, 0)
+    assert store.latest_evaluation_id("math") == "eval-1"
+
+    store.save_evaluation("eval-1", [record("Zoe", 1, 40)])
+    assert [row[0] for row in store.score_rows("eval-1")] == ["Zoe"]
+    assert store.get_evaluation("eval-1")["student_count"] == 1
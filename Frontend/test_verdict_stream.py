@@ -0,0 +1,45 @@
+from verdict_stream import FORCED_ANSWER_INSTRUCTION, THINK_CLOSE, StreamingVerdictClient, VerdictTracker
+
+VERDICT = "Score: 80\nFeedback: Good.\nStrengths:\n- Clear\nAreas for Improvement:\n- More detail\n"
+
+
+def test_tracker_stops_thinking_over_budget():
+    tracker = VerdictTracker(think_budget=3)
+    statuses = [tracker.feed(token) for token in ["<think>", " one", " two", " three", " four"]]
+    assert statuses == [None, None, None, None, "over_budget"]
+    assert tracker.thoughts == "one two three four"
+
+
+def test_tracker_without_budget_reaches_verdict():
+    tracker = VerdictTracker(think_budget=0)
+    for token in ["<think>"] + [" word"] * 50 + [THINK_CLOSE, "\n"]:
+        assert tracker.feed(token) is None
+    for line in VERDICT.splitlines(keepends=True):
+        tracker.feed(line)
+    assert tracker.feed("\nThat is all.") == "complete"
+    assert tracker.text().split(THINK_CLOSE)[-1].strip() == VERDICT.strip()
+
+
+class ThinkingLLM:
+    """Opens every completion with a long <think> block, as deepseek-r1 does."""
+
+    def __init__(self):
+        self.calls = []
+
+    def stream(self, prompt, **kwargs):
+        self.calls.append(kwargs)
+        yield "<think>"
+        yield from [" hmm"] * 10
+        yield THINK_CLOSE + "\n"
+        yield from VERDICT.splitlines(keepends=True)
+
+
+def test_forced_answer_is_not_cut_by_the_budget_again():
+    llm = ThinkingLLM()
+    client = StreamingVerdictClient(llm, think_budget=5, forced_answer_tokens=64)
+    text = client("Grade this.")
+    assert len(llm.calls) == 2
+    assert llm.calls[1] == {"num_predict": 64}
+    assert text.split(THINK_CLOSE)[-1].strip() == VERDICT.strip()
+    assert client.streaming_stats()["budgetStops"] == 1
+    assert FORCED_ANSWER_INSTRUCTION not in text
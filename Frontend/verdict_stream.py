@@ -0,0 +1,226 @@
+"""Streamed grading completions that stop once the verdict is complete, with a reasoning budget."""
+
+import re
+import threading
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+# Section headings of a verdict, in the order the prompts ask for them
+SECTION_HEADINGS = ("Score:", "Feedback:", "Strengths:", "Areas for Improvement:")
+LAST_SECTION = SECTION_HEADINGS[-1]
+STUDENT_MARKER_PATTERN = re.compile(r"^\s*=+\s*Student\s+(\d+)\s*=+\s*$", re.IGNORECASE)
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+# First characters of a line that may still turn out to be a bullet, a decorated heading or a student marker
+BULLET_OR_HEADING_START = "-*•#_=0123456789"
+# Markdown emphasis or heading characters models put around section headings
+HEADING_DECORATION = "*#_ "
+
+# Streamed tokens allowed inside <think> before the model is made to answer (0 disables)
+DEFAULT_THINK_BUDGET = 2048
+# Token cap (num_predict) of the follow-up request that asks for the verdict
+FORCED_ANSWER_TOKENS = 2048
+FORCED_ANSWER_INSTRUCTION = "Do not think any further."
+FORCED_ANSWER_TEMPLATE = (
+    "{prompt}\n\n"
+    "You have already reasoned about this evaluation:\n"
+    "<think>\n{thoughts}\n</think>\n\n"
+    + FORCED_ANSWER_INSTRUCTION + " Give the final evaluation now, following EXACTLY the format above."
+)
+
+
+def _heading(line):
+    """The section heading a line starts with, or None."""
+    text = line.strip().lstrip(HEADING_DECORATION)
+    return next((heading for heading in SECTION_HEADINGS if text.startswith(heading)), None)
+
+
+class VerdictTracker:
+    """
+    Incrementally parses a streamed grading completion.
+
+    feed() takes the streamed chunks (one token each with Ollama) and returns
+    "over_budget" once the <think> block has used more than `think_budget`
+    tokens, "complete" once every verdict has all four sections and the model has
+    moved on to anything else, and None otherwise. text() rebuilds the completion
+    up to that point, dropping whatever came after the verdict.
+    """
+
+    def __init__(self, think_budget=DEFAULT_THINK_BUDGET):
+        self.think_budget = think_budget
+        self.think_tokens = 0
+        self._state = "start"
+        self._head = ""
+        self._thoughts = []
+        self._think_tail = ""
+        self._lines = []
+        self._line = ""
+        self._section = None
+        self._items = 0
+        self._after_blank = False
+
+    @property
+    def thoughts(self):
+        return "".join(self._thoughts).strip()
+
+    def feed(self, chunk):
+        if self._state == "start":
+            self._head += chunk
+            head = self._head.lstrip()
+            if head.startswith(THINK_OPEN):
+                self._state = "thinking"
+                return self._feed_thinking(head[len(THINK_OPEN):], count=False)
+            if len(head) >= len(THINK_OPEN) or not THINK_OPEN.startswith(head):
+                # The model answered without a <think> block
+                self._state = "verdict"
+                return self._feed_verdict(head)
+            return None
+        if self._state == "thinking":
+            return self._feed_thinking(chunk)
+        if self._state == "verdict":
+            return self._feed_verdict(chunk)
+        return "complete"
+
+    def _feed_thinking(self, text, count=True):
+        # The closing tag may be split across chunks, so look for it in the recent tail too
+        window = self._think_tail + text
+        end = window.find(THINK_CLOSE)
+        if end >= 0:
+            self._thoughts.append(window[:end])
+            self._think_tail = ""
+            self._state = "verdict"
+            return self._feed_verdict(window[end + len(THINK_CLOSE):])
+        keep = len(THINK_CLOSE) - 1
+        self._thoughts.append(window[:-keep] if len(window) > keep else "")
+        self._think_tail = window[-keep:] if len(window) > keep else window
+        if count:
+            self.think_tokens += 1
+        if self.think_budget and self.think_tokens > self.think_budget:
+            self._thoughts.append(self._think_tail)
+            self._think_tail = ""
+            return "over_budget"
+        return None
+
+    def _feed_verdict(self, text):
+        self._line += text
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            if self._on_line(line):
+                return self._complete()
+        # Commentary after the verdict often comes as one long line, so judge it by its start
+        partial = self._line.lstrip()
+        if (partial and self._section == LAST_SECTION and self._items and self._after_blank
+                and partial[0] not in BULLET_OR_HEADING_START):
+            return self._complete()
+        return None
+
+    def _complete(self):
+        self._state = "complete"
+        self._line = ""
+        return "complete"
+
+    def _on_line(self, line):
+        """Consume one verdict line; returns True if it lies past a complete verdict."""
+        stripped = line.strip()
+        if STUDENT_MARKER_PATTERN.match(stripped):
+            # The next student's verdict in a batched response
+            self._section, self._items, self._after_blank = None, 0, False
+            self._lines.append(line)
+            return False
+
+        heading = _heading(stripped) if stripped else None
+        if self._section == LAST_SECTION and self._items:
+            # Another heading repeats the verdict; plain text after a blank line is commentary
+            if heading or (self._after_blank and stripped and not BULLET_PATTERN.match(stripped)):
+                return True
+
+        self._lines.append(line)
+        if not stripped:
+            self._after_blank = True
+            return False
+        self._after_blank = False
+        if heading:
+            self._section = heading
+            self._items = 0
+            # "Areas for Improvement: none" carries its item on the heading line
+            if stripped.lstrip(HEADING_DECORATION)[len(heading):].strip(HEADING_DECORATION):
+                self._items += 1
+        elif self._section == LAST_SECTION:
+            self._items += 1
+        return False
+
+    def text(self):
+        """The completion received so far, cut after the verdict."""
+        lines = self._lines + ([self._line] if self._line.strip() else [])
+        verdict = "\n".join(lines).strip()
+        if self._state == "start":
+            return self._head
+        if self._thoughts or self._state == "thinking":
+            return f"{THINK_OPEN}\n{self.thoughts}\n{THINK_CLOSE}\n\n{verdict}"
+        return verdict
+
+
+class StreamingVerdictClient:
+    """
+    Wraps an LLM client so each call streams the completion and stops it early.
+
+    Generation is cancelled (the stream is closed, which drops the connection to
+    Ollama) as soon as the verdict is complete. When the <think> block exceeds
+    `think_budget` tokens it is cut short and a follow-up request, capped at
+    `forced_answer_tokens`, hands the reasoning so far back to the model and asks
+    for the verdict straight away; only that cap bounds the follow-up, since a
+    model that opens it with <think> again must still get to the verdict. Other
+    attributes are those of the wrapped client, so a wrapped host pool still
+    reports its capacity and stats.
+    """
+
+    def __init__(self, llm, think_budget=DEFAULT_THINK_BUDGET, forced_answer_tokens=FORCED_ANSWER_TOKENS):
+        self.llm = llm
+        self.think_budget = think_budget
+        self.forced_answer_tokens = forced_answer_tokens
+        self.completions = 0
+        self.early_stops = 0
+        self.budget_stops = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def __call__(self, prompt):
+        tracker, status = self._stream(prompt)
+        if status == "over_budget":
+            followup = FORCED_ANSWER_TEMPLATE.format(prompt=prompt, thoughts=tracker.thoughts)
+            answer, _ = self._stream(followup, think_budget=0, num_predict=self.forced_answer_tokens)
+            thoughts = "\n".join(part for part in (tracker.thoughts, answer.thoughts) if part)
+            verdict = answer.text().split(THINK_CLOSE)[-1].strip()
+            return f"{THINK_OPEN}\n{thoughts}\n{THINK_CLOSE}\n\n{verdict}"
+        return tracker.text()
+
+    def _stream(self, prompt, think_budget=None, **kwargs):
+        tracker = VerdictTracker(self.think_budget if think_budget is None else think_budget)
+        status = None
+        stream = self.llm.stream(prompt, **kwargs)
+        try:
+            for chunk in stream:
+                status = tracker.feed(chunk)
+                if status:
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+        with self._lock:
+            self.completions += 1
+            if status == "complete":
+                self.early_stops += 1
+            elif status == "over_budget":
+                self.budget_stops += 1
+        return tracker, status
+
+    def streaming_stats(self):
+        """Completions streamed, stopped after a complete verdict, and cut at the think budget."""
+        with self._lock:
+            return {
+                "completions": self.completions,
+                "earlyStops": self.early_stops,
+                "budgetStops": self.budget_stops
+            }
@@ -0,0 +1,93 @@
+import os
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+
+# Chunks embedded per request batch, and batches embedded at the same time.
+EMBED_BATCH_SIZE = int(os.environ.get("RAG_EMBED_BATCH_SIZE", "32"))
+EMBED_IN_FLIGHT = int(os.environ.get("RAG_EMBED_IN_FLIGHT", "4"))
+# Attempts per batch before ingestion gives up, and the first retry delay (doubled each time).
+EMBED_ATTEMPTS = int(os.environ.get("RAG_EMBED_ATTEMPTS", "4"))
+RETRY_BACKOFF = 1.0
+# Seconds between progress lines.
+PROGRESS_INTERVAL = 5.0
+
+
+def embed_with_retry(embedding_function, texts, attempts=EMBED_ATTEMPTS, backoff=RETRY_BACKOFF):
+    for attempt in range(1, attempts + 1):
+        try:
+            return embedding_function.embed_documents(texts)
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = backoff * 2 ** (attempt - 1)
+            print(f"⚠️ Embedding batch failed ({e}), retrying in {delay:.0f}s ({attempt}/{attempts - 1})")
+            time.sleep(delay)
+
+
+def add_chunks_in_batches(db, embedding_function, chunks, ids=None, batch_size=EMBED_BATCH_SIZE,
+                          in_flight=EMBED_IN_FLIGHT, attempts=EMBED_ATTEMPTS, on_stored=None):
+    """
+    Embed chunks and store them in a Chroma database, batch by batch.
+
+    Up to `in_flight` batches of `batch_size` chunks are embedded at once on
+    worker threads, each retried with exponential backoff on failure, while the
+    calling thread writes finished batches to the collection. `chunks` may be a
+    generator; it is read one batch at a time. Without `ids`, each chunk's
+    metadata "id" is used, or a random one. Every written batch is stored for
+    good and passed to `on_stored`, and a chunks/sec line is printed as it goes.
+    Returns the number of chunks stored.
+    """
+    total = len(chunks) if hasattr(chunks, "__len__") else None
+    chunk_iter = iter(chunks)
+    id_iter = iter(ids) if ids is not None else None
+
+    def next_batch():
+        batch_chunks = list(islice(chunk_iter, batch_size))
+        if not batch_chunks:
+            return None
+        if id_iter is not None:
+            batch_ids = list(islice(id_iter, len(batch_chunks)))
+        else:
+            batch_ids = [chunk.metadata.get("id") or str(uuid.uuid4()) for chunk in batch_chunks]
+        return batch_chunks, batch_ids
+
+    started = time.perf_counter()
+    reported = started
+    stored = 0
+    with ThreadPoolExecutor(max_workers=max(1, in_flight)) as pool:
+        pending = {}
+
+        def submit():
+            batch = next_batch()
+            if batch is not None:
+                texts = [chunk.page_content for chunk in batch[0]]
+                pending[pool.submit(embed_with_retry, embedding_function, texts, attempts)] = batch
+
+        for _ in range(max(1, in_flight)):
+            submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch_chunks, batch_ids = pending.pop(future)
+                # Written as Chroma.add_texts does, with the embeddings computed above.
+                db._collection.upsert(
+                    ids=batch_ids,
+                    embeddings=future.result(),
+                    metadatas=[chunk.metadata for chunk in batch_chunks],
+                    documents=[chunk.page_content for chunk in batch_chunks],
+                )
+                stored += len(batch_chunks)
+                if on_stored is not None:
+                    on_stored(batch_chunks)
+                submit()
+
+            now = time.perf_counter()
+            if now - reported >= PROGRESS_INTERVAL or not pending:
+                reported = now
+                rate = stored / (now - started) if now > started else 0.0
+                progress = f"{stored}/{total}" if total is not None else f"{stored}"
+                print(f"🧮 Embedded {progress} chunks ({rate:.1f} chunks/s)")
+    return stored
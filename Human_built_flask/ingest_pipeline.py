@@ -0,0 +1,127 @@
+import os
+import queue
+import threading
+
+
+# Chunks the load/split/ID stages may run ahead of the embedding stage.
+PIPELINE_QUEUE_SIZE = int(os.environ.get("RAG_PIPELINE_QUEUE_SIZE", "256"))
+
+_DONE = object()
+
+
+def prefetch(iterable, maxsize=PIPELINE_QUEUE_SIZE):
+    """
+    Run `iterable` on a background thread, at most `maxsize` items ahead of the consumer.
+
+    Gives the stages before it their own thread, so they overlap with the
+    stages after it while memory stays bounded by the queue. An exception in the
+    producer is raised in the consumer; closing the generator stops the producer.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put((_DONE, e))
+            return
+        put((_DONE, None))
+
+    producer = threading.Thread(target=produce, name="ingest-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _DONE:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+class FileProgress:
+    """
+    Records files in the ingest manifest as soon as all their chunks are stored.
+
+    Chunks arrive file by file. track() notes every chunk ID of a file and
+    drops the chunks already in the database; stored() is called with each
+    batch written. A file is recorded once the stages have moved past it and
+    none of its chunks is still waiting to be embedded, so an interrupted run
+    re-ingests only the files it had not finished.
+    """
+
+    def __init__(self, manifest, changed):
+        self.manifest = manifest
+        self.states = {state["path"]: state for state in changed}
+        self.chunk_ids = {path: [] for path in self.states}
+        self.pending = {path: 0 for path in self.states}
+        self.finished = set()
+        self.recorded = set()
+        self._lock = threading.Lock()
+
+    def track(self, chunks, exists):
+        current = None
+        for chunk in chunks:
+            source = chunk.metadata.get("source")
+            if source != current:
+                self._finish(current)
+                current = source
+            with self._lock:
+                if source in self.chunk_ids:
+                    self.chunk_ids[source].append(chunk.metadata["id"])
+            if exists(chunk.metadata["id"]):
+                continue
+            with self._lock:
+                if source in self.pending:
+                    self.pending[source] += 1
+            yield chunk
+        self._finish(current)
+
+    def stored(self, chunks):
+        sources = set()
+        with self._lock:
+            for chunk in chunks:
+                source = chunk.metadata.get("source")
+                if source in self.pending:
+                    self.pending[source] -= 1
+                    sources.add(source)
+        for source in sources:
+            self._record_if_done(source)
+
+    def finish(self):
+        """Record every remaining file, including those that produced no chunks; call after success."""
+        with self._lock:
+            self.finished.update(self.states)
+        for path in self.states:
+            self._record_if_done(path)
+
+    def _finish(self, source):
+        if source is None:
+            return
+        with self._lock:
+            self.finished.add(source)
+        self._record_if_done(source)
+
+    def _record_if_done(self, source):
+        with self._lock:
+            if (source not in self.states or source in self.recorded
+                    or source not in self.finished or self.pending[source]):
+                return
+            self.recorded.add(source)
+            chunk_ids = list(self.chunk_ids.pop(source))
+        self.manifest.record(self.states[source], chunk_ids)
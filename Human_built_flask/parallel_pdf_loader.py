@@ -0,0 +1,106 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from langchain.schema.document import Document
+
+
+# Worker processes parsing PDFs (0 uses every CPU).
+LOADER_WORKERS = int(os.environ.get("RAG_LOADER_WORKERS", "0"))
+# PDFs longer than this are split into page ranges parsed by different workers.
+PAGES_PER_TASK = int(os.environ.get("RAG_LOADER_PAGES_PER_TASK", "50"))
+
+
+def extract_pages(path, start, stop):
+    """
+    Extract the text of pages [start, stop) of one PDF.
+
+    Runs in a worker process, so it returns plain data: the PDF's page count and
+    a list of (page number, text) pairs.
+    """
+    import pypdf
+
+    reader = pypdf.PdfReader(path)
+    page_count = len(reader.pages)
+    pages = [(number, reader.pages[number].extract_text()) for number in range(start, min(stop, page_count))]
+    return page_count, pages
+
+
+class ParallelPDFDirectoryLoader:
+    """
+    Drop-in replacement for PyPDFDirectoryLoader that parses PDFs in a process pool.
+
+    Every file is a task, and files longer than `pages_per_task` pages are split
+    into page ranges once their page count is known, so one huge PDF does not
+    keep a single core busy while the others sit idle. Documents come out in the
+    same order and with the same `source`/`page` metadata as PyPDFDirectoryLoader,
+    which is what calculate_chunk_ids builds chunk IDs from.
+    """
+
+    def __init__(self, path, glob="**/[!.]*.pdf", workers=LOADER_WORKERS, pages_per_task=PAGES_PER_TASK,
+                 silent_errors=False):
+        self.path = path
+        self.glob = glob
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self.silent_errors = silent_errors
+
+    def files(self):
+        root = Path(self.path)
+        return [
+            str(path) for path in sorted(root.glob(self.glob))
+            if path.is_file() and not any(part.startswith(".") for part in path.relative_to(root).parts)
+        ]
+
+    def load(self, files=None):
+        return list(self.lazy_load(files))
+
+    def lazy_load(self, files=None):
+        """Yield the pages of `files` (every PDF in the directory by default)."""
+        files = self.files() if files is None else list(files)
+        if self.workers == 1 or len(files) == 0:
+            for source in files:
+                yield from self._documents(source, lambda: [extract_pages(source, 0, float("inf"))[1]])
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Keep a few files queued per worker; each file's first range also tells its page count
+            queued = deque()
+            remaining = iter(files)
+
+            def fill():
+                while len(queued) < self.workers * 2:
+                    source = next(remaining, None)
+                    if source is None:
+                        return
+                    queued.append((source, pool.submit(extract_pages, source, 0, self.pages_per_task)))
+
+            fill()
+            while queued:
+                source, first = queued.popleft()
+                fill()
+                yield from self._documents(source, lambda: self._ranges(pool, source, first))
+
+    def _ranges(self, pool, source, first):
+        """Page lists of one file: the first range, then the others parsed in parallel."""
+        page_count, pages = first.result()
+        rest = [
+            pool.submit(extract_pages, source, start, start + self.pages_per_task)
+            for start in range(self.pages_per_task, page_count, self.pages_per_task)
+        ]
+        yield pages
+        for future in rest:
+            yield future.result()[1]
+
+    def _documents(self, source, ranges):
+        try:
+            page_lists = list(ranges())
+        except Exception as e:
+            if not self.silent_errors:
+                raise
+            print(f"⚠️ Skipping {source}: {e}")
+            return
+        for pages in page_lists:
+            for number, text in pages:
+                yield Document(page_content=text, metadata={"source": source, "page": number})
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+
+# Bytes hashed at a time, so large PDFs are never read into memory whole.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    Records every ingested file's size, mtime, content hash and chunk IDs.
+
+    scan() compares the data directory against it before anything is parsed:
+    files whose size and mtime are unchanged are skipped without being read, and
+    a touched file whose hash is unchanged only has its mtime refreshed. The
+    chunk IDs let the chunks of modified and removed files be deleted.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            sha256 TEXT NOT NULL,
+            chunk_ids TEXT NOT NULL,
+            ingested_at REAL
+        )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def scan(self, paths):
+        """
+        Compare `paths` with the manifest.
+
+        Returns (changed, removed): `changed` holds a {"path", "size", "mtime",
+        "sha256"} dict for every new or modified file, `removed` the paths that
+        were ingested but no longer exist.
+        """
+        conn = self._connect()
+        known = {
+            row[0]: row[1:]
+            for row in conn.execute("SELECT path, size, mtime, sha256 FROM ingested_files")
+        }
+        changed = []
+        touched = []
+        for path in paths:
+            stat = os.stat(path)
+            state = {"path": path, "size": stat.st_size, "mtime": stat.st_mtime, "sha256": None}
+            previous = known.get(path)
+            if previous is not None and previous[:2] == (stat.st_size, stat.st_mtime):
+                continue
+            state["sha256"] = file_sha256(path)
+            if previous is not None and previous[2] == state["sha256"]:
+                touched.append((stat.st_size, stat.st_mtime, path))
+                continue
+            changed.append(state)
+        with conn:
+            conn.executemany("UPDATE ingested_files SET size = ?, mtime = ? WHERE path = ?", touched)
+        conn.close()
+        removed = sorted(set(known) - set(paths))
+        return changed, removed
+
+    def chunk_ids(self, path):
+        """The chunk IDs recorded for `path`, or None if it was never ingested."""
+        conn = self._connect()
+        row = conn.execute("SELECT chunk_ids FROM ingested_files WHERE path = ?", (path,)).fetchone()
+        conn.close()
+        return json.loads(row[0]) if row else None
+
+    def record(self, state, chunk_ids):
+        """Store a file's state, as returned by scan(), once its chunks are in the database."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?, ?)",
+                (state["path"], state["size"], state["mtime"], state["sha256"], json.dumps(chunk_ids), time.time())
+            )
+        conn.close()
+
+    def forget(self, path):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM ingested_files WHERE path = ?", (path,))
+        conn.close()
@@ -0,0 +1,72 @@
+from langchain_core.embeddings import Embeddings
+
+from embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeds a text as [length, first character code], counting what reaches the model."""
+
+    model = "counting"
+
+    def __init__(self):
+        self.embedded = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.embedded += texts
+        return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [0.0, 0.0]
+
+
+def test_only_new_text_reaches_the_model(tmp_path):
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, path=str(tmp_path / "cache.sqlite3"))
+
+    vectors = cache.embed_documents(["alpha", "beta", "alpha"])
+    assert vectors == [[5.0, 97.0], [4.0, 98.0], [5.0, 97.0]]
+    assert model.embedded == ["alpha", "beta"]
+
+    # A new process reuses the vectors on disk
+    cache = CachedEmbeddings(model, path=str(tmp_path / "cache.sqlite3"))
+    assert cache.embed_documents(["beta", "gamma"]) == [[4.0, 98.0], [5.0, 103.0]]
+    assert model.embedded == ["alpha", "beta", "gamma"]
+    stats = cache.stats()
+    assert (stats["model"], stats["hits"], stats["misses"], stats["hit_rate"]) == ("counting", 1, 1, 0.5)
+    assert stats["bytes"] == 3 * 8
+
+
+def test_vectors_are_kept_per_model(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    CachedEmbeddings(CountingEmbeddings(), path=path).embed_documents(["alpha"])
+
+    other = CountingEmbeddings()
+    other.model = "other"
+    CachedEmbeddings(other, path=path).embed_documents(["alpha"])
+    assert other.embedded == ["alpha"]
+
+
+def test_queries_are_not_cached(tmp_path):
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, path=str(tmp_path / "cache.sqlite3"))
+    cache.embed_query("alpha")
+    cache.embed_query("alpha")
+    assert model.queries == ["alpha", "alpha"]
+    assert cache.stats()["hits"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_least_recently_used_vectors_are_evicted(tmp_path):
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, path=str(tmp_path / "cache.sqlite3"), max_mb=1)
+    # Room for just under four vectors of 8 bytes
+    cache.max_bytes = 30
+    cache.embed_documents(["a1", "b2", "c3"])
+    cache.embed_documents(["a1"])
+    cache.embed_documents(["d4"])
+    assert cache.stats()["bytes"] <= 27
+
+    model.embedded.clear()
+    cache.embed_documents(["a1", "d4", "b2"])
+    assert model.embedded == ["b2"]
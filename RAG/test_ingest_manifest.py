@@ -0,0 +1,52 @@
+import os
+
+import ingest_manifest
+from ingest_manifest import IngestManifest
+
+
+def write(path, content, mtime):
+    path.write_bytes(content)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_scan_skips_unchanged_and_touched_files(tmp_path, monkeypatch):
+    hashed = []
+    file_sha256 = ingest_manifest.file_sha256
+    monkeypatch.setattr(ingest_manifest, "file_sha256", lambda path: hashed.append(path) or file_sha256(path))
+    manifest = IngestManifest(str(tmp_path / "chroma" / "manifest.sqlite3"))
+    a = write(tmp_path / "a.pdf", b"alpha", 1000)
+    b = write(tmp_path / "b.pdf", b"beta", 1000)
+
+    changed, removed = manifest.scan([a, b])
+    assert [state["path"] for state in changed] == [a, b]
+    assert all(state["sha256"] for state in changed) and removed == []
+    for state in changed:
+        manifest.record(state, [f"{state['path']}:0:0"])
+    hashed.clear()
+    assert manifest.scan([a, b]) == ([], [])
+    assert hashed == []
+
+    # Same content with a new mtime is not re-ingested, and is not hashed again next time
+    write(tmp_path / "a.pdf", b"alpha", 2000)
+    assert manifest.scan([a, b]) == ([], [])
+    assert manifest.scan([a, b]) == ([], [])
+    assert hashed == [a]
+
+
+def test_scan_reports_modified_and_removed_files(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite3"))
+    a = write(tmp_path / "a.pdf", b"alpha", 1000)
+    b = write(tmp_path / "b.pdf", b"beta", 1000)
+    for state in manifest.scan([a, b])[0]:
+        manifest.record(state, [f"{state['path']}:0:0", f"{state['path']}:0:1"])
+
+    write(tmp_path / "a.pdf", b"alpha, revised", 1000)
+    changed, removed = manifest.scan([a])
+    assert [state["path"] for state in changed] == [a]
+    assert removed == [b]
+    assert manifest.chunk_ids(b) == [f"{b}:0:0", f"{b}:0:1"]
+
+    manifest.forget(b)
+    assert manifest.chunk_ids(b) is None
+    assert manifest.scan([a]) == (changed, [])
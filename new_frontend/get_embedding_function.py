@@ -1,6 +1,8 @@
 from langchain_ollama import OllamaEmbeddings
+from embedding_cache import CachedEmbeddings
 
 def get_embedding_function():
     """Get embedding function using Ollama API."""
     embeddings = OllamaEmbeddings(model="nomic-embed-text")
-    return embeddings
\ No newline at end of file
+    # Text embedded before is served from the local cache instead of Ollama.
+    return CachedEmbeddings(embeddings)
\ No newline at end of file
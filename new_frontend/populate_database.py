@@ -2,19 +2,31 @@ import argparse
 import os
 import shutil
 import sys
-from langchain_community.document_loaders import PyPDFDirectoryLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain.schema.document import Document
 from get_embedding_function import get_embedding_function
+from parallel_pdf_loader import LOADER_WORKERS, ParallelPDFDirectoryLoader
+from ingest_manifest import IngestManifest
+from embedding_stage import EMBED_BATCH_SIZE, EMBED_IN_FLIGHT, add_chunks_in_batches
+from ingest_pipeline import FileProgress, prefetch
 from langchain_community.vectorstores import Chroma  # Fixed import
 
 CHROMA_PATH = "chroma"
 DATA_PATH = "data"
+# Kept inside the database directory so --reset clears it too.
+MANIFEST_PATH = os.path.join(CHROMA_PATH, "ingest_manifest.sqlite3")
+# Most IDs passed to a single Chroma delete call.
+DELETE_BATCH_SIZE = 5000
 
 def main():
     # Check if the database should be cleared (using the --clear flag).
     parser = argparse.ArgumentParser()
     parser.add_argument("--reset", action="store_true", help="Reset the database.")
+    parser.add_argument("--workers", type=int, default=LOADER_WORKERS,
+                        help="Processes parsing PDFs (0 uses every CPU).")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE,
+                        help="Chunks embedded per batch.")
+    parser.add_argument("--in-flight", type=int, default=EMBED_IN_FLIGHT,
+                        help="Batches embedded at the same time.")
     args = parser.parse_args()
     if args.reset:
         print("✨ Clearing Database")
@@ -31,34 +43,43 @@ def main():
         print(f"No files found in {DATA_PATH}. Please upload some documents first.")
         return
 
-    # Create (or update) the data store.
+    # Create (or update) the data store, parsing only files that changed since the last run.
+    manifest = IngestManifest(MANIFEST_PATH)
+    changed, removed = manifest.scan(ParallelPDFDirectoryLoader(DATA_PATH).files())
+    if not changed and not removed:
+        print("✅ No changed files to ingest")
+        return
+    print(f"Changed files: {len(changed)}, removed files: {len(removed)}")
+
+    # Every stage is a generator, so pages stream through split, ID, embed and upsert
+    # without the corpus ever being held in memory.
     print(f"Loading documents from {DATA_PATH}")
-    documents = load_documents()
-    print(f"Loaded {len(documents)} documents")
-    
+    documents = load_documents(args.workers, [state["path"] for state in changed])
     chunks = split_documents(documents)
-    print(f"Split into {len(chunks)} chunks")
-    
-    add_to_chroma(chunks)
+    add_to_chroma(chunks, manifest, changed, removed, args.batch_size, args.in_flight)
 
 
-def load_documents():
+def load_documents(workers=LOADER_WORKERS, files=None):
     print(f"Loading documents from: {os.path.abspath(DATA_PATH)}")
-    document_loader = PyPDFDirectoryLoader(DATA_PATH)
-    return document_loader.load()
+    # Files, and page ranges of long PDFs, are parsed in a process pool.
+    document_loader = ParallelPDFDirectoryLoader(DATA_PATH, workers=workers)
+    return document_loader.lazy_load(files)
 
 
-def split_documents(documents: list[Document]):
+def split_documents(documents):
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=800,
         chunk_overlap=80,
         length_function=len,
         is_separator_regex=False,
     )
-    return text_splitter.split_documents(documents)
+    # Pages are split independently, so splitting them one at a time gives the same chunks.
+    for document in documents:
+        yield from text_splitter.split_documents([document])
 
 
-def add_to_chroma(chunks: list[Document]):
+def add_to_chroma(chunks, manifest=None, changed=(), removed=(),
+                  batch_size=EMBED_BATCH_SIZE, in_flight=EMBED_IN_FLIGHT):
     # Create chroma directory if it doesn't exist
     os.makedirs(CHROMA_PATH, exist_ok=True)
     
@@ -71,33 +92,76 @@ def add_to_chroma(chunks: list[Document]):
         embedding_function=embedding_function
     )
 
+    # Drop the old chunks of modified and removed files, so none of their text stays searchable.
+    if manifest is not None:
+        for path in [state["path"] for state in changed] + list(removed):
+            delete_file_chunks(db, manifest, path)
+        for path in removed:
+            manifest.forget(path)
+            print(f"🗑️ Removed chunks of deleted file {path}")
+
     # Calculate Page IDs.
     chunks_with_ids = calculate_chunk_ids(chunks)
 
     # Add or Update the documents.
     try:
-        existing_items = db.get(include=[])  # IDs are always included by default
-        existing_ids = set(existing_items["ids"])
-        print(f"Number of existing documents in DB: {len(existing_ids)}")
+        print(f"Number of existing documents in DB: {db._collection.count()}")
     except Exception as e:
         print(f"No existing documents found: {str(e)}")
-        existing_ids = set()
-
-    # Only add documents that don't exist in the DB.
-    new_chunks = []
-    for chunk in chunks_with_ids:
-        if chunk.metadata["id"] not in existing_ids:
-            new_chunks.append(chunk)
-
-    if len(new_chunks):
-        print(f"👉 Adding new documents: {len(new_chunks)}")
-        new_chunk_ids = [chunk.metadata["id"] for chunk in new_chunks]
-        db.add_documents(new_chunks, ids=new_chunk_ids)
+    exists = stored_ids_by_source(db)
+
+    # Only add documents that don't exist in the DB. Files are recorded in the
+    # manifest as soon as all their chunks are stored.
+    progress = FileProgress(manifest, changed) if manifest is not None else None
+    if progress is not None:
+        new_chunks = progress.track(chunks_with_ids, exists)
+    else:
+        new_chunks = (chunk for chunk in chunks_with_ids if not exists(chunk.metadata["id"]))
+
+    # Loading, splitting and IDs run on their own thread, a bounded queue ahead of
+    # embedding; each upserted batch is durable on its own.
+    added = add_chunks_in_batches(
+        db, embedding_function, prefetch(new_chunks), batch_size=batch_size, in_flight=in_flight,
+        on_stored=progress.stored if progress is not None else None
+    )
+    if added:
+        print(f"👉 Added new documents: {added}")
         # The newer version of Chroma auto-persists, no need to call persist()
         print("✅ Database updated successfully")
     else:
         print("✅ No new documents to add")
 
+    if progress is not None:
+        progress.finish()
+
+    if hasattr(embedding_function, "stats"):
+        stats = embedding_function.stats()
+        print(f"🗃️ Embedding cache: {stats['hits']} hits, {stats['misses']} misses")
+
+
+def stored_ids_by_source(db):
+    # Chunks arrive file by file, so only the stored IDs of the current source are
+    # looked up, instead of every ID in the collection.
+    current = {"source": None, "ids": set()}
+
+    def exists(chunk_id):
+        source = chunk_id.rsplit(":", 2)[0]
+        if source != current["source"]:
+            current["source"] = source
+            current["ids"] = set(db.get(where={"source": source}, include=[])["ids"])
+        return chunk_id in current["ids"]
+
+    return exists
+
+
+def delete_file_chunks(db, manifest, path):
+    chunk_ids = manifest.chunk_ids(path)
+    if chunk_ids is None:
+        # Ingested before the manifest existed: find its chunks by their source.
+        chunk_ids = db.get(where={"source": path}, include=[])["ids"]
+    for start in range(0, len(chunk_ids), DELETE_BATCH_SIZE):
+        db.delete(ids=chunk_ids[start:start + DELETE_BATCH_SIZE])
+
 
 def calculate_chunk_ids(chunks):
     # This will create IDs like "data/monopoly.pdf:6:2"
@@ -124,7 +188,7 @@ def calculate_chunk_ids(chunks):
         # Add it to the page meta-data.
         chunk.metadata["id"] = chunk_id
 
-    return chunks
+        yield chunk
 
 
 def clear_database():
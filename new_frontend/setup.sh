@@ -14,6 +14,8 @@ pip install flask werkzeug
 echo "Setting up integration with Human_built_flask..."
 cp -r ../Human_built_flask/populate_database.py ./
 cp -r ../Human_built_flask/query_data.py ./
+# populate_database.py streams its stages through this module
+cp -r ../Human_built_flask/ingest_pipeline.py ./
 
 echo "Setting up environment completed! You can now run the application with:"
 echo "python app.py"
@@ -12,6 +12,7 @@ from langchain_community.vectorstores import Chroma
 # You'll need to create this file in your app/utils directory
 from app.utils.rag_helpers import get_embedding_function
 from app.utils.rag_helpers import query_rag
+from app.utils.embedding_stage import add_chunks_in_batches
 
 document_bp = Blueprint('document', __name__)
 
@@ -19,6 +20,8 @@ document_bp = Blueprint('document', __name__)
 UPLOAD_FOLDER = 'data'
 CHROMA_PATH = 'chroma'
 ALLOWED_EXTENSIONS = {'pdf', 'txt'}
+# Most candidate IDs looked up in one Chroma call
+ID_LOOKUP_BATCH_SIZE = 5000
 
 # Remove the hardcoded paths and use current_app.config instead
 def allowed_file(filename):
@@ -114,13 +117,10 @@ def process_documents(reset=False):
     # Store document chunks and embeddings in Chroma
     embedding_function = get_embedding_function()
     
-    # Create or update the vector database
+    # Create or update the vector database, embedding in concurrent batches
     if len(splits) > 0:
-        Chroma.from_documents(
-            documents=splits,
-            embedding=embedding_function,
-            persist_directory=chroma_path
-        )
+        db = Chroma(persist_directory=chroma_path, embedding_function=embedding_function)
+        add_chunks_in_batches(db, embedding_function, splits)
         return True
     return False
 
@@ -145,17 +145,17 @@ def add_to_chroma(chunks: list[Document]):
     os.makedirs(CHROMA_PATH, exist_ok=True)
     
     # Load the existing database
+    embedding_function = get_embedding_function()
     db = Chroma(
-        persist_directory=CHROMA_PATH, embedding_function=get_embedding_function()
+        persist_directory=CHROMA_PATH, embedding_function=embedding_function
     )
 
     # Calculate Page IDs
     chunks_with_ids = calculate_chunk_ids(chunks)
 
     # Add or Update the documents
-    existing_items = db.get(include=[])  # IDs are always included by default
-    existing_ids = set(existing_items["ids"])
-    print(f"Number of existing documents in DB: {len(existing_ids)}")
+    print(f"Number of existing documents in DB: {db._collection.count()}")
+    existing_ids = find_existing_ids(db, [chunk.metadata["id"] for chunk in chunks_with_ids])
 
     # Only add documents that don't exist in the DB
     new_chunks = []
@@ -166,13 +166,21 @@ def add_to_chroma(chunks: list[Document]):
     if len(new_chunks):
         print(f"👉 Adding new documents: {len(new_chunks)}")
         new_chunk_ids = [chunk.metadata["id"] for chunk in new_chunks]
-        db.add_documents(new_chunks, ids=new_chunk_ids)
+        add_chunks_in_batches(db, embedding_function, new_chunks, new_chunk_ids)
         db.persist()
         return True
     else:
         print("✅ No new documents to add")
         return False
 
+def find_existing_ids(db, chunk_ids):
+    """Return which of the candidate IDs are already stored, without loading every ID"""
+    existing_ids = set()
+    for start in range(0, len(chunk_ids), ID_LOOKUP_BATCH_SIZE):
+        batch = chunk_ids[start:start + ID_LOOKUP_BATCH_SIZE]
+        existing_ids.update(db.get(ids=batch, include=[])["ids"])
+    return existing_ids
+
 def calculate_chunk_ids(chunks):
     """Create unique IDs for each document chunk"""
     last_page_id = None
@@ -1,4 +1,5 @@
 from langchain_community.embeddings.ollama import OllamaEmbeddings
+from app.utils.embedding_cache import CachedEmbeddings
 # from langchain_community.embeddings.bedrock import BedrockEmbeddings
 
 
@@ -7,6 +8,7 @@ def get_embedding_function():
     #     credentials_profile_name="default", region_name="us-east-1"
     # )
     embeddings = OllamaEmbeddings(model="llama3.2")
-    return embeddings
+    # Text embedded before is served from the local cache instead of Ollama.
+    return CachedEmbeddings(embeddings)
 
 
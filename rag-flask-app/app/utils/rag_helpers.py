@@ -7,6 +7,9 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 import os
 import shutil
 
+from app.utils.embedding_cache import CachedEmbeddings
+from app.utils.embedding_stage import add_chunks_in_batches
+
 # Constants
 CHROMA_PATH = "chroma"
 OLLAMA_MODEL = "llama3.2"
@@ -23,15 +26,14 @@ Answer the question based on the above context: {question}
 """
 
 def get_embedding_function():
-    """Get embeddings using Ollama"""
+    """Get embeddings using Ollama, cached locally by model and text hash"""
     try:
         # First try the specialized embedding model
         embeddings = OllamaEmbeddings(model=OLLAMA_EMBEDDING_MODEL)
-        return embeddings
     except:
         # Fallback to the main model
         embeddings = OllamaEmbeddings(model=OLLAMA_MODEL)
-        return embeddings
+    return CachedEmbeddings(embeddings)
 
 def process_uploaded_document(file_path):
     """
@@ -80,9 +82,9 @@ def process_uploaded_document(file_path):
     # Load or create database
     db = Chroma(persist_directory=CHROMA_PATH, embedding_function=embedding_function)
     
-    # Add documents
+    # Add documents, embedding them in concurrent batches
     chunk_ids = [chunk.metadata["id"] for chunk in chunks_with_ids]
-    db.add_documents(chunks_with_ids, ids=chunk_ids)
+    add_chunks_in_batches(db, embedding_function, chunks_with_ids, chunk_ids)
     db.persist()
     
     return True
@@ -147,9 +149,9 @@ def query_rag(query_text: str):
     embedding_function = get_embedding_function()
     db = Chroma(persist_directory=CHROMA_PATH, embedding_function=embedding_function)
 
-    # Check if DB exists and has documents
+    # Check if DB exists and has documents (count() avoids fetching any of them)
     try:
-        doc_count = len(db.get()["ids"])
+        doc_count = db._collection.count()
         if doc_count == 0:
             return {"response": "No documents in the database. Please upload some documents first.", "sources": []}
     except:
@@ -0,0 +1,164 @@
+"""Persistent embedding cache for the YouTube transcript RAG application."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from langchain_core.embeddings import Embeddings
+
+
+# Survives --reset, which only clears the Chroma directory.
+EMBEDDING_CACHE_PATH = os.environ.get("RAG_EMBEDDING_CACHE", "embedding_cache.sqlite3")
+# Vectors are evicted, least recently used first, once they take more than this.
+EMBEDDING_CACHE_MAX_MB = int(os.environ.get("RAG_EMBEDDING_CACHE_MAX_MB", "1024"))
+# Eviction frees space down to this share of the limit, so it does not run on every insert.
+EVICTION_TARGET = 0.9
+# Hashes looked up per query, below SQLite's bound parameter limit.
+LOOKUP_BATCH_SIZE = 500
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embeddings object with a persistent cache of document embeddings.
+
+    Vectors are stored as float32 blobs in SQLite, keyed by the embedding model
+    and the sha256 of the text, so re-ingesting a corpus, or the same text under
+    different chunk IDs, only calls the model for text it has not embedded yet.
+    Query embeddings are passed through: models may embed queries differently.
+    """
+
+    def __init__(self, embeddings, path=EMBEDDING_CACHE_PATH, max_mb=EMBEDDING_CACHE_MAX_MB):
+        self.embeddings = embeddings
+        self.model = getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.path = path
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS embeddings (
+            model TEXT NOT NULL,
+            text_hash TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (model, text_hash)
+        )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        conn.commit()
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        conn.close()
+
+    def embed_documents(self, texts):
+        hashes = [text_hash(text) for text in texts]
+        found = self._lookup(set(hashes))
+
+        missing = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in found:
+                missing.setdefault(digest, text)
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            self._store(computed)
+            found.update(computed)
+
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+        return [list(found[digest]) for digest in hashes]
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+    def _lookup(self, hashes):
+        hashes = list(hashes)
+        found = {}
+        conn = self._connect()
+        with conn:
+            for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+                batch = hashes[start:start + LOOKUP_BATCH_SIZE]
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({', '.join('?' * len(batch))})",
+                    [self.model, *batch]
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = array("f", blob).tolist()
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, self.model, digest) for digest in found]
+                )
+        conn.close()
+        return found
+
+    def _store(self, vectors):
+        now = time.time()
+        rows = []
+        for digest, vector in vectors.items():
+            blob = array("f", vector).tobytes()
+            rows.append((self.model, digest, blob, len(blob), now))
+        conn = self._connect()
+        with conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            added = conn.total_changes - before
+        with self._lock:
+            # Rows another process inserted first are ignored; the estimate is resynced on eviction
+            self._size += added * (rows[0][3] if rows else 0)
+            evict = self._size > self.max_bytes
+        if evict:
+            self._evict(conn)
+        conn.close()
+
+    def _evict(self, conn):
+        with conn:
+            size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+            target = int(self.max_bytes * EVICTION_TARGET)
+            if size > target:
+                # Count the least recently used rows that free enough space, then delete exactly those
+                freed = 0
+                count = 0
+                for (row_size,) in conn.execute("SELECT size FROM embeddings ORDER BY last_used, rowid"):
+                    freed += row_size
+                    count += 1
+                    if size - freed <= target:
+                        break
+                conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used, rowid LIMIT ?)",
+                    (count,)
+                )
+                size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        with self._lock:
+            self._size = size
+
+    def stats(self):
+        """Hit and miss counts of this process, and the cache's size on disk."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model": self.model,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "bytes": self._size
+            }
@@ -1,9 +1,10 @@
 """Embedding functions for the YouTube transcript RAG application."""
 
 from langchain_community.embeddings import OllamaEmbeddings
-from yt_transcript.src.utils.constants import EMBEDDING_MODEL
+from yt_transcript.src.core.embedding_cache import CachedEmbeddings
+from yt_transcript.src.utils.constants import EMBEDDING_CACHE_PATH, EMBEDDING_MODEL
 
 def get_embedding_function():
-    """Get the embedding function for vector storage."""
+    """Get the embedding function for vector storage, cached by model and text hash."""
     embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
-    return embeddings
\ No newline at end of file
+    return CachedEmbeddings(embeddings, path=EMBEDDING_CACHE_PATH)
\ No newline at end of file
@@ -16,6 +16,9 @@ VIDEOS_DATA_PATH = "videos_data"
 
 SQL_DB_PATH = str(project_root / "transcript_metadata.db")
 
+# Embeddings of transcript text already seen, so re-processing a video skips Ollama
+EMBEDDING_CACHE_PATH = str(project_root / "embedding_cache.sqlite3")
+
 # Ensure directories exist
 os.makedirs(VIDEOS_DATA_PATH, exist_ok=True)
 os.makedirs(CHROMA_PATH, exist_ok=True)